@@ -0,0 +1,138 @@
+#--Anytime Repairing A* (ARA*): a fast weighted path first, then better ones until the deadline--#
+# Each round is a weighted A* with f = g + epsilon * h, so its path costs at most
+# epsilon times the optimum. Rounds lower epsilon step by step without starting
+# over: g values and parents are kept, and only the nodes whose g improved after
+# they were expanded in the round (the INCONS list) are queued again with the
+# open list. After every round the bound is tightened to
+# min(epsilon, cost / min over queued nodes of g + h), which is 1 once the path is proven optimal.
+#   path, cost, explored, bound = ara_star_algorithm(graph, 2, 5, deadline=0.05)   # 50 ms
+#   bound: the path costs at most bound * optimal (INF when no path was found in time)
+# on_solution(path, cost, bound) is called for every improved path as it is found.
+import sys
+import time
+from array import array
+if __package__:
+    from .Graph import new_parents, trace_path
+    from .Frontier import IndexedHeap, INF
+    from .GraphCache import load_graph_cached
+    from .Heuristics import heuristic_table
+    from .SpatialIndex import snap
+    from .Metrics import SearchMetrics
+else:
+    from Graph import new_parents, trace_path
+    from Frontier import IndexedHeap, INF
+    from GraphCache import load_graph_cached
+    from Heuristics import heuristic_table
+    from SpatialIndex import snap
+    from Metrics import SearchMetrics
+
+EPSILON = 2.5
+STEP = 0.5
+CHECK_EVERY = 256   # expansions between clock reads
+
+def ara_star_algorithm(graph, start, goal, deadline=None, epsilon=EPSILON, step=STEP, metric="euclidean",
+                       metrics=None, on_solution=None):
+    # deadline: seconds from the call (None: run down to epsilon = 1). Returns (path, cost,
+    # nodes_explored, bound) for the best path found; a path reached before the first round
+    # finished has no bound yet (INF), and the path is None if the goal was not reached in time.
+    # metrics: optional Metrics.SearchMetrics; iterations counts finished rounds,
+    # reopenings the nodes carried over in INCONS
+    if epsilon < 1: raise ValueError(f"ARA* needs epsilon >= 1, got {epsilon}")
+    if metrics is not None: metrics.begin("ARA*", graph)
+    stop = INF if deadline is None else time.perf_counter() + deadline
+    start, goal = snap(graph, start), snap(graph, goal)
+    if start not in graph or goal not in graph:
+        if metrics is not None: metrics.finish(None, 0, 0, 0)
+        return None, 0, 0, INF
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    start, goal = graph.index[start], graph.index[goal]
+    h = heuristic_table(graph, goal, metric)
+
+    g_cost = array('d', [INF]) * graph.num_nodes
+    parent = new_parents(graph.num_nodes)
+    closed = array('i', [-1]) * graph.num_nodes   # round in which the node was last expanded
+    g_cost[start], parent[start] = 0, start
+    queued, incons = [start], []
+    best_path, best_cost, bound = None, 0, INF
+    nodes_explored = generated = reopened = rounds = 0
+    pushes = pops = decreases = 0
+    if metrics is not None: metrics.phase("setup")
+
+    while True:
+        #--New round: requeue OPEN and INCONS under the current epsilon--#
+        frontier = IndexedHeap(graph.num_nodes)
+        for node in queued: frontier.push(node, g_cost[node] + epsilon * h[node])
+        reopened += len(incons)
+        for node in incons: frontier.push(node, g_cost[node] + epsilon * h[node])
+        incons = []
+        timed_out = False
+
+        #--ImprovePath: weighted A* until the goal's f is the smallest--#
+        while frontier and g_cost[goal] > frontier.min_key():
+            if nodes_explored % CHECK_EVERY == 0 and time.perf_counter() > stop:
+                timed_out = True
+                break
+            _, current = frontier.pop()
+            closed[current] = rounds
+            nodes_explored += 1
+            if metrics is not None: metrics.expand(current, g_cost[current], len(frontier) + 1)
+            for e in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[e]
+                new_g = g_cost[current] + weights[e]
+                if new_g < g_cost[neighbor]:
+                    g_cost[neighbor], parent[neighbor] = new_g, current
+                    generated += 1
+                    if closed[neighbor] == rounds:
+                        incons.append(neighbor)   # already expanded this round: fixed up in the next one
+                    else:
+                        frontier.push(neighbor, new_g + epsilon * h[neighbor])
+        pushes += frontier.pushes; pops += frontier.pops; decreases += frontier.decreases
+        queued = frontier.heap[:]
+        if timed_out:
+            # The interrupted round may still have reached the goal more cheaply; the old bound stays valid
+            if g_cost[goal] < INF:
+                path = graph.path_labels(trace_path(parent, goal))
+                cost = graph.path_cost(path)
+                if best_path is None or cost < best_cost:
+                    best_path, best_cost = path, cost
+                    if on_solution is not None: on_solution(best_path, best_cost, bound)
+            break
+        if g_cost[goal] == INF: break
+        rounds += 1
+
+        #--Publish the round's path with its bound--#
+        path = graph.path_labels(trace_path(parent, goal))
+        cost = graph.path_cost(path)
+        lower = min((g_cost[node] + h[node] for node in queued + incons), default=INF)   # <= optimal cost
+        round_bound = max(1.0, min(epsilon, cost / lower)) if lower > 0 else 1.0
+        if best_path is None or cost < best_cost or round_bound < bound:
+            best_path, best_cost, bound = path, cost, min(bound, round_bound)
+            if on_solution is not None: on_solution(best_path, best_cost, bound)
+        if bound <= 1.0 or epsilon <= 1.0 or time.perf_counter() > stop: break
+        epsilon = max(1.0, epsilon - step)
+
+    if metrics is not None:
+        metrics.phase("search")
+        metrics.finish(best_path, best_cost, nodes_explored, generated, reopenings=reopened, iterations=rounds,
+                       heap_pushes=pushes, heap_pops=pops, heap_decreases=decreases)
+    return best_path, best_cost, nodes_explored, bound
+
+def main():
+    # python ARAStar.py [map] [deadline in ms]
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'PathFinder-test1.txt'
+    deadline = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else None
+    graph, origin, destinations = load_graph_cached(filename, undirected=True)
+    t0 = time.perf_counter()
+    report = lambda path, cost, bound: print(f"  {1000 * (time.perf_counter() - t0):8.2f} ms  cost {cost:<12g} "
+                                              f"bound {bound:.3f}  ({len(path)} nodes)")
+    for dest in destinations:
+        print(f"{origin} -> {dest}:")
+        metrics = SearchMetrics()
+        t0 = time.perf_counter()
+        path, cost, explored, bound = ara_star_algorithm(graph, origin, dest, deadline, metrics=metrics,
+                                                         on_solution=report)
+        print(metrics.table("ARA*"))
+        print(f"Best path (within {bound:.3f}x of optimal): {' -> '.join(map(str, path)) if path else 'none in time'}")
+
+if __name__ == "__main__":
+    main()
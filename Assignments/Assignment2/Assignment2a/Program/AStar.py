@@ -1,92 +1,120 @@
-import os
-import math
-import heapq
-import networkx as nx
-import matplotlib.pyplot as plt
+import sys
+from array import array
+if __package__:
+    from .Graph import new_parents, trace_path
+    from .Frontier import IndexedHeap, INF
+    from .GraphCache import load_graph_cached
+    from .Heuristics import goal_table, min_table
+    from .Landmarks import landmark_table
+    from .SpatialIndex import snap, snap_goals
+    from .SMAStar import sma_star_algorithm
+    from .Metrics import SearchMetrics
+    from .Render import render_paths
+else:
+    from Graph import new_parents, trace_path
+    from Frontier import IndexedHeap, INF
+    from GraphCache import load_graph_cached
+    from Heuristics import goal_table, min_table
+    from Landmarks import landmark_table
+    from SpatialIndex import snap, snap_goals
+    from SMAStar import sma_star_algorithm
+    from Metrics import SearchMetrics
+    from Render import render_paths
 
-def data_reading(filename): 
-    graph, positions, origin, destinations = {}, {}, None, []
-    if not os.path.exists(filename): return graph, positions, origin, destinations
-    with open(filename, 'r') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-    mode = ""
-    for line in lines:
-        if "Nodes" in line: mode = "nodes"; continue
-        if "Edges" in line: mode = "edges"; continue
-        if "Origin" in line: mode = "origin"; continue
-        if "Destinations" in line: mode = "dest"; continue
-        try:
-            if mode == "nodes" and ":" in line:
-                node, coord = line.split(":")
-                positions[int(node)] = tuple(map(int, coord.strip()[1:-1].split(',')))
-            elif mode == "edges" and ":" in line:
-                edge_part = line.split(":")[0].strip().replace("(", "").replace(")", "")
-                u, v = map(int, edge_part.split(','))
-                weight = int(line.split(":")[1].strip()) if ":" in line else 1
-                graph.setdefault(u, []).append((v, weight))
-                graph.setdefault(v, []).append((u, weight))
-            elif mode == "origin": origin = int(line)
-            elif mode == "dest": destinations = [int(x.strip()) for x in line.replace(';', ' ').split()]
-        except: continue
-    return graph, positions, origin, destinations
+def a_star_algorithm(graph, start, goal, frontier_type=IndexedHeap, metric="euclidean", landmarks=None, metrics=None,
+                     max_nodes=None):
+    # goal: a label or (x, y), or a list/set of them: the search stops at the nearest one
+    # frontier_type: IndexedHeap (one entry per node, decrease-key) or LazyHeap
+    # metric: euclidean / manhattan / octile / haversine, see Heuristics.py
+    # landmarks: Landmarks.Landmarks for this graph; replaces the metric with ALT lower bounds
+    # metrics: optional Metrics.SearchMetrics to fill in
+    # max_nodes: memory budget in search nodes; runs SMA* (SMAStar.py) instead of plain A*.
+    #   SMA* keeps its own open list, so it cannot be combined with another frontier_type;
+    #   landmarks are passed through.
+    if max_nodes is not None:
+        if frontier_type is not IndexedHeap:
+            raise ValueError(f"max_nodes (SMA*) cannot be combined with frontier_type={frontier_type.__name__}")
+        return sma_star_algorithm(graph, start, goal, max_nodes, metric, metrics, landmarks)
+    if metrics is not None: metrics.begin("A*", graph)
+    start, goals = snap(graph, start), snap_goals(graph, goal)
+    if start not in graph or not goals:
+        if metrics is not None: metrics.finish(None, 0, 0, 0)
+        return None, 0, 0
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    start = graph.index[start]
+    # h = min over the goals, still admissible (and consistent) for "reach any goal"
+    if landmarks is not None: h = min_table([landmark_table(landmarks, g) for g in goals])
+    else: h = goal_table(graph, goals, metric)
+    is_goal = bytearray(graph.num_nodes)
+    for node in goals: is_goal[node] = 1
 
-def heuristic(node_coords, goal_coords):
-    return math.sqrt((node_coords[0] - goal_coords[0])**2 + (node_coords[1] - goal_coords[1])**2)
-
-def a_star_algorithm(graph, positions, start, goal):
-    if start not in graph or goal not in positions: return None, 0, 0
-    
-    start_h = heuristic(positions[start], positions[goal])
-    frontier = [(start_h, 0, start, [start])]
-    visited = {} 
-    nodes_explored = 0
+    frontier = frontier_type(graph.num_nodes)   # keyed by f = g + h
+    g_cost = array('d', [INF]) * graph.num_nodes
+    parent = new_parents(graph.num_nodes)
+    g_cost[start], parent[start] = 0, start
+    frontier.push(start, h[start])
+    nodes_explored = generated = reopened = 0
+    if metrics is not None: metrics.phase("setup")
 
     while frontier:
-        f_val, g_cost, current, path = heapq.heappop(frontier)
-        
-        if current in visited and g_cost >= visited[current]: continue
-        visited[current] = g_cost
+        _, current = frontier.pop()
         nodes_explored += 1
+        if metrics is not None: metrics.expand(current, g_cost[current], len(frontier) + 1)
 
-        if current == goal:
-            return path, g_cost, nodes_explored
+        if is_goal[current]:
+            if metrics is not None: metrics.phase("search")
+            path = graph.path_labels(trace_path(parent, current))
+            if metrics is not None:
+                metrics.finish(path, g_cost[current], nodes_explored, generated, frontier, reopenings=reopened)
+            return path, g_cost[current], nodes_explored
 
-        for neighbor, weight in graph.get(current, []):
-            new_g = g_cost + weight
-            if neighbor not in visited or new_g < visited[neighbor]:
-                h_neighbor = heuristic(positions[neighbor], positions[goal])
-                new_f = new_g + h_neighbor
-                heapq.heappush(frontier, (new_f, new_g, neighbor, path + [neighbor]))
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            new_g = g_cost[current] + weights[e]
+            if new_g < g_cost[neighbor]:
+                # A closed node is simply pushed again (re-opened) if the heuristic is inconsistent
+                if g_cost[neighbor] < INF and neighbor not in frontier: reopened += 1
+                g_cost[neighbor], parent[neighbor] = new_g, current
+                frontier.push(neighbor, new_g + h[neighbor])
+                generated += 1
                 
+    if metrics is not None: metrics.finish(None, 0, nodes_explored, generated, frontier, reopenings=reopened)
     return None, 0, nodes_explored
 
-def main():
+def main(output=None):
+    # output: write every destination's path to one PNG/SVG (headless) instead of plt.show()
     filename = 'PathFinder-test1.txt'
-    graph, positions, origin, destinations = data_reading(filename)
+    try:
+        graph, origin, destinations = load_graph_cached(filename, undirected=True)
+    except FileNotFoundError:
+        print("Data Error!"); return
+    positions = graph.positions()
     if not graph: print("Data Error!"); return
 
+    if output is None:
+        # Plotting libraries are only imported when something is drawn
+        import networkx as nx
+        import matplotlib.pyplot as plt
+        G = nx.Graph()
+        for u, v, w in graph.edges(): G.add_edge(u, v, weight=w)
+
+    # One search over the whole Destinations list stops at the nearest destination
+    metrics = SearchMetrics()
+    path, total_cost, explored = a_star_algorithm(graph, origin, destinations, metrics=metrics)
+    print("\n" + metrics.table("A* (any destination)"))
+    if path: print(f"Nearest destination: {path[-1]} ({' -> '.join(map(str, path))}, Cost: {total_cost})")
+
+    paths = {}
     for dest in destinations:
-        path, total_cost, explored = a_star_algorithm(graph, positions, origin, dest)
+        metrics = SearchMetrics()
+        path, total_cost, explored = a_star_algorithm(graph, origin, dest, metrics=metrics)
+        paths[f"{origin} -> {dest} (Cost: {total_cost})"] = path
         
         # Performance Showcase
-        total_nodes = len(positions)
-        ratio = (explored / total_nodes) * 100 if total_nodes > 0 else 0
-        
-        print("\n" + "="*50)
-        print(f"{'--- A* PERFORMANCE SHOWCASE ---':^50}")
-        print("="*50)
-        print(f"{'1. Success Rate:':<25} {'100.0%' if path else '0.0%'}")
-        print(f"{'2. Nodes Explored:':<25} {explored} nodes")
-        print(f"{'3. Exploration Ratio:':<25} {ratio:.2f}%")
-        print(f"{'4. Total Path Cost:':<25} {total_cost}")
-        print(f"{'5. Optimality:':<25} Guaranteed (Best Path)")
-        print("="*50)
+        print("\n" + metrics.table("A*"))
 
-        if path:
+        if path and output is None:
             plt.figure(figsize=(8, 6))
-            G = nx.Graph()
-            for u, neighbors in graph.items():
-                for v, w in neighbors: G.add_edge(u, v, weight=w)
             nx.draw(G, pos=positions, with_labels=True, node_color='plum', 
                     edge_color='black', width=1.5, node_size=800)
             path_edges = list(zip(path, path[1:]))
@@ -94,5 +122,9 @@ def main():
             plt.title(f"A* Path: {origin} -> {dest} (Cost: {total_cost})")
             plt.axis('on'); plt.grid(True, linestyle='--', alpha=0.5); plt.show()
 
+    if output is not None:
+        render_paths(graph, paths, output, title=f"A* Paths from {origin}", node_color='plum')
+        print(f"\nSaved {output}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
@@ -1,99 +1,189 @@
 #--Importing--#
-import os
-import networkx as nx
-import matplotlib.pyplot as plt
+import sys
+from array import array
 from collections import deque
+if __package__:
+    from .Graph import new_parents, trace_path, NO_PARENT
+    from .GraphCache import load_graph_cached
+    from .SpatialIndex import snap, snap_all
+    from .Metrics import SearchMetrics
+    from .Render import render_paths
+else:
+    from Graph import new_parents, trace_path, NO_PARENT
+    from GraphCache import load_graph_cached
+    from SpatialIndex import snap, snap_all
+    from Metrics import SearchMetrics
+    from Render import render_paths
 
-#--1. Data Parsing (Improved Robustness)--#
-def data_parsing(filename):
-    graph, positions, origin, destinations = {}, {}, None, []
-    if not os.path.exists(filename):
-        print(f"File not found: {filename}")
-        return graph, positions, origin, destinations
-
-    with open(filename, 'r') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-
-    mode = ""
-    for line in lines:
-        # Nhận diện Mode linh hoạt hơn
-        if "Nodes" in line: mode = "nodes"; continue
-        if "Edges" in line: mode = "edges"; continue
-        if "Origin" in line: mode = "origin"; continue
-        if "Destinations" in line: mode = "dest"; continue
-
-        try:
-            if mode == "nodes" and ":" in line:
-                node, coord = line.split(":")
-                # Xử lý tọa độ (x,y) hoặc (x, y)
-                clean_coord = coord.strip().replace("(", "").replace(")", "")
-                positions[int(node)] = tuple(map(int, clean_coord.split(',')))
-            elif mode == "edges" and ":" in line:
-                # Xử lý cạnh (u,v)
-                edge_part = line.split(":")[0].strip().replace("(", "").replace(")", "")
-                u, v = map(int, edge_part.split(','))
-                graph.setdefault(u, []).append(v)
-                graph.setdefault(v, []).append(u)
-            elif mode == "origin":
-                origin = int(line)
-            elif mode == "dest":
-                # Chấp nhận cả dấu ; hoặc dấu cách
-                destinations = [int(x.strip()) for x in line.replace(';', ' ').split()]
-        except ValueError:
-            continue # Bỏ qua dòng lỗi định dạng
-            
-    return graph, positions, origin, destinations
-
-#--2. BFS Algorithm--#
-def bfs_algorithm(graph, start, goal):
-    if start not in graph: return None, 0
-    queue = deque([[start]])
-    visited = {start}
-    nodes_explored = 0
+#--1. BFS Algorithm--#
+def bfs_algorithm(graph, start, goal, metrics=None):
+    if metrics is not None: metrics.begin("BFS", graph)
+    start, goal = snap(graph, start), snap(graph, goal)
+    if start not in graph:
+        if metrics is not None: metrics.finish(None, 0, 0, 0)
+        return None, 0
+    # Work on dense CSR ids; labels are only translated back for the result
+    offsets, targets = graph.offsets, graph.targets
+    start, goal = graph.index[start], graph.index.get(goal, -1)
+    queue = deque([start])
+    parent = new_parents(graph.num_nodes)   # doubles as the visited set
+    parent[start] = start
+    nodes_explored = generated = 0
+    if metrics is not None: metrics.phase("setup")
 
     while queue:
-        path = queue.popleft()
-        node = path[-1]
+        node = queue.popleft()
         nodes_explored += 1
+        if metrics is not None: metrics.expand(node, None, len(queue) + 1)
 
         if node == goal:
+            if metrics is not None: metrics.phase("search")
+            path = graph.path_labels(trace_path(parent, node))
+            if metrics is not None: metrics.finish(path, graph.path_cost(path), nodes_explored, generated)
             return path, nodes_explored
 
-        for neighbor in graph.get(node, []):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.append(path + [neighbor])
+        for e in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[e]
+            if parent[neighbor] == NO_PARENT:
+                parent[neighbor] = node
+                queue.append(neighbor)
+                generated += 1
+    if metrics is not None: metrics.finish(None, 0, nodes_explored, generated)
     return None, nodes_explored
 
-#--3. Main Execution--#
-def main():
+#--2. One-to-many BFS: one search tree answers every destination--#
+def bfs_one_to_many(graph, start, goals, metrics=None):
+    # Returns {goal: (path, hops, nodes_explored_when_reached)}; stops once every goal is dequeued.
+    # metrics: optional SearchMetrics, filled in as one search per goal that share the tree: each
+    # goal is charged the expansions since the previous one, so the totals are the tree's own
+    if metrics is not None: metrics.begin("BFS", graph)
+    results = {g: (None, 0, 0) for g in goals}
+    start = snap(graph, start)
+    if start not in graph:
+        if metrics is not None:
+            for _ in results: metrics.finish(None, 0, 0, 0)
+        return results
+    offsets, targets = graph.offsets, graph.targets
+    pending = {}   # node id -> every goal that resolves to it (a label and a coordinate snapped onto it)
+    for g, s in zip(goals, snap_all(graph, goals)):
+        if s in graph: pending.setdefault(graph.index[s], []).append(g)
+    start = graph.index[start]
+    queue = deque([start])
+    parent = new_parents(graph.num_nodes)
+    parent[start] = start
+    nodes_explored = generated = 0
+    charged = (0, 0)   # (expansions, generations) already credited to earlier goals
+    if metrics is not None: metrics.phase("setup")
+
+    while queue and pending:
+        node = queue.popleft()
+        nodes_explored += 1
+        if metrics is not None: metrics.expand(node, None, len(queue) + 1)
+
+        if node in pending:
+            path = graph.path_labels(trace_path(parent, node))
+            for goal in pending.pop(node):
+                results[goal] = (path, len(path) - 1, nodes_explored)
+                if metrics is not None:
+                    metrics.phase("search")
+                    metrics.finish(path, graph.path_cost(path), nodes_explored - charged[0], generated - charged[1])
+                    charged = (nodes_explored, generated)
+            if not pending: break
+
+        for e in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[e]
+            if parent[neighbor] == NO_PARENT:
+                parent[neighbor] = node
+                queue.append(neighbor)
+                generated += 1
+    if metrics is not None:
+        for path, _, _ in results.values():
+            if path is None:
+                metrics.finish(None, 0, nodes_explored - charged[0], generated - charged[1])
+                charged = (nodes_explored, generated)
+    return results
+
+#--3. Bidirectional BFS: two balls of radius d/2 instead of one of radius d--#
+def bidirectional_bfs(graph, start, goal):
+    # Same (path, nodes_explored) contract as bfs_algorithm. The backward side
+    # walks graph.reverse(), so one-way edges are respected.
+    start, goal = snap(graph, start), snap(graph, goal)
+    if start not in graph or goal not in graph: return None, 0
+    start, goal = graph.index[start], graph.index[goal]
+    if start == goal: return [graph.labels[start]], 1
+    n = graph.num_nodes
+    sides = []
+    for root, g in ((start, graph), (goal, graph.reverse())):
+        parent, depth = new_parents(n), array('i', [-1]) * n
+        parent[root], depth[root] = root, 0
+        sides.append((g.offsets, g.targets, parent, depth, [root]))
+    nodes_explored = 0
+
+    while sides[0][4] and sides[1][4]:
+        # Expand one full level of the smaller frontier
+        side = 0 if len(sides[0][4]) <= len(sides[1][4]) else 1
+        offsets, targets, parent, depth, level = sides[side]
+        other_depth = sides[1 - side][3]
+        best, meet, next_level = -1, -1, []
+        for node in level:
+            nodes_explored += 1
+            for e in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[e]
+                if parent[neighbor] == NO_PARENT:
+                    parent[neighbor], depth[neighbor] = node, depth[node] + 1
+                    next_level.append(neighbor)
+                if other_depth[neighbor] != -1:
+                    total = depth[node] + 1 + other_depth[neighbor]
+                    if best == -1 or total < best:
+                        best, meet = total, (node, neighbor)
+        sides[side] = (offsets, targets, parent, depth, next_level)
+
+        if meet != -1:
+            # Frontiers met: the level just finished contains a shortest connection
+            node, neighbor = meet
+            head = trace_path(sides[side][2], node)
+            tail = trace_path(sides[1 - side][2], neighbor)[::-1]
+            path = head + tail if side == 0 else tail[::-1] + head[::-1]
+            return graph.path_labels(path), nodes_explored
+    return None, nodes_explored
+
+#--4. Main Execution--#
+def main(output=None):
+    # output: write every destination's path to one PNG/SVG (headless) instead of plt.show()
     # Kiểm tra tên file chính xác của bạn
     filename = 'PathFinder-test1.txt' 
-    graph, positions, origin, destinations = data_parsing(filename)
+    try:
+        graph, origin, destinations = load_graph_cached(filename, undirected=True)
+    except FileNotFoundError:
+        print(f"File not found: {filename}"); return
+    positions = graph.positions()
     
     if not graph or origin is None: 
         print("Data Error: Could not parse Graph or Origin!"); return
 
+    if output is None:
+        # Plotting libraries are only imported when something is drawn
+        import networkx as nx
+        import matplotlib.pyplot as plt
+        G = nx.Graph()
+        # Đảm bảo tất cả node có trong hình dù không có cạnh
+        for n in positions: G.add_node(n)
+        for u, v, _ in graph.edges(): G.add_edge(u, v)
+
+    # One search tree for every destination; the table covers all of them together
+    metrics = SearchMetrics()
+    results = bfs_one_to_many(graph, origin, destinations, metrics=metrics)
+    print("\n" + metrics.table("BFS"))
+    paths = {}
     for dest in destinations:
-        path, explored = bfs_algorithm(graph, origin, dest)
-        
-        # In bảng giống hệt image_242760.png
-        total_nodes = len(positions)
-        print("\n" + "-"*5 + " BFS PERFORMANCE SHOWCASE " + "-"*5)
-        print(f"1. Success Rate: {'100.0%' if path else '0.0%'}")
-        print(f"2. Nodes Explored: {explored} nodes")
-        print(f"3. Path Found Length: {len(path) if path else 0} nodes")
-        print(f"4. Exploration Ratio: {(explored/total_nodes)*100:.2f}%" if total_nodes > 0 else "4. Exploration Ratio: 0%")
+        path, hops, explored = results[dest]
+        paths[f"{origin} -> {dest}"] = path
+        print(f"{origin} -> {dest}: {' -> '.join(map(str, path)) if path else 'no path'} "
+              f"({hops} hops, {explored} nodes explored when reached)")
         
         # Vẽ hình
-        if path:
+        if path and output is None:
             plt.figure(figsize=(7, 6))
-            G = nx.Graph()
-            # Đảm bảo tất cả node có trong hình dù không có cạnh
-            for n in positions: G.add_node(n)
-            for u, neighbors in graph.items():
-                for v in neighbors: G.add_edge(u, v)
-            
             nx.draw(G, pos=positions, with_labels=True, node_color='skyblue', 
                     edge_color='black', width=1.5, node_size=800)
             
@@ -105,5 +195,9 @@ def main():
             plt.grid(True, linestyle='--', alpha=0.5)
             plt.show()
 
+    if output is not None:
+        render_paths(graph, paths, output, title=f"BFS Paths from {origin}")
+        print(f"\nSaved {output}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
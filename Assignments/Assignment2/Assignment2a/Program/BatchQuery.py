@@ -0,0 +1,244 @@
+#--Batch query engine: many (origin, destination, algorithm) queries over one map--#
+# The graph is encoded once into a multiprocessing.shared_memory block (same
+# layout as the GraphCache file); every worker attaches to it instead of
+# receiving a pickled copy. Results stream back in query order as JSON lines.
+#   python BatchQuery.py PathFinder-test1.txt queries.txt --workers 8
+# Query file: one "origin destination [algorithm]" per line ('#' comments ok);
+# origin/destination may be a coordinate "(x,y)", snapped to the nearest node.
+# --cache routes.sqlite answers repeated queries from a persistent route cache.
+# --metrics adds a "metrics" object (see Metrics.py) to every result.
+import os
+import re
+import sys
+import json
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+if __package__:
+    from .Parser import parse_label
+    from .GraphCache import load_graph_cached, encode_graph, decode_graph
+    from .BFS import bfs_algorithm
+    from .DFS import dfs_algorithm
+    from .UCS import ucs_algorithm
+    from .AStar import a_star_algorithm
+    from .SMAStar import sma_star_algorithm
+    from .ARAStar import ara_star_algorithm
+    from .GBFS import gbfs_algorithm
+    from .IDAStar import ida_star_algorithm
+    from .CustomSearch import beam_search
+    from .Render import PathRenderer
+    from .RouteCache import RouteCache, MAX_ENTRIES
+    from .Metrics import SearchMetrics
+else:
+    from Parser import parse_label
+    from GraphCache import load_graph_cached, encode_graph, decode_graph
+    from BFS import bfs_algorithm
+    from DFS import dfs_algorithm
+    from UCS import ucs_algorithm
+    from AStar import a_star_algorithm
+    from SMAStar import sma_star_algorithm
+    from ARAStar import ara_star_algorithm
+    from GBFS import gbfs_algorithm
+    from IDAStar import ida_star_algorithm
+    from CustomSearch import beam_search
+    from Render import PathRenderer
+    from RouteCache import RouteCache, MAX_ENTRIES
+    from Metrics import SearchMetrics
+
+#--1. Algorithm adapters: every search reports (path, cost, nodes_explored)--#
+def _bfs(graph, start, goal, metrics=None):
+    path, explored = bfs_algorithm(graph, start, goal, metrics=metrics)
+    return path, graph.path_cost(path) if path else 0, explored
+
+def _dfs(graph, start, goal, metrics=None):
+    metrics = metrics if metrics is not None else SearchMetrics()
+    path = dfs_algorithm(graph, start, [goal], metrics=metrics)
+    if not path: return None, 0, metrics.expansions   # explored work still counts on failure
+    return path, graph.path_cost(path), metrics.expansions
+
+def _ucs(graph, start, goal, metrics=None):
+    return ucs_algorithm(graph, start, [goal], metrics=metrics)
+
+def _gbfs(graph, start, goal, metrics=None):
+    path, explored = gbfs_algorithm(graph, start, goal, metrics=metrics)
+    return path, graph.path_cost(path) if path else 0, explored
+
+def _ida_star(graph, start, goal, metrics=None):
+    path, explored, cost = ida_star_algorithm(graph, start, goal, metrics=metrics)
+    return path, cost, explored
+
+def _ara_star(graph, start, goal, metrics=None):
+    # Run to the proven optimum (no deadline), so results match astar
+    path, cost, explored, _ = ara_star_algorithm(graph, start, goal, metrics=metrics)
+    return path, cost, explored
+
+def _beam(graph, start, goal, metrics=None):
+    path, explored, cost = beam_search(graph, start, goal, metrics=metrics)
+    return path, cost, explored
+
+ALGORITHMS = {
+    "bfs": _bfs, "dfs": _dfs, "ucs": _ucs, "astar": a_star_algorithm,
+    "gbfs": _gbfs, "idastar": _ida_star, "beam": _beam, "smastar": sma_star_algorithm,
+    "arastar": _ara_star,
+}
+
+def run_query(graph, origin, destination, algorithm, cache=None, metrics=False):
+    # cache: RouteCache; repeated (graph, algorithm, origin, destination) queries skip the search.
+    # metrics: add a SearchMetrics dict (such queries always search, since a cache hit has no metrics)
+    search = ALGORITHMS[algorithm]
+    result = {"origin": origin, "destination": destination, "algorithm": algorithm}
+    if metrics:
+        m = SearchMetrics(algorithm)
+        path, cost, explored = search(graph, origin, destination, metrics=m)
+        result["metrics"] = m.to_dict()
+    elif cache is None:
+        path, cost, explored = search(graph, origin, destination)
+    else:
+        path, cost, explored = cache.call(search, graph, origin, destination)
+    result.update(path=path, cost=cost, nodes_explored=explored)
+    return result
+
+#--2. Shared-memory graph--#
+def share_graph(graph, undirected=False):
+    chunks = encode_graph(graph, None, [], undirected)
+    shm = shared_memory.SharedMemory(create=True, size=sum(len(c) for c in chunks))
+    pos = 0
+    for chunk in chunks:
+        shm.buf[pos:pos + len(chunk)] = chunk
+        pos += len(chunk)
+    return shm
+
+def attach_graph(name):
+    # The parent owns (and unlinks) the block, so workers must not register it
+    # with the resource tracker, or it would be unlinked when they exit.
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)   # Python 3.13+
+    except TypeError:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args: None
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+    return shm, decode_graph(shm.buf)[0]
+
+_worker = {}
+
+def _worker_init(name, cache_options=None, metrics=False):
+    _worker["shm"], _worker["graph"] = attach_graph(name)
+    _worker["cache"] = RouteCache(**cache_options) if cache_options else None
+    _worker["metrics"] = metrics
+
+def _worker_run(chunk):
+    graph, cache = _worker["graph"], _worker["cache"]
+    results = [run_query(graph, *query, cache=cache, metrics=_worker["metrics"]) for query in chunk]
+    if cache is None: return results, None
+    counters, cache.counters = cache.counters, dict.fromkeys(cache.counters, 0)
+    return results, counters   # the parent adds these into its own cache's counters
+
+#--3. Batch API--#
+TOKENS = re.compile(r"\([^)]*\)|[^\s,()]+")
+
+def parse_endpoint(token):
+    if token.startswith("("):
+        x, y = token.strip("()").split(",")
+        return float(x), float(y)
+    return parse_label(token)
+
+def iter_queries(lines, default_algorithm="astar"):
+    for line in lines:
+        line = TOKENS.findall(line.split("#", 1)[0])
+        if len(line) < 2: continue
+        algorithm = line[2].lower() if len(line) > 2 else default_algorithm
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {sorted(ALGORITHMS)}")
+        yield parse_endpoint(line[0]), parse_endpoint(line[1]), algorithm
+
+def _chunks(queries, size):
+    chunk = []
+    for query in queries:
+        chunk.append(query)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk: yield chunk
+
+def run_batch(graph, queries, workers=None, chunksize=64, undirected=False, cache=None, metrics=False):
+    # Yields one result dict per query, in query order. At most a few chunks per
+    # worker are in flight, so huge query streams run in bounded memory.
+    # cache: RouteCache; workers open their own connection to the same file.
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for query in queries:
+            yield run_query(graph, *query, cache=cache, metrics=metrics)
+        return
+
+    def collect(future):
+        results, counters = future.result()
+        if counters:
+            for name, value in counters.items(): cache.counters[name] += value
+        return results
+
+    cache_options = None
+    if cache is not None:
+        cache_options = {"path": cache.path, "max_entries": cache.max_entries, "memory_entries": cache.memory_entries}
+    shm = share_graph(graph, undirected)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init,
+                                 initargs=(shm.name, cache_options, metrics)) as pool:
+            pending = deque()
+            for chunk in _chunks(queries, chunksize):
+                pending.append(pool.submit(_worker_run, chunk))
+                if len(pending) >= 4 * workers:
+                    yield from collect(pending.popleft())
+            while pending:
+                yield from collect(pending.popleft())
+    finally:
+        shm.close()
+        shm.unlink()
+
+#--4. CLI--#
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a file of PathFinder queries on a process pool")
+    parser.add_argument("map", help="PathFinder map file")
+    parser.add_argument("queries", help="query file ('-' for stdin)")
+    parser.add_argument("--algorithm", default="astar", choices=sorted(ALGORITHMS),
+                        help="algorithm for lines that do not name one")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=64, help="queries per task")
+    parser.add_argument("--directed", action="store_true", help="treat edges as one-way")
+    parser.add_argument("--render", metavar="DIR", help="also write one image per query into DIR")
+    parser.add_argument("--format", default="png", choices=("png", "svg"), help="image format for --render")
+    parser.add_argument("--cache", metavar="FILE", help="SQLite route cache shared across runs and workers")
+    parser.add_argument("--cache-entries", type=int, default=MAX_ENTRIES, help="disk cache size bound")
+    parser.add_argument("--metrics", action="store_true", help="add search metrics to every result")
+    args = parser.parse_args(argv)
+
+    graph, _, _ = load_graph_cached(args.map, undirected=not args.directed)
+    cache = None
+    if args.cache:
+        cache = RouteCache(args.cache, max_entries=args.cache_entries)
+        cache.register_map(args.map, graph)
+    renderer = None
+    if args.render:
+        # One base layer for the whole batch; each image only adds its path
+        os.makedirs(args.render, exist_ok=True)
+        renderer = PathRenderer(graph, title=os.path.basename(args.map))
+    lines = sys.stdin if args.queries == "-" else open(args.queries, 'r')
+    with lines:
+        queries = iter_queries(lines, args.algorithm)
+        for i, result in enumerate(run_batch(graph, queries, args.workers, args.chunksize, not args.directed, cache,
+                                                     args.metrics)):
+            sys.stdout.write(json.dumps(result) + "\n")
+            if renderer is not None:
+                name = f"{i:05d}-{result['algorithm']}-{result['origin']}-{result['destination']}.{args.format}"
+                renderer.render({f"{result['origin']} -> {result['destination']}": result["path"]},
+                                os.path.join(args.render, name))
+    if renderer is not None: renderer.close()
+    if cache is not None:
+        cache.evict()
+        print(json.dumps({"cache": cache.stats()}), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#--Cross-algorithm benchmark over PathFinder maps--#
+# Each (map, algorithm) job runs in its own child process, so peak RSS is
+# per job and a runaway search (IDA* on a large map) can be killed by the
+# timeout without losing the rest of the run.
+#   python Benchmark.py --generate grid:1e4 road:1e5 --queries 20 --csv results.csv
+#   python Benchmark.py PathFinder-test*.txt --algorithms astar,ucs --json results.json
+import os
+import csv
+import sys
+import json
+import glob
+import time
+import queue
+import random
+import argparse
+import tracemalloc
+try:
+    import resource   # POSIX only: peak_rss_kb is left empty without it (Windows)
+except ImportError:
+    resource = None
+import multiprocessing as mp
+if __package__:
+    from .GraphCache import load_graph_cached
+    from .BatchQuery import ALGORITHMS
+    from .GraphGenerator import ensure_generated, KINDS
+else:
+    from GraphCache import load_graph_cached
+    from BatchQuery import ALGORITHMS
+    from GraphGenerator import ensure_generated, KINDS
+
+FIELDS = ["map", "nodes", "edges", "algorithm", "queries", "solved", "wall_time_s",
+          "nodes_explored", "nodes_per_s", "peak_rss_kb", "tracemalloc_peak_kb", "status"]
+
+#--1. One job (runs in a child process)--#
+def peak_rss_kb():
+    if resource is None: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak   # bytes on macOS, KiB on Linux
+
+def pick_queries(graph, origin, destinations, count, seed):
+    if count <= 0:
+        return [(origin, d) for d in destinations]
+    rng = random.Random(seed)
+    labels = graph.labels
+    return [(labels[rng.randrange(len(labels))], labels[rng.randrange(len(labels))]) for _ in range(count)]
+
+def run_job(filename, algorithm, count, seed, trace, results):
+    row = {"map": os.path.basename(filename), "algorithm": algorithm, "status": "ok"}
+    try:
+        graph, origin, destinations = load_graph_cached(filename, undirected=True)
+        queries = pick_queries(graph, origin, destinations, count, seed)
+        search = ALGORITHMS[algorithm]
+        row.update(nodes=graph.num_nodes, edges=graph.num_edges, queries=len(queries))
+
+        if trace: tracemalloc.start()
+        solved = explored = 0
+        t0 = time.perf_counter()
+        for start, goal in queries:
+            path, _, n = search(graph, start, goal)
+            solved += path is not None
+            explored += n
+        elapsed = time.perf_counter() - t0
+        if trace:
+            row["tracemalloc_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+
+        row.update(solved=solved, wall_time_s=round(elapsed, 6), nodes_explored=explored,
+                   nodes_per_s=round(explored / elapsed) if elapsed > 0 else 0)
+    except Exception as e:   # a bad map or a failing search is one row, not a lost job
+        row["status"] = f"error: {type(e).__name__}: {e}"
+    row["peak_rss_kb"] = peak_rss_kb()
+    results.put(row)
+
+def benchmark(filename, algorithm, count=0, seed=30019, trace=False, timeout=120):
+    results = mp.Queue()
+    child = mp.Process(target=run_job, args=(filename, algorithm, count, seed, trace, results))
+    child.start()
+    child.join(timeout)
+    if child.is_alive():
+        child.kill(); child.join()
+        return {"map": os.path.basename(filename), "algorithm": algorithm, "status": f"timeout ({timeout}s)"}
+    try:
+        return results.get(timeout=5)
+    except queue.Empty:
+        return {"map": os.path.basename(filename), "algorithm": algorithm, "status": f"crashed (exit {child.exitcode})"}
+
+#--2. CLI--#
+def main():
+    parser = argparse.ArgumentParser(description="Time every search algorithm on PathFinder maps")
+    parser.add_argument("maps", nargs="*", help="map files or glob patterns")
+    parser.add_argument("--generate", nargs="*", default=[], metavar="KIND:N",
+                        help=f"generate maps first, KIND in {KINDS}, e.g. road:1e5")
+    parser.add_argument("--workdir", default="bench_maps", help="where generated maps are written")
+    parser.add_argument("--algorithms", default=",".join(ALGORITHMS), help="comma separated")
+    parser.add_argument("--queries", type=int, default=0, help="random queries per map (0: the map's own destinations)")
+    parser.add_argument("--seed", type=int, default=30019)
+    parser.add_argument("--timeout", type=float, default=120, help="seconds per (map, algorithm) job")
+    parser.add_argument("--tracemalloc", action="store_true", help="also record Python heap peak (slower)")
+    parser.add_argument("--csv", help="write rows to this CSV file ('-' for stdout)")
+    parser.add_argument("--json", help="write rows to this JSON file")
+    args = parser.parse_args()
+
+    maps = [m for pattern in args.maps for m in sorted(glob.glob(pattern))]
+    maps += [ensure_generated(spec, args.workdir, args.seed) for spec in args.generate]
+
+    rows = []
+    for filename in maps:
+        for algorithm in args.algorithms.split(","):
+            row = benchmark(filename, algorithm, args.queries, args.seed, args.tracemalloc, args.timeout)
+            rows.append(row)
+            print(f"{row['map']:<32} {algorithm:<8} {row.get('wall_time_s', '-'):>10} s "
+                  f"{row.get('nodes_explored', '-'):>10} nodes {row.get('peak_rss_kb') or '-':>8} kB  {row['status']}",
+                  file=sys.stderr)
+
+    if args.csv:
+        out = sys.stdout if args.csv == "-" else open(args.csv, 'w', newline='')
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader(); writer.writerows(rows)
+        if out is not sys.stdout: out.close()
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,99 @@
 #--In custome search, my team decide to utilize the Beam Search algorithm--#
 #--Python Libraries--#
-import math
 import heapq
-import re
-import matplotlib.pyplot as plt
+if __package__:
+    from .Graph import new_parents, trace_path, NO_PARENT
+    from .GraphCache import load_graph_cached
+    from .SpatialIndex import snap
+    from .Metrics import SearchMetrics
+else:
+    from Graph import new_parents, trace_path, NO_PARENT
+    from GraphCache import load_graph_cached
+    from SpatialIndex import snap
+    from Metrics import SearchMetrics
 
-#--The Heuristic and Core Logic--#
-def heuristic(node, goal, positions):
-    (x1, y1) = positions[node]
-    (x2, y2) = positions[goal]
-    return math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
+#--The Heuristic and Core Logic: per-goal tables from Heuristics.py--#
+if __package__: from .Heuristics import heuristic_table
+else: from Heuristics import heuristic_table
 
 #--Beam Seach Implementation--#
-def beam_search(graph, positions, start, goal, k=2):
-    # Initial beam: (heuristic, current_node, path, g_cost)
-    beam = [(heuristic(start, goal, positions), start, [start], 0)]
-    nodes_explored = 0
+# Each layer keeps at most k states. A node enters the beam at most once
+# (parent[node] is set when it survives a layer), so the path is stored as
+# parent pointers like BFS and no per-candidate path copy or scan is needed.
+# Candidates are first deduplicated by node (best score wins), then the k best
+# are picked with a bounded max-heap: cost per layer is O(k * branching * log k).
+SCORES = {"h": (0.0, 1.0), "g+h": (1.0, 1.0), "weighted": (1.0, None)}   # (g factor, h factor)
+
+def beam_search(graph, start, goal, k=2, metric="euclidean", score="h", weight=2.0, metrics=None):
+    # score: "h" (greedy beam), "g+h" (A*-style) or "weighted" (g + weight * h)
+    if score not in SCORES:
+        raise ValueError(f"Unknown beam score '{score}', expected one of {sorted(SCORES)}")
+    if metrics is not None: metrics.begin("Beam", graph)
+    start, goal = snap(graph, start), snap(graph, goal)
+    if start not in graph or goal not in graph:
+        if metrics is not None: metrics.finish(None, 0, 0, 0)
+        return None, 0, 0
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    start, goal = graph.index[start], graph.index[goal]
+    h_table = heuristic_table(graph, goal, metric)
+    g_factor, h_factor = SCORES[score]
+    if h_factor is None: h_factor = weight
+    parent = new_parents(graph.num_nodes)   # also the set of nodes that already entered a beam
+    parent[start] = start
+    # Beam entries: (current_node, g_cost)
+    beam = [(start, 0)]
+    nodes_explored = generated = heap_ops = 0
+    if metrics is not None: metrics.phase("setup")
 
     while beam:
-        candidates = []
         nodes_explored += len(beam)
-        for _, current, path, g_cost in beam:
+        candidates = {}   # node -> (score, order, g, parent): one entry per state
+        order = 0
+        for current, g_cost in beam:
+            if metrics is not None: metrics.expand(current, g_cost, len(beam))
             if current == goal:
+                if metrics is not None: metrics.phase("search")
+                path = graph.path_labels(trace_path(parent, goal))
+                if metrics is not None:
+                    metrics.finish(path, g_cost, nodes_explored, generated, heap_pushes=heap_ops)
                 return path, nodes_explored, g_cost
             #--Explore Neighbors--#
-            for neighbor, weight in graph.get(current, []):
-                if neighbor not in path:
-                    new_path = path + [neighbor]
-                    new_g = g_cost + weight
-                    h = heuristic(neighbor, goal, positions)
-                    candidates.append((h, neighbor, new_path, new_g))
-        #--Beam Width Pruning--#
-        beam = heapq.nsmallest(k, candidates, key=lambda x: x[0])
+            for e in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[e]
+                if parent[neighbor] != NO_PARENT: continue
+                new_g = g_cost + weights[e]
+                key = g_factor * new_g + h_factor * h_table[neighbor]
+                old = candidates.get(neighbor)
+                if old is None or key < old[0]:
+                    candidates[neighbor] = (key, order, new_g, current)
+                order += 1
+        generated += order
+        if metrics is not None and len(candidates) > metrics.peak_frontier: metrics.peak_frontier = len(candidates)
+        #--Beam Width Pruning: bounded max-heap of the k best (score, order)--#
+        best = []
+        for neighbor, (key, order, new_g, via) in candidates.items():
+            if len(best) < k:
+                heapq.heappush(best, (-key, -order, neighbor, new_g, via))
+                heap_ops += 1
+            elif (key, order) < (-best[0][0], -best[0][1]):
+                heapq.heapreplace(best, (-key, -order, neighbor, new_g, via))
+                heap_ops += 1
+        best.sort(reverse=True)   # best first, so beam order matches the selection order
+        beam = []
+        for _, _, neighbor, new_g, via in best:
+            parent[neighbor] = via
+            beam.append((neighbor, new_g))
+    if metrics is not None: metrics.finish(None, 0, nodes_explored, generated, heap_pushes=heap_ops)
     return None, nodes_explored, 0
 #--Advanced Visualization Logic--#
 def draw_graph(positions, graph, path, goal_node, title="Beam Search Visualization"):
+    import matplotlib.pyplot as plt   # only loaded when something is drawn
     plt.figure(figsize=(12, 8))
     #--Draw all edges--#
-    for u in graph:
-        for v, _ in graph[u]:
-            plt.plot([positions[u][0], positions[v][0]], 
-                     [positions[u][1], positions[v][1]], 
-                     'gray', linestyle='--', alpha=0.3, zorder=1)
+    for u, v, _ in graph.edges():
+        plt.plot([positions[u][0], positions[v][0]], 
+                 [positions[u][1], positions[v][1]], 
+                 'gray', linestyle='--', alpha=0.3, zorder=1)
     #--Draw all nodes--#
     for node, (x, y) in positions.items():
         color = 'skyblue'
@@ -65,39 +117,16 @@ def draw_graph(positions, graph, path, goal_node, title="Beam Search Visualizati
 #--Main Execution--#
 def main():
     file_name = "PathFinder-test11.txt" 
-    positions, graph, destinations = {}, {}, []
-    origin = None
-
     print("-----------------------------------------------")
     print(f"   BEAM SEARCH SYSTEM - TEAM GAMBLE")
     print("---------------------------------------------\n")
 
     try:
-        with open(file_name, "r") as f:
-            content = f.read()
-            
-            #==Parse Nodes--#
-            nodes_data = re.findall(r"([a-zA-Z0-9_]+):\s*\(([\d.-]+),\s*([\d.-]+)\)", content)
-            for node, x, y in nodes_data: 
-                positions[node] = (float(x), float(y))
-            
-            #--Parse Edges--#
-            edges_data = re.findall(r"\(([a-zA-Z0-9_]+),([a-zA-Z0-9_]+)\):\s*([\d.]+)", content)
-            for u, v, w in edges_data:
-                if u not in graph: graph[u] = []
-                graph[u].append((v, float(w)))
-            
-            #--Parse Origin and Destinations--#
-            origin_match = re.search(r"Origin:\s*([a-zA-Z0-9_]+)", content)
-            if origin_match: origin = origin_match.group(1)
-            
-            dest_match = re.search(r"Destinations:\s*([a-zA-Z0-9_;\s]+)", content)
-            if dest_match:
-                dest_str = dest_match.group(1).replace(';', ' ')
-                destinations = [d.strip() for d in dest_str.split() if d.strip()]
+        graph, origin, destinations = load_graph_cached(file_name)
+        positions = graph.positions()
 
         #--Validate Inputs--#
-        if not origin or not destinations:
+        if origin is None or not destinations:
             print("Error: Could not parse Origin or Destinations. Check file format.")
             return
 
@@ -105,29 +134,20 @@ def main():
         k_width = 2
         
         #--Execute Search--#
-        path, explored_count, total_cost = beam_search(graph, positions, origin, goal_node, k=k_width)
-
-        #--Advanced Metrics Calculation--#
-        success_rate = 100.0 if path else 0.0
-        exp_ratio = (explored_count / len(positions)) * 100 if len(positions) > 0 else 0
+        metrics = SearchMetrics()
+        path, explored_count, total_cost = beam_search(graph, origin, goal_node, k=k_width, metrics=metrics)
 
-        print(f"--- PERFORMANCE SHOWCASE (k={k_width}) ---")
+        print(metrics.table(f"BEAM (k={k_width})"))
         if path:
-            print(f"1. Status:            SUCCESS - Destination Reached")
-            print(f"2. Success Rate:      {success_rate}%")
-            print(f"3. Nodes Explored:    {explored_count} nodes")
-            print(f"4. Exploration Ratio: {exp_ratio:.2f}%")
-            print(f"5. Total Path Cost:   {total_cost:.2f}")
-            print(f"6. Final Path:        {' -> '.join(path)}")
+            print(f"Status:     SUCCESS - Destination Reached")
+            print(f"Final Path: {' -> '.join(map(str, path))}")
             
             #--Visualize the Result--#
             draw_graph(positions, graph, path, goal_node, f"Route from {origin} to {goal_node}")
         else:
             #--Advanced Diagnostics--#
-            print(f"1. Status:            FAILED - Goal Unreachable")
-            print(f"2. Success Rate:      {success_rate}%")
-            print(f"3. Diagnostics:       No path found for '{goal_node}' with k={k_width}.")
-            print(f"4. Progress:          Explored {explored_count} locations before failure.")
+            print(f"Status:      FAILED - Goal Unreachable")
+            print(f"Diagnostics: No path found for '{goal_node}' with k={k_width}.")
 
     except FileNotFoundError:
         print(f"Error: File '{file_name}' not found.")
@@ -1,133 +1,114 @@
-#Import crucial libraries
-import os
-import networkx as nx
-import matplotlib.pyplot as plt
-#--Data Parsing (File Reading)--#
-def load_data():
-    nodes_pos = {} 
-    edges = []
-    start_node = None
-    goal_nodes = []
-    
-    with open('PathFinder-test1.txt', 'r') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-
-    mode = ""
-    for i, line in enumerate(lines):
-        if "Nodes" in line: mode = "nodes"
-        elif "Edges" in line: mode = "edges"
-        elif "Origin:" in line: start_node = int(lines[i+1])
-        elif "Destinations:" in line:
-            goal_nodes = [int(x.strip()) for x in lines[i+1].split(';') if x.strip()]
-        else:
-            if mode == "nodes" and ":" in line:
-                node_id = int(line.split(':')[0])
-                coords = tuple(map(int, line.split('(')[1].split(')')[0].split(',')))
-                nodes_pos[node_id] = coords
-            elif mode == "edges" and ":" in line:
-                edge_part = line.split(':')[0][1:-1]
-                u, v = map(int, edge_part.split(','))
-                edges.append((u, v))
-                
-    return nodes_pos, edges, start_node, goal_nodes
-#--Depth-First Search (DFS) Implementation--#
-def dfs_algorithm(graph, start, goals):
-    frontier = [(start, [start])] # Stack storage (current node, paths have visited)
-    visited = set()               # Set for nodes to avoid loop back
-    
-    while frontier:
-        current_node, path = frontier.pop() # LIFO: pop from the end of the list (stack behavior)
-        
-        if current_node in goals:
-            return path # Return the path to the goal if found
-            
-        if current_node not in visited:
-            visited.add(current_node)
-            neighbors = list(graph.neighbors(current_node))
-            # Sort neighbors in reverse order to ensure consistent traversal order (optional)
-            for neighbor in sorted(neighbors, reverse=True):
-                if neighbor not in visited:
-                    frontier.append((neighbor, path + [neighbor]))
-    return None
-#--Displays the Graph--#
-nodes_pos, edges, start, goals = load_data()
-G = nx.Graph()
-G.add_edges_from(edges)
-
-result_path = dfs_algorithm(G, start, goals)
-
-fig, ax = plt.subplots(figsize=(8, 6))
-
-nx.draw(G, 
-        pos=nodes_pos, 
-        with_labels=True, 
-        node_color='skyblue',  
-        edge_color='black',    
-        width=1.5, 
-        node_size=800, 
-        font_weight='bold',
-        ax=ax)
-
-if result_path:
-    path_edges = list(zip(result_path, result_path[1:]))
-    
-    nx.draw_networkx_edges(G, 
-                           pos=nodes_pos, 
-                           edgelist=path_edges, 
-                           edge_color='red',
-                           width=4,          
-                           ax=ax)
-
-# Cấu hình Oxy
-ax.set_axis_on() 
-ax.tick_params(left=True, bottom=True, labelleft=True, labelbottom=True)
-plt.grid(True, linestyle='--', alpha=0.5)
-plt.title("DFS Final Path Showcase")
-plt.xlabel("X Coordinate")
-plt.ylabel("Y Coordinate")
-
-plt.show()
-#--DFS Metrics Calculation--#
-def dfs_with_metrics(graph, start, goals):
-    frontier = [(start, [start])]
-    visited = set()
-    total_nodes_in_graph = len(graph.nodes)
-    
-    while frontier:
-        current_node, path = frontier.pop()
-        
-        if current_node in goals:
-            # --- METRICS CALCULATION ---
-            path_length = len(path)
-            nodes_explored = len(visited) + 1
-            success_rate = 100.0 
-            
-            # Search space exploration ratio: (nodes explored / total nodes in graph) * 100
-            exploration_ratio = (nodes_explored / total_nodes_in_graph) * 100
-            
-            return {
-                "path": path,
-                "path_length": path_length,
-                "nodes_explored": nodes_explored,
-                "success_rate": success_rate,
-                "exploration_ratio": f"{exploration_ratio:.2f}%"
-            }
-            
-        if current_node not in visited:
-            visited.add(current_node)
-            neighbors = list(graph.neighbors(current_node))
-            for neighbor in sorted(neighbors, reverse=True):
-                if neighbor not in visited:
-                    frontier.append((neighbor, path + [neighbor]))
-    return None
-
-# --Table of Metrics Display--
-metrics = dfs_with_metrics(G, start, goals)
-
-if metrics:
-    print("--- DFS PERFORMANCE SHOWCASE ---")
-    print(f"1. Success Rate: {metrics['success_rate']}%")
-    print(f"2. Nodes Explored: {metrics['nodes_explored']} nodes")
-    print(f"3. Path Found Length: {metrics['path_length']} nodes")
-    print(f"4. Exploration Ratio: {metrics['exploration_ratio']}")
-    print(f"5. Path Optimality: Non-Optimal (DFS finds the first path, not the shortest)")
\ No newline at end of file
+#Import crucial libraries
+if __package__:
+    from .Graph import new_parents, trace_path, NO_PARENT
+    from .GraphCache import load_graph_cached
+    from .SpatialIndex import snap, snap_all
+    from .Metrics import SearchMetrics
+else:
+    from Graph import new_parents, trace_path, NO_PARENT
+    from GraphCache import load_graph_cached
+    from SpatialIndex import snap, snap_all
+    from Metrics import SearchMetrics
+#--Depth-First Search (DFS) Implementation--#
+def dfs_algorithm(graph, start, goals, metrics=None):
+    if metrics is not None: metrics.begin("DFS", graph)
+    start, goals = snap(graph, start), snap_all(graph, goals)
+    if start not in graph:
+        if metrics is not None: metrics.finish(None, 0, 0, 0)
+        return None
+    goal_ids = {graph.index[g] for g in goals if g in graph}
+    start = graph.index[start]
+    frontier = [(start, start)]     # Stack storage (current node, node it was pushed from)
+    parent = new_parents(graph.num_nodes) # Set once a node is expanded; doubles as the visited flag
+    expanded = generated = 0
+    if metrics is not None: metrics.phase("setup")
+    
+    while frontier:
+        current_node, came_from = frontier.pop() # LIFO: pop from the end of the list (stack behavior)
+        
+        if current_node in goal_ids:
+            parent[current_node] = came_from
+            if metrics is not None:
+                metrics.expand(current_node, None, len(frontier) + 1)
+                metrics.phase("search")
+            path = graph.path_labels(trace_path(parent, current_node)) # Rebuild the path only once, at the goal
+            if metrics is not None: metrics.finish(path, graph.path_cost(path), expanded + 1, generated)
+            return path
+            
+        if parent[current_node] == NO_PARENT:
+            parent[current_node] = came_from
+            expanded += 1
+            if metrics is not None: metrics.expand(current_node, None, len(frontier) + 1)
+            # Sort neighbors in reverse order to ensure consistent traversal order (optional)
+            for neighbor in sorted(set(graph.neighbors(current_node)), reverse=True):
+                if parent[neighbor] == NO_PARENT:
+                    frontier.append((neighbor, current_node))
+                    generated += 1
+    if metrics is not None: metrics.finish(None, 0, expanded, generated)
+    return None
+#--DFS Metrics Calculation--#
+def dfs_with_metrics(graph, start, goals):
+    # The older dict report, now read off a SearchMetrics (expansions include the goal)
+    metrics = SearchMetrics("DFS")
+    path = dfs_algorithm(graph, start, goals, metrics=metrics)
+    if path is None: return None
+    return {
+        "path": path,
+        "path_length": len(path),
+        "nodes_explored": metrics.expansions,
+        "success_rate": 100.0,
+        "exploration_ratio": f"{100 * metrics.exploration_ratio:.2f}%",
+    }
+
+#--Displays the Graph--#
+def main():
+    # Plotting libraries are only imported when something is drawn
+    import networkx as nx
+    import matplotlib.pyplot as plt
+    graph, start, goals = load_graph_cached('PathFinder-test1.txt', undirected=True)
+    nodes_pos = graph.positions()
+    G = nx.Graph()
+    G.add_edges_from((u, v) for u, v, _ in graph.edges())
+
+    result_path = dfs_algorithm(graph, start, goals)
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    nx.draw(G, 
+            pos=nodes_pos, 
+            with_labels=True, 
+            node_color='skyblue',  
+            edge_color='black',    
+            width=1.5, 
+            node_size=800, 
+            font_weight='bold',
+            ax=ax)
+
+    if result_path:
+        path_edges = list(zip(result_path, result_path[1:]))
+
+        nx.draw_networkx_edges(G, 
+                               pos=nodes_pos, 
+                               edgelist=path_edges, 
+                               edge_color='red',
+                               width=4,          
+                               ax=ax)
+
+    # Cấu hình Oxy
+    ax.set_axis_on() 
+    ax.tick_params(left=True, bottom=True, labelleft=True, labelbottom=True)
+    plt.grid(True, linestyle='--', alpha=0.5)
+    plt.title("DFS Final Path Showcase")
+    plt.xlabel("X Coordinate")
+    plt.ylabel("Y Coordinate")
+
+    plt.show()
+
+    # --Table of Metrics Display--
+    metrics = SearchMetrics()
+    dfs_algorithm(graph, start, goals, metrics=metrics)
+    print(metrics.table("DFS"))
+    print("Path Optimality: Non-Optimal (DFS finds the first path, not the shortest)")
+
+if __name__ == "__main__":
+    main()
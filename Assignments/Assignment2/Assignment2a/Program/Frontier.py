@@ -0,0 +1,131 @@
+#--Priority-queue frontiers for UCS and A*--#
+# Both classes share one interface over dense CSR node ids:
+#   push(node, key)  insert, or lower the key of a node already queued
+#   pop()            -> (key, node) with the smallest key (ties: smaller id)
+#   min_key()        smallest queued key without popping (INF when empty)
+#   len(frontier), node in frontier
+# and count pushes / pops / decreases / peak size for benchmarking.
+import heapq
+from array import array
+
+INF = float('inf')
+
+#--1. Indexed binary heap with true decrease-key--#
+class IndexedHeap:
+    # heap holds node ids; pos[node] is its slot in heap (-1 when not queued)
+    def __init__(self, n):
+        self.heap = []
+        self.pos = array('i', [-1]) * n
+        self.key = array('d', [INF]) * n
+        self.pushes = self.pops = self.decreases = self.peak = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, node):
+        return self.pos[node] != -1
+
+    def min_key(self):
+        return self.key[self.heap[0]] if self.heap else INF
+
+    def push(self, node, key):
+        i = self.pos[node]
+        if i == -1:
+            self.key[node] = key
+            self.heap.append(node)
+            self.pos[node] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+            self.pushes += 1
+            if len(self.heap) > self.peak: self.peak = len(self.heap)
+        elif key < self.key[node]:
+            self.key[node] = key
+            self._sift_up(i)
+            self.decreases += 1
+
+    def pop(self):
+        heap, pos = self.heap, self.pos
+        top = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            pos[last] = 0
+            self._sift_down(0)
+        pos[top] = -1
+        self.pops += 1
+        return self.key[top], top
+
+    def _sift_up(self, i):
+        heap, pos, key = self.heap, self.pos, self.key
+        node = heap[i]
+        k = key[node]
+        while i > 0:
+            p = (i - 1) >> 1
+            other = heap[p]
+            if key[other] < k or (key[other] == k and other < node): break
+            heap[i] = other; pos[other] = i
+            i = p
+        heap[i] = node; pos[node] = i
+
+    def _sift_down(self, i):
+        heap, pos, key = self.heap, self.pos, self.key
+        size = len(heap)
+        node = heap[i]
+        k = key[node]
+        while True:
+            c = 2 * i + 1
+            if c >= size: break
+            child = heap[c]
+            if c + 1 < size:
+                right = heap[c + 1]
+                if key[right] < key[child] or (key[right] == key[child] and right < child):
+                    c, child = c + 1, right
+            if k < key[child] or (k == key[child] and node < child): break
+            heap[i] = child; pos[child] = i
+            i = c
+        heap[i] = node; pos[node] = i
+
+#--2. Lazy-deletion heapq (the previous behaviour), kept for comparison--#
+class LazyHeap:
+    # Every improvement is a new heap entry; entries whose key no longer
+    # matches the node's live key are skipped on pop.
+    def __init__(self, n):
+        self.heap = []
+        self.live = array('d', [INF]) * n   # current key, INF when not queued
+        self.queued = 0
+        self.pushes = self.pops = self.decreases = self.peak = 0
+
+    def __len__(self):
+        return self.queued
+
+    def __contains__(self, node):
+        return self.live[node] < INF
+
+    def min_key(self):
+        heap, live = self.heap, self.live
+        while heap and heap[0][0] != live[heap[0][1]]:
+            heapq.heappop(heap)   # drop stale entries so the top is a live key
+        return heap[0][0] if heap else INF
+
+    def push(self, node, key):
+        live = self.live[node]
+        if live < INF:
+            if key >= live: return
+            self.decreases += 1
+        else:
+            self.queued += 1
+        self.live[node] = key
+        heapq.heappush(self.heap, (key, node))
+        self.pushes += 1
+        if len(self.heap) > self.peak: self.peak = len(self.heap)
+
+    def pop(self):
+        heap, live = self.heap, self.live
+        while True:
+            key, node = heapq.heappop(heap)
+            if key == live[node]: break
+        live[node] = INF
+        self.queued -= 1
+        self.pops += 1
+        return key, node
+
+FRONTIERS = {"indexed": IndexedHeap, "lazy": LazyHeap}
@@ -0,0 +1,73 @@
+#--Benchmark: indexed decrease-key heap vs lazy-deletion heapq--#
+# Runs UCS and A* with both frontiers on a random dense geometric graph and
+# prints heap sizes (pushes, decreases, peak) and wall time for each.
+#   python FrontierBenchmark.py --nodes 20000 --degree 16 --queries 20
+import math
+import time
+import random
+import argparse
+if __package__:
+    from .Graph import CSRGraph
+    from .Frontier import FRONTIERS
+    from .UCS import ucs_algorithm
+    from .AStar import a_star_algorithm
+else:
+    from Graph import CSRGraph
+    from Frontier import FRONTIERS
+    from UCS import ucs_algorithm
+    from AStar import a_star_algorithm
+
+def random_dense_graph(n, degree, seed):
+    # Weights are at least the Euclidean distance, so the A* heuristic stays admissible
+    rng = random.Random(seed)
+    positions = {i: (rng.uniform(0, 1000), rng.uniform(0, 1000)) for i in range(n)}
+    edges = []
+    for u in range(n):
+        for v in rng.sample(range(n), degree):
+            if u == v: continue
+            (x1, y1), (x2, y2) = positions[u], positions[v]
+            edges.append((u, v, math.hypot(x1 - x2, y1 - y2) * rng.uniform(1.0, 1.5)))
+    return CSRGraph.from_edges(positions, edges, undirected=True)
+
+def run(search, graph, queries, frontier_type):
+    created = []
+    def factory(n):
+        created.append(frontier_type(n))
+        return created[-1]
+
+    t0 = time.perf_counter()
+    for start, goal in queries:
+        search(graph, start, goal, factory)
+    elapsed = time.perf_counter() - t0
+    return {
+        "pushes": sum(f.pushes for f in created),
+        "decreases": sum(f.decreases for f in created),
+        "peak": max(f.peak for f in created),
+        "time": elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Indexed vs lazy heap frontier benchmark")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--degree", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=30019)
+    args = parser.parse_args()
+
+    graph = random_dense_graph(args.nodes, args.degree, args.seed)
+    rng = random.Random(args.seed + 1)
+    queries = [(rng.randrange(args.nodes), rng.randrange(args.nodes)) for _ in range(args.queries)]
+    searches = {
+        "UCS": lambda g, s, t, f: ucs_algorithm(g, s, [t], f),
+        "A*": a_star_algorithm,
+    }
+
+    print(f"{args.nodes} nodes, {graph.num_edges} arcs, {args.queries} queries")
+    print(f"{'Search':<6} {'Frontier':<8} {'Pushes':>10} {'Decreases':>10} {'Peak':>8} {'Time (s)':>9}")
+    for name, search in searches.items():
+        for kind, frontier_type in FRONTIERS.items():
+            r = run(search, graph, queries, frontier_type)
+            print(f"{name:<6} {kind:<8} {r['pushes']:>10} {r['decreases']:>10} {r['peak']:>8} {r['time']:>9.3f}")
+
+if __name__ == "__main__":
+    main()
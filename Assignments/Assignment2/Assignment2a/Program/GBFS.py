@@ -1,93 +1,103 @@
 #--Step 1L Import Python libraries--#
-import os
-import math
+import sys
 import heapq
-import networkx as nx 
-import matplotlib.pyplot as plt
-#--Step 2: Data Parsinf (Read Data from File)--#
-def read_data(filename):
-    graph, positions, origin, destinations = {}, {}, None, []
-    if not os.path.exists(filename): return graph, positions, origin, destinations
-    with open(filename, 'r') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-    mode = ""
-    for line in lines:
-        if "Nodes" in line: mode = "nodes"; continue
-        if "Edges" in line: mode = "edges"; continue
-        if "Origin" in line: mode = "origin"; continue
-        if "Destinations" in line: mode = "dest"; continue
-        try:
-            if mode == "nodes" and ":" in line:
-                node, coord = line.split(":")
-                positions[int(node)] = tuple(map(int, coord.strip()[1:-1].split(',')))
-            elif mode == "edges" and ":" in line:
-                u, v = map(int, line.split(":")[0].strip()[1:-1].split(','))
-                graph.setdefault(u, []).append(v)
-                graph.setdefault(v, []).append(u)
-            elif mode == "origin": origin = int(line)
-            elif mode == "dest": destinations = [int(x.strip()) for x in line.replace(';', ' ').split()]
-        except: continue
-    return graph, positions, origin, destinations
-#--Step 3: Heuristic Function (Euclidean Distance)--#
-def heuristic(node_coords, goal_coords):
-    return math.sqrt((node_coords[0] - goal_coords[0])**2 + (node_coords[1] - goal_coords[1])**2)
+if __package__:
+    from .Graph import new_parents, trace_path, NO_PARENT
+    from .GraphCache import load_graph_cached
+    from .SpatialIndex import snap, snap_goals
+    from .Metrics import SearchMetrics
+    from .Render import render_paths
+else:
+    from Graph import new_parents, trace_path, NO_PARENT
+    from GraphCache import load_graph_cached
+    from SpatialIndex import snap, snap_goals
+    from Metrics import SearchMetrics
+    from Render import render_paths
+#--Step 3: Heuristic Function (Euclidean Distance by default), see Heuristics.py--#
+if __package__: from .Heuristics import goal_table
+else: from Heuristics import goal_table
 #--3. GBFS Algorithm--#
-def gbfs_algorithm(graph, positions, start, goal):
-    if start not in graph or goal not in positions: return None, 0
+def gbfs_algorithm(graph, start, goal, metric="euclidean", metrics=None):
+    # goal: a label or (x, y), or a list/set of them (h = distance to the closest one)
+    if metrics is not None: metrics.begin("GBFS", graph)
+    start, goals = snap(graph, start), snap_goals(graph, goal)
+    if start not in graph or not goals:
+        if metrics is not None: metrics.finish(None, 0, 0, 0)
+        return None, 0
+    offsets, targets = graph.offsets, graph.targets
+    start = graph.index[start]
+    h = goal_table(graph, goals, metric)   # computed once, read by node id
+    is_goal = bytearray(graph.num_nodes)
+    for node in goals: is_goal[node] = 1
     
-    # Priority Queue stores: (h(n), current_node, path)
+    # Priority Queue stores: (h(n), current_node, predecessor)
     # GBFS only cares about h(n) - the distance to the destination
-    start_h = heuristic(positions[start], positions[goal])
-    frontier = [(start_h, start, [start])]
-    visited = set()
-    nodes_explored = 0
+    frontier = [(h[start], start, start)]
+    parent = new_parents(graph.num_nodes)   # set on expansion, doubles as visited
+    nodes_explored = generated = popped = 0
+    if metrics is not None: metrics.phase("setup")
 
     while frontier:
-        h_val, current, path = heapq.heappop(frontier)
+        h_val, current, came_from = heapq.heappop(frontier)
+        popped += 1
         
-        if current in visited: continue
-        visited.add(current)
+        if parent[current] != NO_PARENT: continue
+        parent[current] = came_from
         nodes_explored += 1
+        if metrics is not None: metrics.expand(current, h_val, len(frontier) + 1)
 
-        if current == goal:
+        if is_goal[current]:
+            if metrics is not None: metrics.phase("search")
+            path = graph.path_labels(trace_path(parent, current))
+            if metrics is not None:
+                metrics.finish(path, graph.path_cost(path), nodes_explored, generated,
+                               heap_pushes=generated + 1, heap_pops=popped)
             return path, nodes_explored
 
-        for neighbor in graph.get(current, []):
-            if neighbor not in visited:
-                h_neighbor = heuristic(positions[neighbor], positions[goal])
-                heapq.heappush(frontier, (h_neighbor, neighbor, path + [neighbor]))
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            if parent[neighbor] == NO_PARENT:
+                heapq.heappush(frontier, (h[neighbor], neighbor, current))
+                generated += 1
                 
+    if metrics is not None:
+        metrics.finish(None, 0, nodes_explored, generated, heap_pushes=generated + 1, heap_pops=popped)
     return None, nodes_explored
 #--4. Main Execution--#
-def main():
+def main(output=None):
+    # output: write every destination's path to one PNG/SVG (headless) instead of plt.show()
     filename = 'PathFinder-test1.txt'
-    graph, positions, origin, destinations = read_data(filename)
+    try:
+        graph, origin, destinations = load_graph_cached(filename, undirected=True)
+    except FileNotFoundError:
+        print("Data Error!"); return
+    positions = graph.positions()
     
     if not graph: print("Data Error!"); return
 
+    if output is None:
+        # Plotting libraries are only imported when something is drawn
+        import networkx as nx
+        import matplotlib.pyplot as plt
+        G = nx.Graph()
+        for u, v, _ in graph.edges(): G.add_edge(u, v)
+
+    # One search over the whole Destinations list stops at the nearest destination
+    metrics = SearchMetrics()
+    path, explored = gbfs_algorithm(graph, origin, destinations, metrics=metrics)
+    print("\n" + metrics.table("GBFS (any destination)"))
+    if path: print(f"Nearest destination: {path[-1]} ({' -> '.join(map(str, path))}, Cost: {metrics.cost})")
+
+    paths = {}
     for dest in destinations:
-        path, explored = gbfs_algorithm(graph, positions, origin, dest)
-        total_nodes = len(positions)
-        exploration_ratio = (explored / total_nodes) * 100 if total_nodes > 0 else 0
-        success_rate = 100.0 if os.path else 0.0
-        
-        print("\n" + "="*50)
-        print(f"{'--- GBFS PERFORMANCE SHOWCASE ---':^50}")
-        print("="*50)
-        print(f"{'1. Success Rate:':<25} {'100%' if path else '0%'}")
-        print(f"{'2. Nodes Explored:':<25} {explored} nodes")
-        print(f"{'3. Path Length:':<25} {len(path) if path else 0} nodes")
-        print(f"{'4. Exploration Ratio:':<25} {exploration_ratio:.2f}%")
-        print(f"{'5. Heuristic Used:':<25} Euclidean Distance")
-        print(f"{'6. Strategy:':<25} Greedy (Best-First)")
-        print("="*50)
+        metrics = SearchMetrics()
+        path, explored = gbfs_algorithm(graph, origin, dest, metrics=metrics)
+        paths[f"{origin} -> {dest}"] = path
+        print("\n" + metrics.table("GBFS"))
 
         # Draw the graph and the path
-        if path:
+        if path and output is None:
             plt.figure(figsize=(8, 6))
-            G = nx.Graph()
-            for u, neighbors in graph.items():
-                for v in neighbors: G.add_edge(u, v)
             nx.draw(G, pos=positions, with_labels=True, node_color='lightgreen', 
                     edge_color='black', width=1.5, node_size=800)
             path_edges = list(zip(path, path[1:]))
@@ -97,5 +107,9 @@ def main():
             plt.grid(True, linestyle='--', alpha=0.5)
             plt.show()
 
+    if output is not None:
+        render_paths(graph, paths, output, title=f"GBFS Paths from {origin}", node_color='lightgreen')
+        print(f"\nSaved {output}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
@@ -0,0 +1,148 @@
+#--Compact CSR (Compressed Sparse Row) graph shared by every search--#
+# Nodes are dense ints 0..n-1. The out-arcs of node u live in
+# targets[offsets[u]:offsets[u+1]], with matching costs in weights.
+# File labels (1, 'S1', 'HCM', ...) are only used at the boundaries.
+from array import array
+
+NO_COORD = float('nan')
+NO_PARENT = -1
+
+#--Parent-pointer paths--#
+def new_parents(n):
+    # int32 parent per node, NO_PARENT until the node is reached
+    return array('i', [NO_PARENT]) * n
+
+def trace_path(parent, goal):
+    # Walk parent pointers back from goal; the start node is its own parent
+    path = [goal]
+    while parent[goal] != goal:
+        goal = parent[goal]
+        path.append(goal)
+    path.reverse()
+    return path
+
+class CSRGraph:
+    __slots__ = ("labels", "index", "xs", "ys", "offsets", "targets", "weights", "_reverse", "version", "__weakref__")
+
+    def __init__(self, labels, xs, ys, offsets, targets, weights):
+        self.labels = labels                                 # id -> label
+        self.index = {label: i for i, label in enumerate(labels)}  # label -> id
+        self.xs, self.ys = xs, ys                            # float64 coordinates
+        self.offsets = offsets                               # int32, len n+1
+        self.targets = targets                               # int32, len m
+        self.weights = weights                               # float64, len m
+        self._reverse = None                                 # transpose, built on demand
+        self.version = 0                                     # bumped by in-place edits (LPAStar.update_edges)
+
+    #--Sizes and lookups--#
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, label):
+        return label in self.index
+
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def node_id(self, label):
+        return self.index[label]
+
+    def label_of(self, u):
+        return self.labels[u]
+
+    def path_labels(self, path):
+        labels = self.labels
+        return [labels[u] for u in path]
+
+    def path_cost(self, path):
+        # Cost of a label path, using the cheapest arc between consecutive nodes
+        index, offsets, targets, weights = self.index, self.offsets, self.targets, self.weights
+        total = 0
+        for a, b in zip(path, path[1:]):
+            u, v = index[a], index[b]
+            total += min(weights[e] for e in range(offsets[u], offsets[u + 1]) if targets[e] == v)
+        return total
+
+    #--Adjacency--#
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def neighbors(self, u):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def arcs(self, u):
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi])
+
+    def edges(self):
+        # (u_label, v_label, weight) for every stored arc, used for drawing
+        labels, offsets, targets, weights = self.labels, self.offsets, self.targets, self.weights
+        for u in range(len(labels)):
+            for e in range(offsets[u], offsets[u + 1]):
+                yield labels[u], labels[targets[e]], weights[e]
+
+    def reverse(self):
+        # Transpose graph (every arc u->v becomes v->u) for backward searches, built once
+        if self._reverse is None:
+            offsets = self.offsets
+            src = array('i', bytes(4 * len(self.targets)))
+            for u in range(len(self.labels)):
+                for e in range(offsets[u], offsets[u + 1]): src[e] = u
+            self._reverse = CSRGraph.from_arrays(self.labels, self.xs, self.ys, self.targets, src, self.weights)
+            self._reverse.index, self._reverse._reverse = self.index, self
+        return self._reverse
+
+    #--Coordinates--#
+    def position(self, u):
+        return (self.xs[u], self.ys[u])
+
+    def positions(self):
+        # label -> (x, y) dict in the shape networkx/matplotlib drawing expects
+        xs, ys = self.xs, self.ys
+        return {label: (xs[i], ys[i]) for i, label in enumerate(self.labels) if xs[i] == xs[i]}
+
+    #--Construction--#
+    @classmethod
+    def from_arrays(cls, labels, xs, ys, src, dst, w, undirected=False):
+        # Counting sort of arc lists into CSR. Stable, so each node keeps its
+        # neighbors in file order (reverse arcs are interleaved as they appear).
+        n = len(labels)
+        m = len(src) * (2 if undirected else 1)
+        offsets = array('i', bytes(4 * (n + 1)))
+        for u in src: offsets[u + 1] += 1
+        if undirected:
+            for v in dst: offsets[v + 1] += 1
+        for i in range(n): offsets[i + 1] += offsets[i]
+
+        cursor = array('i', offsets[:n])
+        targets = array('i', bytes(4 * m))
+        weights = array('d', bytes(8 * m))
+        for u, v, c in zip(src, dst, w):
+            e = cursor[u]; targets[e] = v; weights[e] = c; cursor[u] = e + 1
+            if undirected:
+                e = cursor[v]; targets[e] = u; weights[e] = c; cursor[v] = e + 1
+        return cls(labels, xs, ys, offsets, targets, weights)
+
+    @classmethod
+    def from_edges(cls, positions, edges, undirected=False):
+        # positions: {label: (x, y)}, edges: iterable of (u, v) or (u, v, w)
+        labels = list(positions)
+        index = {label: i for i, label in enumerate(labels)}
+        xs = array('d', (float(p[0]) for p in positions.values()))
+        ys = array('d', (float(p[1]) for p in positions.values()))
+        src, dst, w = array('i'), array('i'), array('d')
+
+        for edge in edges:
+            u, v = edge[0], edge[1]
+            for label in (u, v):
+                if label not in index:
+                    index[label] = len(labels); labels.append(label)
+                    xs.append(NO_COORD); ys.append(NO_COORD)
+            src.append(index[u]); dst.append(index[v])
+            w.append(float(edge[2]) if len(edge) > 2 else 1.0)
+        return cls.from_arrays(labels, xs, ys, src, dst, w, undirected)
@@ -0,0 +1,123 @@
+#--Memory-mapped binary cache for parsed PathFinder graphs--#
+# The first load of 'map.txt' parses the text and writes 'map.txt.d.csr'
+# (or '.u.csr' for the undirected build) next to it. Later loads mmap that
+# file and wrap the arrays in memoryviews, so nothing is copied and every
+# process reading the same map shares one page-cache copy.
+#
+# Layout (little-endian, every section 8-byte aligned):
+#   header | xs f64[n] | ys f64[n] | weights f64[m] | offsets i32[n+1]
+#   | targets i32[m] | origin i32 | destinations i32[k] | labels (JSON)
+import os
+import sys
+import mmap
+import json
+import struct
+import hashlib
+from array import array
+if __package__:
+    from .Graph import CSRGraph
+    from .Parser import load_graph
+else:
+    from Graph import CSRGraph
+    from Parser import load_graph
+
+MAGIC = b"PFCSR\x00\x00\x01"
+HEADER = struct.Struct("<8sIIqqqqqQ32s")   # magic, flags, pad, n, m, k, labels_len, mtime_ns, size, sha256
+FLAG_UNDIRECTED = 1
+
+def cache_path(filename, undirected=False):
+    return f"{filename}.{'u' if undirected else 'd'}.csr"
+
+def file_digest(filename):
+    h = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.digest()
+
+def _pad(size):
+    return (-size) % 8
+
+#--1. Encoding (shared by the cache file and BatchQuery's shared memory)--#
+def encode_graph(graph, origin, destinations, undirected=False, source_stat=None, source_digest=bytes(32)):
+    # Returns the list of byte chunks that make up the layout above
+    index = graph.index
+    labels_blob = json.dumps(graph.labels, separators=(",", ":")).encode("utf-8")
+    origin_id = array('i', [index.get(origin, -1) if origin is not None else -1])
+    dest_ids = array('i', [index[d] for d in destinations if d in index])
+    mtime_ns, size = (source_stat.st_mtime_ns, source_stat.st_size) if source_stat else (0, 0)
+    chunks = [HEADER.pack(MAGIC, FLAG_UNDIRECTED if undirected else 0, 0,
+                          graph.num_nodes, graph.num_edges, len(dest_ids), len(labels_blob),
+                          mtime_ns, size, source_digest)]
+    for section in (graph.xs, graph.ys, graph.weights, graph.offsets, graph.targets, origin_id, dest_ids):
+        data = memoryview(section).cast('B')
+        chunks.append(data)
+        chunks.append(b"\x00" * _pad(len(data)))
+    chunks.append(labels_blob)
+    return chunks
+
+def decode_graph(buf):
+    # buf: memoryview over an encoded graph. Arrays are views into buf, not copies.
+    _, flags, _, n, m, k, labels_len, _, _, _ = HEADER.unpack_from(buf, 0)
+    pos = HEADER.size
+
+    def take(fmt, count, itemsize):
+        nonlocal pos
+        view = buf[pos:pos + count * itemsize].cast(fmt)
+        pos += count * itemsize + _pad(count * itemsize)
+        return view
+
+    xs, ys, weights = take('d', n, 8), take('d', n, 8), take('d', m, 8)
+    offsets, targets = take('i', n + 1, 4), take('i', m, 4)
+    origin_id, dest_ids = take('i', 1, 4), take('i', k, 4)
+    labels = json.loads(bytes(buf[pos:pos + labels_len]).decode("utf-8"))
+
+    graph = CSRGraph(labels, xs, ys, offsets, targets, weights)
+    origin = labels[origin_id[0]] if origin_id[0] >= 0 else None
+    return graph, origin, [labels[i] for i in dest_ids]
+
+#--2. Cache file I/O--#
+def write_cache(path, graph, origin, destinations, source_stat, source_digest, undirected=False):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        for chunk in encode_graph(graph, origin, destinations, undirected, source_stat, source_digest):
+            f.write(chunk)
+    os.replace(tmp, path)   # atomic, so concurrent readers never see a half-written cache
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        raw = f.read(HEADER.size)
+    if len(raw) != HEADER.size: return None
+    fields = HEADER.unpack(raw)
+    return fields if fields[0] == MAGIC else None
+
+def read_cache(path):
+    # Returns (CSRGraph backed by the mmap, origin, destinations)
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return decode_graph(memoryview(mm))
+
+#--3. Cached loader--#
+def is_fresh(header, source_stat, filename, undirected):
+    _, flags, _, _, _, _, _, mtime_ns, size, digest = header
+    if bool(flags & FLAG_UNDIRECTED) != undirected or size != source_stat.st_size:
+        return False
+    # Unchanged mtime is trusted; a touched file is only re-parsed if its content changed
+    return mtime_ns == source_stat.st_mtime_ns or digest == file_digest(filename)
+
+def load_graph_cached(filename, undirected=False):
+    # Drop-in replacement for Parser.load_graph that reuses/refreshes the binary cache
+    source_stat = os.stat(filename)
+    path = cache_path(filename, undirected)
+    if sys.byteorder == "little" and os.path.exists(path):
+        header = read_header(path)
+        if header and is_fresh(header, source_stat, filename, undirected):
+            return read_cache(path)
+
+    graph, origin, destinations = load_graph(filename, undirected)
+    if sys.byteorder == "little":
+        try:
+            write_cache(path, graph, origin, destinations, source_stat, file_digest(filename), undirected)
+        except OSError:
+            pass   # read-only directory: still return the parsed graph
+    return graph, origin, destinations
@@ -0,0 +1,132 @@
+#--Synthetic PathFinder map generator (grid, geometric, scale-free, road)--#
+# Writes valid PathFinder-*.txt files from 1e3 up to 1e7 nodes. Nodes are
+# streamed to disk and only the coordinate arrays are kept in memory.
+# Edge weights are never below the Euclidean distance between their ends,
+# so the A*/IDA* heuristics stay admissible on every generated map.
+#   python GraphGenerator.py road 100000 PathFinder-road-1e5.txt --seed 7
+# The benchmark scripts' --generate KIND:N options go through ensure_generated().
+import os
+import sys
+import math
+import random
+import argparse
+from array import array
+
+#--1. Node layouts--#
+def grid_layout(n, spacing=10, jitter=0, rng=None):
+    side = math.ceil(math.sqrt(n))
+    xs, ys = array('i'), array('i')
+    for i in range(n):
+        r, c = divmod(i, side)
+        dx = rng.randint(-jitter, jitter) if jitter else 0
+        dy = rng.randint(-jitter, jitter) if jitter else 0
+        xs.append(c * spacing + dx); ys.append(r * spacing + dy)
+    return xs, ys, side
+
+def uniform_layout(n, size, rng):
+    xs = array('i', (rng.randrange(size) for _ in range(n)))
+    ys = array('i', (rng.randrange(size) for _ in range(n)))
+    return xs, ys
+
+def distance(xs, ys, u, v):
+    return math.hypot(xs[u] - xs[v], ys[u] - ys[v])
+
+#--2. Edge generators: yield (u, v, weight) with 0-based ids, each undirected pair once--#
+def grid_edges(n, xs, ys, side, rng):
+    for i in range(n):
+        r, c = divmod(i, side)
+        for j in ((i + 1) if c + 1 < side else n, i + side):
+            if j < n:
+                yield i, j, math.ceil(distance(xs, ys, i, j)) + rng.randint(0, 5)
+
+def geometric_edges(n, xs, ys, size, degree, rng):
+    # Connect every pair closer than r, with r chosen for the requested mean degree
+    radius = math.sqrt(degree * size * size / (math.pi * n))
+    cell = max(1, int(radius))
+    buckets = {}
+    for i in range(n):
+        buckets.setdefault((xs[i] // cell, ys[i] // cell), []).append(i)
+    for i in range(n):
+        cx, cy = xs[i] // cell, ys[i] // cell
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in buckets.get((cx + dx, cy + dy), ()):
+                    if j > i:
+                        d = distance(xs, ys, i, j)
+                        if d <= radius:
+                            yield i, j, math.ceil(d * rng.uniform(1.0, 1.3)) + 1
+
+def scale_free_edges(n, xs, ys, m, rng):
+    # Barabasi-Albert preferential attachment: each new node links to m existing
+    # nodes picked proportionally to degree (via the repeated-endpoints list)
+    endpoints = array('i')
+    for i in range(1, min(m + 1, n)):
+        yield i - 1, i, math.ceil(distance(xs, ys, i - 1, i)) + 1
+        endpoints.extend((i - 1, i))
+    for i in range(m + 1, n):
+        chosen = set()
+        while len(chosen) < m:
+            chosen.add(endpoints[rng.randrange(len(endpoints))])
+        for j in chosen:
+            yield j, i, math.ceil(distance(xs, ys, i, j)) + 1
+            endpoints.extend((i, j))
+
+def road_edges(n, xs, ys, side, rng, drop=0.2, highway_every=10):
+    # Jittered grid with missing streets; every highway_every-th row/column is a
+    # fast road (weight ~ distance), the rest are 1.2-2x slower local streets
+    for i in range(n):
+        r, c = divmod(i, side)
+        for j, highway in (((i + 1) if c + 1 < side else n, r % highway_every == 0),
+                           (i + side, c % highway_every == 0)):
+            if j >= n or (not highway and rng.random() < drop): continue
+            factor = 1.0 if highway else rng.uniform(1.2, 2.0)
+            yield i, j, math.ceil(distance(xs, ys, i, j) * factor) + 1
+
+KINDS = ("grid", "geometric", "scalefree", "road")
+
+#--3. Writer--#
+def generate(kind, n, filename, seed=30019, degree=6, destinations=2):
+    rng = random.Random(seed)
+    if kind in ("grid", "road"):
+        xs, ys, side = grid_layout(n, jitter=3 if kind == "road" else 0, rng=rng)
+        edges = grid_edges(n, xs, ys, side, rng) if kind == "grid" else road_edges(n, xs, ys, side, rng)
+    else:
+        size = int(math.sqrt(n) * 10)
+        xs, ys = uniform_layout(n, size, rng)
+        edges = (geometric_edges(n, xs, ys, size, degree, rng) if kind == "geometric"
+                 else scale_free_edges(n, xs, ys, max(1, degree // 2), rng))
+
+    with open(filename, 'w') as f:
+        f.write("Nodes:\n")
+        f.writelines(f"{i + 1}: ({xs[i]},{ys[i]})\n" for i in range(n))
+        f.write("Edges:\n")
+        f.writelines(f"({u + 1},{v + 1}): {w}\n" for u, v, w in edges)
+        origin = rng.randrange(n) + 1
+        goals = [rng.randrange(n) + 1 for _ in range(destinations)]
+        f.write(f"\nOrigin:\n{origin}\n\nDestinations:\n{'; '.join(map(str, goals))}\n")
+
+def ensure_generated(spec, workdir="bench_maps", seed=30019):
+    # 'KIND:N' (e.g. road:1e5) -> workdir/PathFinder-KIND-N.txt, written only if it is not there yet
+    kind, _, n = spec.partition(":")
+    if kind not in KINDS or not n:
+        raise ValueError(f"Bad map spec '{spec}', expected KIND:N with KIND in {KINDS}")
+    os.makedirs(workdir, exist_ok=True)
+    filename = os.path.join(workdir, f"PathFinder-{kind}-{n}.txt")
+    if not os.path.exists(filename):
+        print(f"generating {filename}", file=sys.stderr)
+        generate(kind, int(float(n)), filename, seed)
+    return filename
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate large synthetic PathFinder maps")
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("nodes", type=float, help="node count, e.g. 1000 or 1e6")
+    parser.add_argument("output")
+    parser.add_argument("--seed", type=int, default=30019)
+    parser.add_argument("--degree", type=int, default=6, help="mean degree for geometric / scalefree")
+    parser.add_argument("--destinations", type=int, default=2)
+    args = parser.parse_args()
+    generate(args.kind, int(args.nodes), args.output, args.seed, args.degree, args.destinations)
+
+if __name__ == "__main__":
+    main()
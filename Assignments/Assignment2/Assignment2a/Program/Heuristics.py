@@ -0,0 +1,183 @@
+#--Heuristic tables: h(n) for every node, computed once per (graph, goal, metric)--#
+# Searches read h by node id (h[neighbor]) instead of calling sqrt per push.
+# NumPy vectorises the table when it is installed; otherwise a plain loop over
+# the coordinate arrays gives the same values.
+# goal_table() is the multi-goal version: h(n) = min over a goal set, the
+# admissible estimate for "reach whichever goal is nearest".
+# Built tables sit in a small LRU (TableCache) that holds its graphs weakly.
+import math
+import weakref
+from array import array
+from collections import OrderedDict
+from functools import lru_cache, update_wrapper
+
+@lru_cache(maxsize=None)
+def numpy_or_none():
+    # Imported on first use, not at import time, so loading this module stays cheap
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+EARTH_RADIUS_KM = 6371.0
+OCTILE_DIAGONAL = math.sqrt(2) - 1
+BLOCK = 1 << 22       # NumPy: distances computed at once (goals per block = BLOCK // n)
+SPATIAL_GOALS = 16    # without NumPy, larger Euclidean goal sets use a KD-tree over the goals
+TABLE_CACHE_ENTRIES = 8          # tables kept per builder
+TABLE_CACHE_BYTES = 128 << 20    # ... and at most this many bytes of them (the newest is always kept)
+
+#--1. Scalar metrics (x = latitude, y = longitude for haversine, as in test8/test9)--#
+def euclidean(dx, dy):
+    return math.sqrt(dx**2 + dy**2)
+
+def manhattan(dx, dy):
+    return abs(dx) + abs(dy)
+
+def octile(dx, dy):
+    dx, dy = abs(dx), abs(dy)
+    return max(dx, dy) + OCTILE_DIAGONAL * min(dx, dy)
+
+def haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2)**2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+METRICS = {"euclidean": euclidean, "manhattan": manhattan, "octile": octile, "haversine": haversine}
+
+#--2. Table cache--#
+def table_nbytes(table):
+    return len(table) * table.itemsize
+
+class TableCache:
+    # LRU of one builder's tables, keyed on (owner, args) with the owner (a graph or a
+    # landmark set) held by weak reference: a cached table never keeps its map alive,
+    # and the map's tables are dropped as soon as it is collected.
+    # size(table) -> bytes; the default fits array tables.
+    def __init__(self, build, max_entries=TABLE_CACHE_ENTRIES, max_bytes=TABLE_CACHE_BYTES, size=table_nbytes):
+        self.build, self.max_entries, self.max_bytes, self.size = build, max_entries, max_bytes, size
+        self.tables = OrderedDict()   # (id(owner), args) -> table, most recent last
+        self.owners = {}              # id(owner) -> its keys in tables
+        self.nbytes = 0
+        update_wrapper(self, build)
+
+    def __call__(self, owner, *args):
+        key = (id(owner), args)
+        table = self.tables.get(key)
+        if table is not None:
+            self.tables.move_to_end(key)
+            return table
+        table = self.build(owner, *args)
+        if id(owner) not in self.owners:
+            self.owners[id(owner)] = set()
+            weakref.finalize(owner, self._forget, id(owner)).atexit = False
+        self.owners[id(owner)].add(key)
+        self.tables[key] = table
+        self.nbytes += self.size(table)
+        while len(self.tables) > 1 and (len(self.tables) > self.max_entries or self.nbytes > self.max_bytes):
+            old_key, old = self.tables.popitem(last=False)
+            self.owners[old_key[0]].discard(old_key)
+            self.nbytes -= self.size(old)
+        return table
+
+    def _forget(self, owner_id):
+        # The owner was collected: its id may be reused, so its tables must go now
+        for key in self.owners.pop(owner_id, ()):
+            table = self.tables.pop(key, None)
+            if table is not None: self.nbytes -= self.size(table)
+
+    def cache_clear(self):
+        self.tables.clear()
+        for keys in self.owners.values(): keys.clear()
+        self.nbytes = 0
+
+#--3. Table builders--#
+def _distances_numpy(np, xs, ys, goal, metric):
+    # goal: one id, or an (k, 1) id array for a (k, n) block of distances
+    xs = np.frombuffer(xs, dtype=np.float64)
+    ys = np.frombuffer(ys, dtype=np.float64)
+    if metric == "haversine":
+        lat, lon = np.radians(xs), np.radians(ys)
+        lat_g, lon_g = lat[goal], lon[goal]
+        a = np.sin((lat_g - lat) / 2)**2 + np.cos(lat) * np.cos(lat_g) * np.sin((lon_g - lon) / 2)**2
+        h = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+    else:
+        dx, dy = np.abs(xs - xs[goal]), np.abs(ys - ys[goal])
+        if metric == "euclidean": h = np.sqrt(dx * dx + dy * dy)
+        elif metric == "manhattan": h = dx + dy
+        else: h = np.maximum(dx, dy) + OCTILE_DIAGONAL * np.minimum(dx, dy)
+    return np.nan_to_num(h, nan=0.0)   # nodes without coordinates get h = 0 (still admissible)
+
+def _to_table(np, h):
+    table = array('d')
+    table.frombytes(h.astype(np.float64).tobytes())
+    return table
+
+def _table_python(xs, ys, goal, metric):
+    gx, gy = xs[goal], ys[goal]
+    if metric == "haversine":
+        values = (haversine(x, y, gx, gy) for x, y in zip(xs, ys))
+    else:
+        fn = METRICS[metric]
+        values = (fn(x - gx, y - gy) for x, y in zip(xs, ys))
+    return array('d', (0.0 if v != v else v for v in values))
+
+@TableCache
+def heuristic_table(graph, goal, metric="euclidean"):
+    # graph: CSRGraph (cached by identity, weakly), goal: CSR id. Returns array('d') of length n.
+    if metric not in METRICS:
+        raise ValueError(f"Unknown heuristic metric '{metric}', expected one of {sorted(METRICS)}")
+    np = numpy_or_none()
+    if np is not None:
+        return _to_table(np, _distances_numpy(np, graph.xs, graph.ys, goal, metric))
+    return _table_python(graph.xs, graph.ys, goal, metric)
+
+def _goal_table_numpy(np, xs, ys, goals, metric):
+    goals = np.asarray(goals, dtype=np.intp).reshape(-1, 1)
+    block = max(1, BLOCK // max(1, len(xs)))
+    h = None
+    for i in range(0, len(goals), block):
+        part = _distances_numpy(np, xs, ys, goals[i:i + block], metric).min(axis=0)
+        h = part if h is None else np.minimum(h, part)
+    return _to_table(np, h)
+
+def _goal_table_spatial(xs, ys, goals):
+    # Euclidean distance to the nearest goal, one KD-tree query per node
+    if __package__: from .SpatialIndex import KDTree   # SpatialIndex imports this module
+    else: from SpatialIndex import KDTree
+    if any(xs[g] != xs[g] or ys[g] != ys[g] for g in goals):
+        return array('d', [0.0]) * len(xs)   # a goal without coordinates: h = 0, like the other builders
+    tree = KDTree(array('d', (xs[g] for g in goals)), array('d', (ys[g] for g in goals)))
+    return array('d', (0.0 if x != x or y != y else tree.nearest(x, y)[1] for x, y in zip(xs, ys)))
+
+def _goal_table_python(xs, ys, goals, metric):
+    table = _table_python(xs, ys, goals[0], metric)
+    for goal in goals[1:]:
+        for i, v in enumerate(_table_python(xs, ys, goal, metric)):
+            if v < table[i]: table[i] = v
+    return table
+
+@TableCache
+def goal_table(graph, goals, metric="euclidean"):
+    # goals: tuple of CSR ids. h(n) = min over goals of the metric, array('d') of length n.
+    if len(goals) == 1: return heuristic_table(graph, goals[0], metric)
+    if metric not in METRICS:
+        raise ValueError(f"Unknown heuristic metric '{metric}', expected one of {sorted(METRICS)}")
+    np = numpy_or_none()
+    if np is not None:
+        return _goal_table_numpy(np, graph.xs, graph.ys, goals, metric)
+    if metric == "euclidean" and len(goals) > SPATIAL_GOALS:
+        return _goal_table_spatial(graph.xs, graph.ys, goals)
+    return _goal_table_python(graph.xs, graph.ys, goals, metric)
+
+def min_table(tables):
+    # Element-wise min of several h tables (e.g. ALT tables for a goal set)
+    if len(tables) == 1: return tables[0]
+    np = numpy_or_none()
+    if np is not None:
+        return _to_table(np, np.minimum.reduce([np.frombuffer(t, dtype=np.float64) for t in tables]))
+    return array('d', map(min, *tables))
+
+def clear_heuristic_cache():
+    heuristic_table.cache_clear()
+    goal_table.cache_clear()
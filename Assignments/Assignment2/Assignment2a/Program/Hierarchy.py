@@ -0,0 +1,302 @@
+#--Contraction Hierarchies: preprocessing + bidirectional upward query--#
+# Nodes are contracted one by one (cheapest first by edge difference). When v
+# is removed, a shortcut u->x with cost w(u,v) + w(v,x) is added unless a
+# local witness search finds a path u->x that avoids v and is no longer.
+# Every node then only keeps its arcs to higher-ranked nodes; a query runs
+# Dijkstra upward from the start and (on reversed arcs) from the goals and
+# meets at the top, settling a few hundred nodes even on large maps.
+# The hierarchy is written next to the map as 'map.txt.u.ch' (or '.d.ch')
+# and memory-mapped on later loads, like GraphCache.
+#   python Hierarchy.py PathFinder-road-1e5.txt
+#   hierarchy = load_hierarchy_cached("map.txt", graph, undirected=True)
+#   path, cost, explored = ch_algorithm(graph, start, [goal], hierarchy)
+#
+# Layout (little-endian, 8-byte aligned sections): header | rank i32[n]
+#   | up offsets i32[n+1] | up targets i32[a] | up weights f64[a] | up mids i32[a]
+#   | down offsets i32[n+1] | down targets i32[b] | down weights f64[b] | down mids i32[b]
+# up: arcs v->x with rank[x] > rank[v]. down: arcs u->v with rank[u] > rank[v],
+# stored at v with target u. mid is the contracted middle node of a shortcut, -1 for map arcs.
+import os
+import sys
+import mmap
+import time
+import heapq
+import struct
+import argparse
+from array import array
+if __package__:
+    from .Frontier import INF
+    from .GraphCache import load_graph_cached, file_digest
+    from .SpatialIndex import snap, snap_all
+else:
+    from Frontier import INF
+    from GraphCache import load_graph_cached, file_digest
+    from SpatialIndex import snap, snap_all
+
+MAGIC = b"PFCH\x00\x00\x00\x01"
+HEADER = struct.Struct("<8sIIqqqqqQ32s")   # magic, flags, pad, n, m, up arcs, down arcs, mtime_ns, size, sha256
+FLAG_UNDIRECTED = 1
+NO_MID = -1
+WITNESS_LIMIT = 500     # nodes a witness search may settle when contracting
+ESTIMATE_LIMIT = 40     # ... and when only estimating a node's priority
+
+#--1. Contraction--#
+def _witness_distances(out_adj, source, skip, max_cost, limit):
+    # Local Dijkstra from source that ignores skip, stops past max_cost or after limit settles
+    dist = {source: 0.0}
+    frontier = [(0.0, source)]
+    settled = 0
+    while frontier:
+        d, u = heapq.heappop(frontier)
+        if d > dist[u]: continue
+        if d > max_cost or settled >= limit: break
+        settled += 1
+        for x, (w, _) in out_adj[u].items():
+            if x == skip: continue
+            nd = d + w
+            if nd < dist.get(x, INF):
+                dist[x] = nd
+                heapq.heappush(frontier, (nd, x))
+    return dist
+
+def _shortcuts(out_adj, in_adj, v, limit):
+    # Shortcuts needed if v were contracted now: [(u, x, cost)]
+    outs = out_adj[v]
+    if not outs: return []
+    needed = []
+    for u, (w1, _) in in_adj[v].items():
+        max_out = max((w2 for x, (w2, _) in outs.items() if x != u), default=None)
+        if max_out is None: continue
+        dist = _witness_distances(out_adj, u, v, w1 + max_out, limit)
+        for x, (w2, _) in outs.items():
+            if x != u and dist.get(x, INF) > w1 + w2:
+                needed.append((u, x, w1 + w2))
+    return needed
+
+def _priority(out_adj, in_adj, deleted, v):
+    # Edge difference plus contracted neighbours: keeps the hierarchy sparse and evenly spread
+    added = len(_shortcuts(out_adj, in_adj, v, ESTIMATE_LIMIT))
+    return added - len(out_adj[v]) - len(in_adj[v]) + deleted[v]
+
+def contract_graph(graph, witness_limit=WITNESS_LIMIT):
+    # Returns a Hierarchy (arrays in memory) and the number of shortcuts added
+    n = graph.num_nodes
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    out_adj = [{} for _ in range(n)]   # live (uncontracted) arcs: target -> (weight, mid)
+    in_adj = [{} for _ in range(n)]
+    for u in range(n):
+        for e in range(offsets[u], offsets[u + 1]):
+            x, w = targets[e], weights[e]
+            if x != u and w < out_adj[u].get(x, (INF,))[0]:
+                out_adj[u][x] = in_adj[x][u] = (w, NO_MID)
+
+    deleted = array('i', [0]) * n
+    queue = [(_priority(out_adj, in_adj, deleted, v), v) for v in range(n)]
+    heapq.heapify(queue)
+    rank = array('i', [0]) * n
+    up, down = [None] * n, [None] * n
+    shortcuts = 0
+    for level in range(n):
+        # Lazy updates: re-evaluate the cheapest node and only contract it if it is still cheapest
+        while True:
+            _, v = heapq.heappop(queue)
+            priority = _priority(out_adj, in_adj, deleted, v)
+            if not queue or priority <= queue[0][0]: break
+            heapq.heappush(queue, (priority, v))
+
+        rank[v] = level
+        up[v], down[v] = out_adj[v], in_adj[v]   # only uncontracted (= higher) neighbours are left
+        needed = _shortcuts(out_adj, in_adj, v, witness_limit)
+        for x in out_adj[v]:
+            del in_adj[x][v]; deleted[x] += 1
+        for u in in_adj[v]:
+            del out_adj[u][v]; deleted[u] += 1
+        out_adj[v] = in_adj[v] = None
+        for u, x, cost in needed:
+            if cost < out_adj[u].get(x, (INF,))[0]:
+                out_adj[u][x] = in_adj[x][u] = (cost, v)
+                shortcuts += 1
+    return Hierarchy(rank, *_to_csr(up), *_to_csr(down)), shortcuts
+
+def _to_csr(adjacency):
+    offsets, targets, weights, mids = array('i', [0]), array('i'), array('d'), array('i')
+    for arcs in adjacency:
+        for x, (w, mid) in arcs.items():
+            targets.append(x); weights.append(w); mids.append(mid)
+        offsets.append(len(targets))
+    return offsets, targets, weights, mids
+
+#--2. Hierarchy arrays + query--#
+class Hierarchy:
+    __slots__ = ("rank", "up_offsets", "up_targets", "up_weights", "up_mids",
+                 "down_offsets", "down_targets", "down_weights", "down_mids")
+
+    def __init__(self, rank, up_offsets, up_targets, up_weights, up_mids,
+                 down_offsets, down_targets, down_weights, down_mids):
+        self.rank = rank
+        self.up_offsets, self.up_targets, self.up_weights, self.up_mids = up_offsets, up_targets, up_weights, up_mids
+        self.down_offsets, self.down_targets = down_offsets, down_targets
+        self.down_weights, self.down_mids = down_weights, down_mids
+
+    @property
+    def num_arcs(self):
+        return len(self.up_targets) + len(self.down_targets)
+
+    def _mid(self, offsets, targets, mids, node, target):
+        for e in range(offsets[node], offsets[node + 1]):
+            if targets[e] == target: return mids[e]
+        raise KeyError((node, target))
+
+    def unpack(self, a, b, mid):
+        # Map-arc nodes from a (exclusive) to b (inclusive) for the hierarchy arc a->b.
+        # A shortcut a->b via m is made of a->m (in m's down arcs) and m->b (in m's up arcs).
+        nodes, stack = [], [(a, b, mid)]
+        while stack:
+            a, b, m = stack.pop()
+            if m == NO_MID:
+                nodes.append(b)
+                continue
+            stack.append((m, b, self._mid(self.up_offsets, self.up_targets, self.up_mids, m, b)))
+            stack.append((a, m, self._mid(self.down_offsets, self.down_targets, self.down_mids, m, a)))
+        return nodes
+
+def ch_algorithm(graph, start, goals, hierarchy):
+    # Same (path, cost, nodes_explored) contract as ucs_algorithm: the nearest of goals.
+    # Forward search climbs up arcs from start, backward search climbs down arcs (reversed)
+    # from every goal at once; each side stops once its smallest key reaches the best meeting cost.
+    start, goals = snap(graph, start), snap_all(graph, goals)
+    if start not in graph: return None, 0, 0
+    goal_ids = {graph.index[g] for g in goals if g in graph}
+    if not goal_ids: return None, 0, 0
+    start = graph.index[start]
+    h = hierarchy
+    sides = (
+        (h.up_offsets, h.up_targets, h.up_weights, {start: 0.0}, {start: None}, [(0.0, start)]),
+        (h.down_offsets, h.down_targets, h.down_weights, {g: 0.0 for g in goal_ids},
+         {g: None for g in goal_ids}, [(0.0, g) for g in goal_ids]),
+    )
+    heapq.heapify(sides[1][5])
+    dist_f, dist_b = sides[0][3], sides[1][3]
+    mu, meet = INF, -1
+    nodes_explored = 0
+
+    while True:
+        top_f = sides[0][5][0][0] if sides[0][5] else INF
+        top_b = sides[1][5][0][0] if sides[1][5] else INF
+        if min(top_f, top_b) >= mu: break
+        offsets, targets, weights, dist, parent, frontier = sides[0] if top_f <= top_b else sides[1]
+        other = dist_b if dist is dist_f else dist_f
+        cost, current = heapq.heappop(frontier)
+        if cost > dist[current]: continue
+        nodes_explored += 1
+        if current in other and cost + other[current] < mu:
+            mu, meet = cost + other[current], current
+
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            new_cost = cost + weights[e]
+            if new_cost < dist.get(neighbor, INF):
+                dist[neighbor], parent[neighbor] = new_cost, (current, e)
+                heapq.heappush(frontier, (new_cost, neighbor))
+                if neighbor in other and new_cost + other[neighbor] < mu:
+                    mu, meet = new_cost + other[neighbor], neighbor
+
+    if meet == -1: return None, 0, nodes_explored
+    # Forward half: start ... meet over up arcs; backward half: meet ... goal over down arcs
+    legs, node = [], meet
+    while sides[0][4][node] is not None:
+        prev, e = sides[0][4][node]
+        legs.append((prev, node, h.up_mids[e]))
+        node = prev
+    path = [start]
+    for a, b, mid in reversed(legs):
+        path.extend(h.unpack(a, b, mid))
+    node = meet
+    while sides[1][4][node] is not None:
+        prev, e = sides[1][4][node]
+        path.extend(h.unpack(node, prev, h.down_mids[e]))
+        node = prev
+    return graph.path_labels(path), mu, nodes_explored
+
+#--3. Hierarchy file I/O--#
+def hierarchy_path(filename, undirected=False):
+    return f"{filename}.{'u' if undirected else 'd'}.ch"
+
+def _sections(h):
+    return (h.rank, h.up_offsets, h.up_targets, h.up_weights, h.up_mids,
+            h.down_offsets, h.down_targets, h.down_weights, h.down_mids)
+
+def write_hierarchy(path, hierarchy, graph, source_stat, source_digest, undirected=False):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FLAG_UNDIRECTED if undirected else 0, 0, graph.num_nodes, graph.num_edges,
+                            len(hierarchy.up_targets), len(hierarchy.down_targets),
+                            source_stat.st_mtime_ns, source_stat.st_size, source_digest))
+        for section in _sections(hierarchy):
+            data = memoryview(section).cast('B')
+            f.write(data)
+            f.write(b"\x00" * ((-len(data)) % 8))
+    os.replace(tmp, path)   # atomic, so concurrent readers never see a half-written file
+
+def read_hierarchy(path):
+    # Returns (Hierarchy backed by the mmap, header fields); Hierarchy is None for a foreign/truncated file
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = memoryview(mm)
+    fields = HEADER.unpack_from(buf, 0)
+    magic, _, _, n, _, a, b = fields[:7]
+    layout = [('i', n), ('i', n + 1), ('i', a), ('d', a), ('i', a), ('i', n + 1), ('i', b), ('d', b), ('i', b)]
+    sizes = [count * (8 if fmt == 'd' else 4) for fmt, count in layout]
+    if magic != MAGIC or len(buf) != HEADER.size + sum(s + (-s) % 8 for s in sizes): return None, fields
+    arrays, pos = [], HEADER.size
+    for (fmt, _), size in zip(layout, sizes):
+        arrays.append(buf[pos:pos + size].cast(fmt))
+        pos += size + (-size) % 8
+    return Hierarchy(*arrays), fields
+
+def is_fresh(fields, graph, undirected, source_stat, filename):
+    _, flags, _, n, m, _, _, mtime_ns, size, digest = fields
+    if (bool(flags & FLAG_UNDIRECTED) != undirected or n != graph.num_nodes or m != graph.num_edges
+            or size != source_stat.st_size):
+        return False
+    return mtime_ns == source_stat.st_mtime_ns or digest == file_digest(filename)
+
+def load_hierarchy_cached(filename, graph=None, undirected=False):
+    # Reuse 'filename.{u,d}.ch' when it matches the map, otherwise contract and rewrite it
+    if graph is None:
+        graph = load_graph_cached(filename, undirected)[0]
+    source_stat = os.stat(filename)
+    path = hierarchy_path(filename, undirected)
+    if sys.byteorder == "little" and os.path.exists(path) and os.path.getsize(path) >= HEADER.size:
+        hierarchy, fields = read_hierarchy(path)
+        if hierarchy is not None and is_fresh(fields, graph, undirected, source_stat, filename):
+            return hierarchy
+
+    hierarchy, _ = contract_graph(graph)
+    if sys.byteorder == "little":
+        try:
+            write_hierarchy(path, hierarchy, graph, source_stat, file_digest(filename), undirected)
+        except OSError:
+            pass   # read-only directory: still return the hierarchy
+    return hierarchy
+
+#--4. CLI: preprocess a map--#
+def main():
+    parser = argparse.ArgumentParser(description="Build a contraction hierarchy for a PathFinder map")
+    parser.add_argument("map")
+    parser.add_argument("--directed", action="store_true", help="treat edges as one-way")
+    args = parser.parse_args()
+
+    undirected = not args.directed
+    graph = load_graph_cached(args.map, undirected)[0]
+    t0 = time.perf_counter()
+    hierarchy, shortcuts = contract_graph(graph)
+    elapsed = time.perf_counter() - t0
+    path = hierarchy_path(args.map, undirected)
+    write_hierarchy(path, hierarchy, graph, os.stat(args.map), file_digest(args.map), undirected)
+    print(f"{graph.num_nodes} nodes, {graph.num_edges} arcs: {shortcuts} shortcuts, "
+          f"{hierarchy.num_arcs} hierarchy arcs, {elapsed:.1f} s")
+    print(f"saved {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#--Benchmark: contraction hierarchy vs UCS and bidirectional UCS--#
+# Contracts each map (timed, written to the .ch sidecar), then runs the same
+# random point-to-point queries with plain Dijkstra, bidirectional Dijkstra and
+# the CH query, checks that every cost matches and prints the speedup.
+#   python HierarchyBenchmark.py --generate road:2e4 road:1e5 --queries 100
+#   python HierarchyBenchmark.py PathFinder-test*.txt --directed
+import os
+import glob
+import time
+import random
+import argparse
+if __package__:
+    from .GraphCache import load_graph_cached, file_digest
+    from .GraphGenerator import ensure_generated, KINDS
+    from .Hierarchy import contract_graph, write_hierarchy, hierarchy_path, ch_algorithm
+    from .UCS import ucs_algorithm, bidirectional_ucs
+else:
+    from GraphCache import load_graph_cached, file_digest
+    from GraphGenerator import ensure_generated, KINDS
+    from Hierarchy import contract_graph, write_hierarchy, hierarchy_path, ch_algorithm
+    from UCS import ucs_algorithm, bidirectional_ucs
+
+def run(search, queries):
+    costs, explored = [], 0
+    t0 = time.perf_counter()
+    for start, goal in queries:
+        path, g, n = search(start, goal)
+        costs.append(g if path else None)
+        explored += n
+    return {"costs": costs, "explored": explored, "time": time.perf_counter() - t0}
+
+def benchmark(filename, count, seed, undirected):
+    graph = load_graph_cached(filename, undirected)[0]
+    t0 = time.perf_counter()
+    hierarchy, shortcuts = contract_graph(graph)
+    prep = time.perf_counter() - t0
+    path = hierarchy_path(filename, undirected)
+    write_hierarchy(path, hierarchy, graph, os.stat(filename), file_digest(filename), undirected)
+
+    rng = random.Random(seed)
+    labels = graph.labels
+    queries = [(labels[rng.randrange(len(labels))], labels[rng.randrange(len(labels))]) for _ in range(count)]
+    searches = {"ucs": lambda s, t: ucs_algorithm(graph, s, [t]),
+                "bidirectional": lambda s, t: bidirectional_ucs(graph, s, t),
+                "ch": lambda s, t: ch_algorithm(graph, s, [t], hierarchy)}
+    results = {name: run(search, queries) for name, search in searches.items()}
+
+    print(f"\n{os.path.basename(filename)}: {graph.num_nodes} nodes, {graph.num_edges} arcs, {count} queries")
+    print(f"  preprocessing {prep:.2f} s, {shortcuts} shortcuts, {hierarchy.num_arcs} hierarchy arcs, "
+          f"{os.path.getsize(path) / 2**20:.1f} MB")
+    base = results["ucs"]
+    print(f"  {'Search':<14} {'Time (s)':>9} {'Per query (ms)':>15} {'Explored':>10} {'Speedup':>8}")
+    for name, r in results.items():
+        speedup = base["time"] / r["time"] if r["time"] > 0 else float("inf")
+        print(f"  {name:<14} {r['time']:>9.3f} {1000 * r['time'] / max(1, count):>15.3f} "
+              f"{r['explored']:>10} {speedup:>7.1f}x")
+    mismatches = sum(a != b and (a is None or b is None or abs(a - b) > 1e-6 * max(1.0, a))
+                     for a, b in zip(base["costs"], results["ch"]["costs"]))
+    if mismatches:
+        print(f"  WARNING: {mismatches} CH costs differ from UCS")
+    if count:
+        print(f"  break-even after {prep / max(1e-9, (base['time'] - results['ch']['time']) / count):.0f} queries")
+
+def main():
+    parser = argparse.ArgumentParser(description="Contraction hierarchy preprocessing time and query speedup")
+    parser.add_argument("maps", nargs="*", help="map files or glob patterns")
+    parser.add_argument("--generate", nargs="*", default=[], metavar="KIND:N",
+                        help=f"generate maps first, KIND in {KINDS}, e.g. road:1e5")
+    parser.add_argument("--workdir", default="bench_maps", help="where generated maps are written")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=30019)
+    parser.add_argument("--directed", action="store_true", help="treat edges as one-way")
+    args = parser.parse_args()
+
+    maps = [m for pattern in args.maps for m in sorted(glob.glob(pattern))]
+    maps += [ensure_generated(spec, args.workdir, args.seed) for spec in args.generate]
+    for filename in maps:
+        benchmark(filename, args.queries, args.seed, not args.directed)
+
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,138 @@
 #--Import libraries--#
-import math
-import re
+import heapq
+from itertools import count
+if __package__:
+    from .GraphCache import load_graph_cached
+    from .Heuristics import heuristic_table
+    from .SpatialIndex import snap
+    from .Metrics import SearchMetrics
+else:
+    from GraphCache import load_graph_cached
+    from Heuristics import heuristic_table
+    from SpatialIndex import snap
+    from Metrics import SearchMetrics
 #--Core Functions--#
-def heuristic(node, goal, positions):
-    (x1, y1) = positions[node]
-    (x2, y2) = positions[goal]
-    return math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
+# h is the goal's heuristic table (Heuristics.heuristic_table), shared by every threshold iteration.
+# The depth-first path lives on an explicit stack (node, g, next edge), so path length is not
+# limited by Python's recursion limit, and on_path is a bytearray for O(1) cycle checks.
+TABLE_SIZE = 1 << 20   # transposition table entries (best g per node); 0 disables it
+GROWTH = 2.0           # target work ratio between iterations; 1 is classic IDA*
+KEEP_LIMIT = 1 << 16   # most pruned f-values remembered when picking the next threshold
 
-def search_recursive(path, g, threshold, goal, graph, positions, explored_set):
-    node = path[-1]
-    f = g + heuristic(node, goal, positions)
-    if f > threshold: return f, False
-    
-    explored_set.add(node)
-    if node == goal: return g, True
-    
-    min_threshold = float('inf')
-    for neighbor, weight in graph.get(node, []):
-        if neighbor not in path:
-            path.append(neighbor)
-            res, found = search_recursive(path, g + weight, threshold, goal, graph, positions, explored_set)
-            if found: return res, True
-            if res < min_threshold: min_threshold = res
-            path.pop()
-    return min_threshold, False
+def search_iterative(graph, start, goal, h, threshold, on_path, seen, table, table_size, iteration=0, keep=1,
+                     on_expand=None):
+    # One threshold iteration. Returns (path ids or None, g at goal, next threshold, new nodes seen,
+    # nodes expanded, successors generated, deepest path). on_expand(node, g, depth) is called per
+    # expansion when given (SearchMetrics.expand). The next threshold is the keep-th smallest f that exceeded this one
+    # (keep=1: the usual minimum). With keep > 1 the threshold may jump past the optimal cost,
+    # so a goal found here only becomes a bound: the iteration finishes as branch-and-bound.
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    path, gs, edge = [start], [0.0], [offsets[start]]
+    on_path[start] = 1
+    exceeded = []   # max-heap (negated) of the keep smallest f > threshold
+    best_path, best_g = None, 0
+    new_seen = expanded = generated = 0
+    deepest = 1
 
-def ida_star_algorithm(graph, positions, start, goal):
-    threshold = heuristic(start, goal, positions)
-    path = [start]
-    all_explored_nodes = set()
-    while True:
-        res, found = search_recursive(path, 0, threshold, goal, graph, positions, all_explored_nodes)
-        if found: return path, len(all_explored_nodes), res
-        if res == float('inf'): return None, len(all_explored_nodes), 0
-        threshold = res
+    while path:
+        node, e = path[-1], edge[-1]
+        if e == offsets[node + 1]:
+            # Every arc tried: backtrack
+            on_path[node] = 0
+            path.pop(); gs.pop(); edge.pop()
+            continue
+        edge[-1] = e + 1
+        neighbor = targets[e]
+        if on_path[neighbor]: continue
+        generated += 1
+
+        g = gs[-1] + weights[e]
+        if best_path is not None and g >= best_g: continue   # cannot beat the goal already found
+        f = g + h[neighbor]
+        if f > threshold:
+            if len(exceeded) < keep: heapq.heappush(exceeded, -f)
+            elif f < -exceeded[0]: heapq.heapreplace(exceeded, -f)
+            continue
+        if table_size:
+            # table[node] = (best g, iteration). A worse g can never help; an equal g only
+            # needs expanding once per iteration, since the threshold has moved since then.
+            entry = table.get(neighbor)
+            if entry is not None:
+                best, when = entry
+                if g > best or (g == best and when == iteration): continue
+                table[neighbor] = (g, iteration)
+            elif len(table) < table_size:
+                table[neighbor] = (g, iteration)
+
+        if not seen[neighbor]:
+            seen[neighbor] = 1; new_seen += 1
+        if neighbor == goal:
+            best_path, best_g = path + [neighbor], g
+            if keep == 1:
+                for node in path: on_path[node] = 0
+                return best_path, best_g, threshold, new_seen, expanded, generated, deepest
+            continue
+        path.append(neighbor); gs.append(g); edge.append(offsets[neighbor])
+        on_path[neighbor] = 1
+        expanded += 1
+        if len(path) > deepest: deepest = len(path)
+        if on_expand is not None: on_expand(neighbor, g, len(path))
+    next_threshold = -exceeded[0] if exceeded else float('inf')
+    return best_path, best_g, next_threshold, new_seen, expanded, generated, deepest
+
+def ida_star_algorithm(graph, start, goal, metric="euclidean", table_size=TABLE_SIZE, growth=GROWTH, metrics=None):
+    # growth > 1 skips thresholds so each iteration does about growth times the work of the last
+    # (IDA*_CR); without it, maps with real-valued costs need one iteration per distinct f-value.
+    # metrics: expansions/generations summed over every iteration, peak_frontier = deepest path
+    if metrics is not None: metrics.begin("IDA*", graph)
+    start, goal = snap(graph, start), snap(graph, goal)
+    if start not in graph or goal not in graph:
+        if metrics is not None: metrics.finish(None, 0, 0, 0)
+        return None, 0, 0
+    start, goal = graph.index[start], graph.index[goal]
+    if start == goal:
+        path = graph.path_labels([start])
+        if metrics is not None: metrics.finish(path, 0.0, 0, 0)
+        return path, 1, 0.0
+    h = heuristic_table(graph, goal, metric)
+    on_path, seen = bytearray(graph.num_nodes), bytearray(graph.num_nodes)
+    seen[start] = 1
+    nodes_seen, keep = 1, 1
+    threshold = h[start]
+    table = {}   # kept across iterations, see search_iterative
+    on_expand = metrics.expand if metrics is not None else None
+    total_expanded = total_generated = deepest = 0
+    if metrics is not None: metrics.phase("setup")
+    for iteration in count():
+        path, cost, threshold, new_seen, expanded, generated, depth = search_iterative(
+            graph, start, goal, h, threshold, on_path, seen, table, table_size, iteration, keep, on_expand)
+        nodes_seen += new_seen
+        total_expanded += expanded; total_generated += generated
+        deepest = max(deepest, depth)
+        if path is not None or threshold == float('inf'):
+            if metrics is not None: metrics.phase("search")
+            labels = graph.path_labels(path) if path is not None else None
+            if metrics is not None:
+                metrics.finish(labels, cost, total_expanded, total_generated,
+                               peak_frontier=deepest, iterations=iteration + 1)
+            return (labels, nodes_seen, cost) if path is not None else (None, nodes_seen, 0)
+        if growth > 1: keep = max(1, min(KEEP_LIMIT, int(expanded * (growth - 1))))
 
 #--MAIN FUNCTION--#
 def main():
     file_name = "PathFinder-test1.txt"
-    positions = {}
-    graph = {}
-    origin = None
-    destinations = []
-
     try:
-        with open(file_name, "r") as f:
-            content = f.read()
-            
-            nodes_data = re.findall(r"(\d+):\s*\(([\d.]+),\s*([\d.]+)\)", content)
-            for node, x, y in nodes_data:
-                positions[node] = (float(x), float(y))
-            
-            edges_data = re.findall(r"\((\d+),(\d+)\):\s*([\d.]+)", content)
-            for u, v, w in edges_data:
-                if u not in graph: graph[u] = []
-                graph[u].append((v, float(w)))
-            
-            origin_match = re.search(r"Origin:\s*(\d+)", content)
-            if origin_match: origin = origin_match.group(1)
-            
-            dest_match = re.search(r"Destinations:\s*([\d;\s]+)", content)
-            if dest_match:
-                destinations = [d.strip() for d in dest_match.group(1).replace(';', ' ').split()]
+        graph, origin, destinations = load_graph_cached(file_name)
 
-        if origin and destinations:
+        if origin is not None and destinations:
             goal = destinations[0]
             print(f"--- Running IDA* from Node {origin} to Node {goal} ---")
-            path, nodes_count, cost = ida_star_algorithm(graph, positions, origin, goal)
+            metrics = SearchMetrics()
+            path, nodes_count, cost = ida_star_algorithm(graph, origin, goal, metrics=metrics)
+            print(metrics.table("IDA*"))
             
             if path:
-                print(f"1. Nodes Explored: {nodes_count}")
-                print(f"2. Total Cost: {cost:.2f}")
-                print(f"3. Path: {' -> '.join(path)}")
+                print(f"Path: {' -> '.join(map(str, path))}")
             else:
                 print("No path found.")
         else:
@@ -0,0 +1,186 @@
+#--Lifelong Planning A* (LPA*): replan after edge-cost changes without starting over--#
+# g[u] is the cost of the best path found so far, rhs[u] the one-step
+# lookahead min over predecessors p of g[p] + c(p, u). Only nodes where the two
+# disagree are queued, so after a few arcs change cost only the region whose
+# shortest paths actually moved is expanded again. Start and goal are fixed
+# (the traffic-update case); like A*, optimality needs a consistent heuristic,
+# which holds as long as costs stay >= the metric distance (true for GraphGenerator maps).
+# Costs must be positive: with zero-cost cycles, stale g values keep supporting
+# each other after an increase and the repair never reaches them.
+#   planner = LPAStar(graph, start, goal)
+#   path, cost, explored = planner.search()
+#   planner.update_edges([(u, v, 42.0), ...], symmetric=True)   # labels + new cost
+#   path, cost, explored = planner.search()                     # repairs the old search
+# planner.graph shares the updated weights, so other searches can run on the same state.
+import heapq
+from array import array
+if __package__:
+    from .Graph import CSRGraph
+    from .Frontier import INF
+    from .GraphCache import load_graph_cached
+    from .Heuristics import heuristic_table
+    from .SpatialIndex import snap
+else:
+    from Graph import CSRGraph
+    from Frontier import INF
+    from GraphCache import load_graph_cached
+    from Heuristics import heuristic_table
+    from SpatialIndex import snap
+
+class LPAStar:
+    def __init__(self, graph, start, goal, metric="euclidean"):
+        start, goal = snap(graph, start), snap(graph, goal)
+        if start not in graph or goal not in graph:
+            raise KeyError(f"start {start!r} or goal {goal!r} is not in the graph")
+        if graph.num_edges and min(graph.weights) <= 0:
+            raise ValueError("LPA* needs positive edge costs")
+        n = graph.num_nodes
+        self.offsets, self.targets = graph.offsets, graph.targets
+        self.weights = array('d', graph.weights)   # private copy: updates must not touch the map cache
+        self.graph = CSRGraph(graph.labels, graph.xs, graph.ys, self.offsets, self.targets, self.weights)
+        self.graph.index = graph.index
+
+        # Predecessor lists: rev_arcs[rev_offsets[v]:rev_offsets[v+1]] are the arc ids e with targets[e] == v
+        offsets, targets = self.offsets, self.targets
+        rev_offsets = array('i', [0]) * (n + 1)
+        for v in targets: rev_offsets[v + 1] += 1
+        for i in range(n): rev_offsets[i + 1] += rev_offsets[i]
+        cursor = array('i', rev_offsets[:n])
+        self.sources = array('i', [0]) * len(targets)   # arc id -> tail node
+        self.rev_arcs = array('i', [0]) * len(targets)
+        for u in range(n):
+            for e in range(offsets[u], offsets[u + 1]):
+                self.sources[e] = u
+                v = targets[e]
+                self.rev_arcs[cursor[v]] = e; cursor[v] += 1
+        self.rev_offsets = rev_offsets
+
+        self.start, self.goal = graph.index[start], graph.index[goal]
+        self.h = heuristic_table(graph, self.goal, metric)
+        self.g = array('d', [INF]) * n
+        self.rhs = array('d', [INF]) * n
+        self.rhs[self.start] = 0.0
+        self.queue = [(self.h[self.start], 0.0, self.start)]
+        self.expansions = 0   # total over every search() call
+
+    #--Keys and vertex updates--#
+    def _key(self, u):
+        k = min(self.g[u], self.rhs[u])
+        return (k + self.h[u], k)
+
+    def _recompute(self, v):
+        # rhs[v] from scratch: best g[p] + c(p, v) over every arc into v
+        if v == self.start: return 0.0
+        g, sources, weights, rev_arcs = self.g, self.sources, self.weights, self.rev_arcs
+        best = INF
+        for i in range(self.rev_offsets[v], self.rev_offsets[v + 1]):
+            e = rev_arcs[i]
+            cost = g[sources[e]] + weights[e]
+            if cost < best: best = cost
+        return best
+
+    def _update(self, v):
+        # Queue v under its current key if it is inconsistent; stale entries are skipped on pop
+        if self.g[v] != self.rhs[v]:
+            k1, k2 = self._key(v)
+            heapq.heappush(self.queue, (k1, k2, v))
+
+    def _top(self):
+        # Smallest valid queue entry (key, node), dropping stale ones; (INF, INF), -1 when empty
+        queue, g, rhs = self.queue, self.g, self.rhs
+        while queue:
+            k1, k2, u = queue[0]
+            if g[u] != rhs[u] and (k1, k2) == self._key(u):
+                return (k1, k2), u
+            heapq.heappop(queue)
+        return (INF, INF), -1
+
+    #--Search--#
+    def search(self):
+        # (path, cost, nodes_explored) like a_star_algorithm; nodes_explored counts this call only
+        g, rhs, goal = self.g, self.rhs, self.goal
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        explored = 0
+        while True:
+            top, u = self._top()
+            if u == -1 or (top >= self._key(goal) and rhs[goal] == g[goal]): break
+            heapq.heappop(self.queue)
+            explored += 1
+            if g[u] > rhs[u]:
+                # Overconsistent: the new, lower cost is final for now; relax the out-arcs
+                g[u] = rhs[u]
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = targets[e]
+                    cost = g[u] + weights[e]
+                    if cost < rhs[v] and v != self.start:
+                        rhs[v] = cost
+                        self._update(v)
+            else:
+                # Underconsistent: the old cost is gone; every node that relied on u recomputes
+                old = g[u]
+                g[u] = INF
+                self._update(u)
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = targets[e]
+                    if rhs[v] == old + weights[e]:
+                        rhs[v] = self._recompute(v)
+                        self._update(v)
+        self.expansions += explored
+        if g[goal] == INF: return None, 0, explored
+        return self.graph.path_labels(self.path_ids()), g[goal], explored
+
+    def path_ids(self):
+        # Walk back from the goal through the predecessor that realises g
+        g, sources, weights, rev_arcs = self.g, self.sources, self.weights, self.rev_arcs
+        path, v = [self.goal], self.goal
+        while v != self.start:
+            best, best_u = INF, -1
+            for i in range(self.rev_offsets[v], self.rev_offsets[v + 1]):
+                e = rev_arcs[i]
+                cost = g[sources[e]] + weights[e]
+                if cost < best: best, best_u = cost, sources[e]
+            v = best_u
+            path.append(v)
+        path.reverse()
+        return path
+
+    #--Updates--#
+    def update_edges(self, changes, symmetric=False):
+        # changes: iterable of (u, v, cost) labels; every arc u->v gets the new cost
+        # (and v->u too when symmetric, for maps loaded as undirected). Returns arcs changed.
+        index, offsets, targets, weights = self.graph.index, self.offsets, self.targets, self.weights
+        changed = 0
+        for u, v, cost in changes:
+            if not cost > 0: raise ValueError(f"edge {u!r}->{v!r}: LPA* needs positive costs, got {cost!r}")
+            pairs = ((index[u], index[v]), (index[v], index[u])) if symmetric else ((index[u], index[v]),)
+            for a, b in pairs:
+                for e in range(offsets[a], offsets[a + 1]):
+                    if targets[e] != b or weights[e] == cost: continue
+                    old, weights[e] = weights[e], cost
+                    changed += 1
+                    self.graph.version += 1   # content-keyed caches (RouteCache) must see the new costs
+                    if b == self.start: continue
+                    if cost < old:
+                        if self.g[a] + cost < self.rhs[b]: self.rhs[b] = self.g[a] + cost
+                    elif self.rhs[b] == self.g[a] + old:
+                        self.rhs[b] = self._recompute(b)
+                    self._update(b)
+        return changed
+
+    def arc_cost(self, u, v):
+        # Current cheapest u->v cost by labels (INF if there is no such arc)
+        u, v = self.graph.index[u], self.graph.index[v]
+        return min((self.weights[e] for e in range(self.offsets[u], self.offsets[u + 1]) if self.targets[e] == v), default=INF)
+
+def main():
+    graph, start, goals = load_graph_cached('PathFinder-test1.txt', undirected=True)
+    planner = LPAStar(graph, start, goals[0])
+    print("initial:", planner.search())
+    path = planner.search()[0]
+    if path and len(path) > 1:
+        u, v = path[0], path[1]
+        planner.update_edges([(u, v, planner.arc_cost(u, v) * 10)], symmetric=True)
+        print(f"after {u}-{v} x10:", planner.search())
+
+if __name__ == "__main__":
+    main()
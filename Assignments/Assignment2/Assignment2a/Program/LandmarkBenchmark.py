@@ -0,0 +1,62 @@
+#--Benchmark: Euclidean A* vs ALT (landmark) A*--#
+# Preprocesses the map with each landmark strategy, then runs the same random
+# queries with the Euclidean heuristic and with the landmark bounds, and
+# prints nodes explored, the reduction and wall time for each.
+#   python LandmarkBenchmark.py PathFinder-road-1e5.txt --count 16 --queries 50
+import os
+import time
+import random
+import argparse
+if __package__:
+    from .GraphCache import load_graph_cached
+    from .Landmarks import STRATEGIES, load_landmarks_cached, landmark_path
+    from .AStar import a_star_algorithm
+else:
+    from GraphCache import load_graph_cached
+    from Landmarks import STRATEGIES, load_landmarks_cached, landmark_path
+    from AStar import a_star_algorithm
+
+def run(graph, queries, landmarks=None):
+    explored = cost = 0
+    t0 = time.perf_counter()
+    for start, goal in queries:
+        path, g, n = a_star_algorithm(graph, start, goal, landmarks=landmarks)
+        explored += n
+        cost += g if path else 0
+    return {"explored": explored, "cost": cost, "time": time.perf_counter() - t0}
+
+def main():
+    parser = argparse.ArgumentParser(description="Euclidean vs landmark (ALT) heuristic for A*")
+    parser.add_argument("map")
+    parser.add_argument("--count", type=int, default=16, help="landmarks per strategy")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help="comma separated")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=30019)
+    parser.add_argument("--directed", action="store_true", help="treat edges as one-way")
+    args = parser.parse_args()
+
+    undirected = not args.directed
+    graph = load_graph_cached(args.map, undirected)[0]
+    rng = random.Random(args.seed)
+    labels = graph.labels
+    queries = [(labels[rng.randrange(len(labels))], labels[rng.randrange(len(labels))]) for _ in range(args.queries)]
+
+    print(f"{graph.num_nodes} nodes, {graph.num_edges} arcs, {args.queries} queries")
+    base = run(graph, queries)
+    print(f"{'Heuristic':<16} {'Prep (s)':>9} {'File (MB)':>10} {'Explored':>10} {'Reduction':>10} {'Time (s)':>9}")
+    print(f"{'euclidean':<16} {'-':>9} {'-':>10} {base['explored']:>10} {'-':>10} {base['time']:>9.3f}")
+    for strategy in args.strategies.split(","):
+        path = landmark_path(args.map, undirected)
+        if os.path.exists(path): os.remove(path)   # time a fresh preprocessing run
+        t0 = time.perf_counter()
+        landmarks = load_landmarks_cached(args.map, graph, args.count, strategy, undirected, args.seed)
+        prep = time.perf_counter() - t0
+        r = run(graph, queries, landmarks)
+        reduction = 1 - r["explored"] / base["explored"] if base["explored"] else 0
+        if abs(r["cost"] - base["cost"]) > 1e-6 * max(1.0, base["cost"]):
+            print(f"  note: total cost {r['cost']:.1f} vs {base['cost']:.1f} (Euclidean is not admissible on this map)")
+        print(f"{'alt-' + strategy:<16} {prep:>9.2f} {os.path.getsize(path) / 2**20:>10.1f} "
+              f"{r['explored']:>10} {reduction:>10.1%} {r['time']:>9.3f}")
+
+if __name__ == "__main__":
+    main()
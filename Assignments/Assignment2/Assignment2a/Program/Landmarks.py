@@ -0,0 +1,277 @@
+#--ALT preprocessing: landmarks and triangle-inequality bounds for A*--#
+# For a landmark L the triangle inequality gives, for every node v and goal t,
+#   d(v, t) >= d(L, t) - d(L, v)   and   d(v, t) >= d(v, L) - d(t, L)
+# so the max over a few landmarks is an admissible, consistent heuristic that
+# follows the real edge costs instead of the straight-line distance.
+# Distances are computed once per map and written next to it as
+# 'map.txt.u.alt' (or '.d.alt'); later loads mmap that file like GraphCache.
+#   python Landmarks.py PathFinder-road-1e5.txt --count 16 --strategy avoid
+#   landmarks = load_landmarks_cached("map.txt", graph, undirected=True)
+#   a_star_algorithm(graph, start, goal, landmarks=landmarks)
+#
+# Layout (little-endian): header | ids i32[k] (padded to 8)
+#   | from f64[k*n] (row i: d(L_i, v)) | to f64[k*n] (row i: d(v, L_i), directed maps only)
+import os
+import sys
+import mmap
+import heapq
+import random
+import struct
+import argparse
+from array import array
+if __package__:
+    from .Graph import new_parents
+    from .Frontier import INF
+    from .GraphCache import load_graph_cached, file_digest
+    from .Heuristics import numpy_or_none, TableCache
+else:
+    from Graph import new_parents
+    from Frontier import INF
+    from GraphCache import load_graph_cached, file_digest
+    from Heuristics import numpy_or_none, TableCache
+
+MAGIC = b"PFALT\x00\x00\x01"
+HEADER = struct.Struct("<8sIIqqqQII16s32s")   # magic, flags, k, n, m, mtime_ns, size, count, seed, strategy, sha256
+FLAG_UNDIRECTED = 1
+
+def landmark_path(filename, undirected=False):
+    return f"{filename}.{'u' if undirected else 'd'}.alt"
+
+#--1. Single-source shortest distances (plain Dijkstra over the whole map)--#
+def shortest_distances(graph, source):
+    # Returns (dist f64[n], parent i32[n], settle order i32); unreachable nodes keep INF
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = array('d', [INF]) * graph.num_nodes
+    parent = new_parents(graph.num_nodes)
+    dist[source], parent[source] = 0.0, source
+    order = array('i')
+    frontier = [(0.0, source)]
+    while frontier:
+        d, u = heapq.heappop(frontier)
+        if d > dist[u]: continue
+        order.append(u)
+        for e in range(offsets[u], offsets[u + 1]):
+            v, nd = targets[e], d + weights[e]
+            if nd < dist[v]:
+                dist[v], parent[v] = nd, u
+                heapq.heappush(frontier, (nd, v))
+    return dist, parent, order
+
+#--2. Lower bounds d(v, t) for every v from a set of landmark rows--#
+# lower_bounds(F, B, t) bounds d(v, t); swapping the rows, lower_bounds(B, F, s)
+# bounds d(s, v). INF - INF (a landmark that reaches neither node) is NaN and is ignored.
+def _bounds_numpy(np, F, B, t):
+    with np.errstate(invalid="ignore"):
+        h = np.fmax.reduce(np.fmax(F[:, t:t + 1] - F, B - B[:, t:t + 1]), axis=0)
+    return np.fmax(h, 0.0)
+
+def _bounds_python(F, B, t, n):
+    h = array('d', [0.0]) * n
+    for f_row, b_row in zip(F, B):
+        ft, bt = f_row[t], b_row[t]
+        for v in range(n):
+            a, b = ft - f_row[v], b_row[v] - bt
+            if a > h[v]: h[v] = a
+            if b > h[v]: h[v] = b
+    return h
+
+def lower_bounds(F, B, t, n):
+    # F, B: lists of per-landmark distance rows (from / to the landmark). Returns array('d')
+    if not F: return array('d', [0.0]) * n
+    np = numpy_or_none()
+    if np is None: return _bounds_python(F, B, t, n)
+    table = array('d')
+    table.frombytes(_bounds_numpy(np, np.array(F), np.array(B), t).tobytes())
+    return table
+
+#--3. Landmark selection--#
+# Both strategies receive distances(u) -> (from-row, to-row), memoised by build_landmarks
+def select_farthest(graph, count, rng, distances):
+    # Start far from a random node, then keep adding the node farthest from every landmark so far.
+    # Only reachable nodes count: isolated nodes would otherwise soak up every landmark.
+    nearest = shortest_distances(graph, rng.randrange(graph.num_nodes))[0]
+    ids = []
+    while len(ids) < count:
+        u = max(range(graph.num_nodes), key=lambda v: nearest[v] if nearest[v] < INF else -1.0)
+        if not 0 < nearest[u] < INF: break   # every reachable node is already a landmark
+        ids.append(u)
+        row = distances(u)[0]
+        nearest = array('d', row) if len(ids) == 1 else array('d', map(min, nearest, row))
+    return ids
+
+def select_avoid(graph, count, rng, distances):
+    # Goldberg & Harrelson: grow a shortest-path tree from a random root, weight every node by how
+    # badly the current landmarks bound d(root, v), and put the next landmark at the leaf of the
+    # heaviest subtree that does not already contain a landmark.
+    n = graph.num_nodes
+    ids = select_farthest(graph, 1, rng, distances)
+    attempts = 0
+    while len(ids) < count and attempts < 4 * count:
+        attempts += 1
+        root = rng.randrange(n)
+        dist, parent, order = shortest_distances(graph, root)
+        rows = [distances(u) for u in ids]
+        bound = lower_bounds([r[1] for r in rows], [r[0] for r in rows], root, n)   # <= d(root, v)
+
+        size = array('d', [0.0]) * n
+        covered = bytearray(n)
+        for u in ids: covered[u] = 1
+        best_child = array('i', [-1]) * n
+        best_size = array('d', [0.0]) * n
+        for v in reversed(order):
+            if covered[v]:
+                size[v] = 0.0
+            else:
+                size[v] += dist[v] - bound[v]
+            p = parent[v]
+            if p == v: continue
+            if covered[v]: covered[p] = 1
+            else:
+                size[p] += size[v]
+                if size[v] > best_size[p]: best_child[p], best_size[p] = v, size[v]
+        if best_child[root] == -1: continue   # the current landmarks already bound this tree exactly
+
+        u = root
+        while best_child[u] != -1:
+            u = best_child[u]
+        if u not in ids: ids.append(u)
+    return ids
+
+STRATEGIES = {"farthest": select_farthest, "avoid": select_avoid}
+
+#--4. Landmark set--#
+class Landmarks:
+    __slots__ = ("ids", "forward", "backward", "n", "_matrices", "__weakref__")
+
+    def __init__(self, ids, forward, backward=None, n=0):
+        self.ids = ids                         # int32 landmark node ids
+        self.forward = forward                 # f64[k*n], row i: d(L_i, v)
+        self.backward = forward if backward is None else backward   # row i: d(v, L_i)
+        self.n = n
+        self._matrices = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def undirected(self):
+        return self.backward is self.forward
+
+    def rows(self, flat):
+        view, n = memoryview(flat), self.n
+        return [view[i * n:(i + 1) * n] for i in range(len(self.ids))]
+
+    def matrices(self, np):
+        # (k, n) float64 views over forward / backward, built once
+        if self._matrices is None:
+            shape = (len(self.ids), self.n)
+            self._matrices = (np.frombuffer(self.forward, dtype=np.float64).reshape(shape),
+                              np.frombuffer(self.backward, dtype=np.float64).reshape(shape))
+        return self._matrices
+
+@TableCache
+def landmark_table(landmarks, goal):
+    # h(v) = max over landmarks of the triangle bounds on d(v, goal), as array('d') of length n
+    np = numpy_or_none()
+    if np is None or not len(landmarks):
+        return lower_bounds(landmarks.rows(landmarks.forward), landmarks.rows(landmarks.backward),
+                            goal, landmarks.n)
+    F, B = landmarks.matrices(np)
+    table = array('d')
+    table.frombytes(_bounds_numpy(np, F, B, goal).tobytes())
+    return table
+
+def build_landmarks(graph, count=8, strategy="avoid", seed=30019, undirected=False):
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown landmark strategy '{strategy}', expected one of {sorted(STRATEGIES)}")
+    reverse = graph if undirected else graph.reverse()
+    memo = {}
+
+    def distances(u):
+        if u not in memo:
+            forward = shortest_distances(graph, u)[0]
+            memo[u] = (forward, forward if undirected else shortest_distances(reverse, u)[0])
+        return memo[u]
+
+    ids = STRATEGIES[strategy](graph, min(count, graph.num_nodes), random.Random(seed), distances)
+    forward, backward = array('d'), array('d')
+    for u in ids:
+        forward.extend(distances(u)[0])
+        if not undirected: backward.extend(distances(u)[1])
+    return Landmarks(array('i', ids), forward, None if undirected else backward, graph.num_nodes)
+
+#--5. Landmark file I/O--#
+def write_landmarks(path, landmarks, graph, count, strategy, seed, source_stat, source_digest):
+    ids = memoryview(landmarks.ids).cast('B')
+    sections = [ids, b"\x00" * ((-len(ids)) % 8), memoryview(landmarks.forward).cast('B')]
+    if not landmarks.undirected: sections.append(memoryview(landmarks.backward).cast('B'))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FLAG_UNDIRECTED if landmarks.undirected else 0, len(landmarks.ids),
+                            graph.num_nodes, graph.num_edges, source_stat.st_mtime_ns, source_stat.st_size,
+                            count, seed, strategy.encode(), source_digest))
+        for section in sections:
+            f.write(section)
+    os.replace(tmp, path)
+
+def read_landmarks(path):
+    # Returns (Landmarks backed by the mmap, header fields); Landmarks is None for a foreign/truncated file
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = memoryview(mm)
+    fields = HEADER.unpack_from(buf, 0)
+    magic, flags, k, n = fields[:4]
+    pos = HEADER.size
+    expected = pos + 4 * k + (-4 * k) % 8 + 8 * k * n * (1 if flags & FLAG_UNDIRECTED else 2)
+    if magic != MAGIC or len(buf) != expected: return None, fields
+    ids = buf[pos:pos + 4 * k].cast('i')
+    pos += 4 * k + (-4 * k) % 8
+    forward = buf[pos:pos + 8 * k * n].cast('d')
+    backward = None if flags & FLAG_UNDIRECTED else buf[pos + 8 * k * n:pos + 16 * k * n].cast('d')
+    return Landmarks(ids, forward, backward, n), fields
+
+def is_fresh(fields, graph, count, strategy, seed, undirected, source_stat, filename):
+    # The stored count/seed are the requested ones: small maps may yield fewer landmarks
+    magic, flags, _, n, m, mtime_ns, size, stored_count, stored_seed, stored_strategy, digest = fields
+    if (magic != MAGIC or bool(flags & FLAG_UNDIRECTED) != undirected or n != graph.num_nodes
+            or m != graph.num_edges or size != source_stat.st_size or (stored_count, stored_seed) != (count, seed)
+            or stored_strategy.rstrip(b"\x00") != strategy.encode()):
+        return False
+    return mtime_ns == source_stat.st_mtime_ns or digest == file_digest(filename)
+
+def load_landmarks_cached(filename, graph=None, count=8, strategy="avoid", undirected=False, seed=30019):
+    # Reuse 'filename.{u,d}.alt' when it matches the map and settings, otherwise rebuild and rewrite it
+    if graph is None:
+        graph = load_graph_cached(filename, undirected)[0]
+    source_stat = os.stat(filename)
+    path = landmark_path(filename, undirected)
+    if sys.byteorder == "little" and os.path.exists(path) and os.path.getsize(path) >= HEADER.size:
+        landmarks, fields = read_landmarks(path)
+        if landmarks is not None and is_fresh(fields, graph, count, strategy, seed, undirected, source_stat, filename):
+            return landmarks
+
+    landmarks = build_landmarks(graph, count, strategy, seed, undirected)
+    if sys.byteorder == "little":
+        try:
+            write_landmarks(path, landmarks, graph, count, strategy, seed, source_stat, file_digest(filename))
+        except OSError:
+            pass   # read-only directory: still return the landmarks
+    return landmarks
+
+#--6. CLI: preprocess a map--#
+def main():
+    parser = argparse.ArgumentParser(description="Select ALT landmarks for a PathFinder map and save their distances")
+    parser.add_argument("map")
+    parser.add_argument("--count", type=int, default=8, help="number of landmarks")
+    parser.add_argument("--strategy", default="avoid", choices=sorted(STRATEGIES))
+    parser.add_argument("--seed", type=int, default=30019)
+    parser.add_argument("--directed", action="store_true", help="treat edges as one-way")
+    args = parser.parse_args()
+
+    graph = load_graph_cached(args.map, not args.directed)[0]
+    landmarks = load_landmarks_cached(args.map, graph, args.count, args.strategy, not args.directed, args.seed)
+    print(f"{len(landmarks)} landmarks ({args.strategy}): {', '.join(str(graph.labels[u]) for u in landmarks.ids)}")
+    print(f"saved {landmark_path(args.map, not args.directed)}")
+
+if __name__ == "__main__":
+    main()
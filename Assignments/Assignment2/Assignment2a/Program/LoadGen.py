@@ -0,0 +1,107 @@
+#--Load generator for RouteServer: concurrent clients firing random route queries--#
+# Each of --clients connections keeps --pipeline requests in flight for --duration
+# seconds. Queries go between random nodes of --map; a --hot share of them is
+# drawn from a small set of popular pairs, so identical queries overlap and the
+# server's coalescing shows up in its stats. Prints client-side throughput and
+# latency percentiles, then the server's own stats.
+#   python RouteServer.py --unix /tmp/routes.sock &
+#   python LoadGen.py --unix /tmp/routes.sock --map bench_maps/PathFinder-road-20000.txt --clients 16 --duration 10
+#   python LoadGen.py --generate road:2e4 --port 8765 --algorithm ucs
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+if __package__:
+    from .GraphCache import load_graph_cached
+    from .GraphGenerator import ensure_generated, KINDS
+else:
+    from GraphCache import load_graph_cached
+    from GraphGenerator import ensure_generated, KINDS
+
+async def connect(args):
+    if args.unix: return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+async def request(args, payload):
+    reader, writer = await connect(args)
+    writer.write((json.dumps(payload) + "\n").encode())
+    await writer.drain()
+    reply = json.loads(await reader.readline())
+    writer.close()
+    return reply
+
+async def client(args, labels, hot, rng, stop, totals):
+    reader, writer = await connect(args)
+    sent = {}   # id -> send time
+    window = asyncio.Semaphore(args.pipeline)
+    next_id = 0
+
+    async def receive():
+        while sent or time.perf_counter() < stop:
+            line = await reader.readline()
+            if not line: break
+            reply = json.loads(line)
+            totals["latencies"].append(time.perf_counter() - sent.pop(reply["id"]))
+            error = reply.get("error")
+            if error: totals["errors"][error] = totals["errors"].get(error, 0) + 1
+            else: totals["ok"] += 1
+            window.release()
+
+    receiver = asyncio.create_task(receive())
+    while time.perf_counter() < stop:
+        await window.acquire()
+        if rng.random() < args.hot: origin, destination = rng.choice(hot)
+        else: origin, destination = rng.choice(labels), rng.choice(labels)
+        sent[next_id] = time.perf_counter()
+        writer.write((json.dumps({"id": next_id, "map": args.map, "origin": origin, "destination": destination,
+                                  "algorithm": args.algorithm, "timeout": args.timeout}) + "\n").encode())
+        await writer.drain()
+        next_id += 1
+    if sent: await receiver
+    else: receiver.cancel()   # nothing left to read: it would wait for a reply that never comes
+    writer.close()
+
+async def run(args):
+    graph = load_graph_cached(args.map, undirected=True)[0]
+    labels = list(graph.labels)
+    rng = random.Random(args.seed)
+    hot = [(rng.choice(labels), rng.choice(labels)) for _ in range(args.hot_pairs)]
+    await request(args, {"id": 0, "map": args.map, "origin": labels[0], "destination": labels[0]})   # warm-up load
+    totals = {"ok": 0, "errors": {}, "latencies": []}
+    started = time.perf_counter()
+    stop = started + args.duration
+    await asyncio.gather(*(client(args, labels, hot, random.Random(args.seed + i + 1), stop, totals)
+                           for i in range(args.clients)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(totals["latencies"])
+    percentile = lambda q: 1000 * latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else 0.0
+    print(f"{len(latencies)} replies in {elapsed:.1f} s: {len(latencies) / elapsed:.1f} req/s, "
+          f"{totals['ok']} ok, errors {totals['errors'] or 'none'}")
+    print(f"client latency: p50 {percentile(0.50):.2f} ms, p90 {percentile(0.90):.2f} ms, p99 {percentile(0.99):.2f} ms")
+    print("server stats:", json.dumps(await request(args, {"op": "stats"})))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test a RouteServer")
+    parser.add_argument("--unix", metavar="PATH", help="server Unix socket (default: TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--map", default="PathFinder-test1.txt", help="map the queries run on")
+    parser.add_argument("--generate", metavar="KIND:N", help=f"generate the map first, KIND in {KINDS}")
+    parser.add_argument("--workdir", default="bench_maps", help="where a generated map is written")
+    parser.add_argument("--algorithm", default="astar")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent connections")
+    parser.add_argument("--pipeline", type=int, default=4, help="requests in flight per connection")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--hot", type=float, default=0.3, help="share of queries drawn from the hot pairs")
+    parser.add_argument("--hot-pairs", type=int, default=20, help="number of popular (origin, destination) pairs")
+    parser.add_argument("--timeout", type=float, default=5.0, help="per-request timeout sent to the server")
+    parser.add_argument("--seed", type=int, default=30019)
+    args = parser.parse_args(argv)
+    if args.generate: args.map = ensure_generated(args.generate, args.workdir, args.seed)
+    args.map = os.path.abspath(args.map)   # the server resolves paths against its own directory
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
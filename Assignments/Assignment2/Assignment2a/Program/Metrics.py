@@ -0,0 +1,112 @@
+#--Search instrumentation: one metrics object for every algorithm--#
+# Searches take metrics=None. Left at None they only keep the counters they
+# need anyway, plus one 'is not None' test per expansion, so instrumentation
+# costs nothing measurable when it is off. Given a SearchMetrics they fill in:
+#   expansions     nodes taken off the frontier and expanded (the goal included)
+#   generations    successors put on the frontier (including decrease-keys)
+#   reopenings     already-expanded nodes put back (A* with an inconsistent heuristic)
+#   peak_frontier  largest frontier (beam: largest layer; IDA*: deepest path)
+#   peak_memory    most search-tree nodes held at once (SMA*), 0 when not tracked
+#   heap_pushes / heap_pops / heap_decreases   priority-queue operations
+#   iterations     threshold / restart rounds (IDA*), 0 for single-pass searches
+#   phases         seconds spent in setup / search / path reconstruction
+# and call on_expand(label, g) for every expansion when a callback is given.
+#   metrics = SearchMetrics(on_expand=lambda node, g: order.append(node))
+#   path, cost, explored = a_star_algorithm(graph, 2, 5, metrics=metrics)
+#   print(metrics.table("A*")); metrics.to_json()
+# Reusing one object for several searches adds their counters up.
+import json
+import time
+
+FIELDS = ("algorithm", "searches", "solved", "cost", "path_length", "expansions", "generations",
+          "reopenings", "peak_frontier", "peak_memory", "heap_pushes", "heap_pops", "heap_decreases",
+          "iterations", "graph_nodes")
+
+class SearchMetrics:
+    __slots__ = FIELDS + ("phases", "on_expand", "labels", "_mark")
+
+    def __init__(self, algorithm=None, on_expand=None):
+        self.algorithm, self.on_expand = algorithm, on_expand
+        self.searches = self.solved = self.path_length = self.graph_nodes = 0
+        self.expansions = self.generations = self.reopenings = self.peak_frontier = self.peak_memory = 0
+        self.heap_pushes = self.heap_pops = self.heap_decreases = self.iterations = 0
+        self.cost = 0
+        self.phases = {}
+        self.labels, self._mark = None, 0.0
+
+    #--Called by the searches--#
+    def begin(self, algorithm, graph):
+        if self.algorithm is None: self.algorithm = algorithm
+        self.graph_nodes, self.labels = graph.num_nodes, graph.labels
+        self._mark = time.perf_counter()
+
+    def phase(self, name):
+        # Charge the time since the previous mark to phase name
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self._mark
+        self._mark = now
+
+    def expand(self, node, g, frontier_size):
+        # Once per expansion, only when metrics are on
+        if frontier_size > self.peak_frontier: self.peak_frontier = frontier_size
+        if self.on_expand is not None: self.on_expand(self.labels[node], g)
+
+    def finish(self, path, cost, expansions, generations, frontier=None, **counters):
+        # path: label path or None. frontier: IndexedHeap / LazyHeap to read heap counters from;
+        # counters: any other field (reopenings, heap_pushes, ...) to add
+        self.phase("path" if path else "search")
+        self.searches += 1
+        self.solved += path is not None
+        self.cost += cost if path else 0
+        self.path_length += len(path) if path else 0
+        self.expansions += expansions
+        self.generations += generations
+        if frontier is not None:
+            self.heap_pushes += frontier.pushes
+            self.heap_pops += frontier.pops
+            self.heap_decreases += frontier.decreases
+            self.peak_frontier = max(self.peak_frontier, frontier.peak)
+        for name, value in counters.items():
+            if name.startswith("peak_"): setattr(self, name, max(getattr(self, name), value))
+            else: setattr(self, name, getattr(self, name) + value)
+
+    #--Reporting--#
+    @property
+    def exploration_ratio(self):
+        # Expanded nodes per search as a share of the graph
+        return self.expansions / (self.searches * self.graph_nodes) if self.searches and self.graph_nodes else 0.0
+
+    @property
+    def success_rate(self):
+        return self.solved / self.searches if self.searches else 0.0
+
+    def to_dict(self):
+        data = {name: getattr(self, name) for name in FIELDS}
+        data["success_rate"] = round(self.success_rate, 4)
+        data["exploration_ratio"] = round(self.exploration_ratio, 6)
+        data["phases_ms"] = {name: round(1000 * seconds, 3) for name, seconds in self.phases.items()}
+        return data
+
+    def to_json(self, **options):
+        return json.dumps(self.to_dict(), **options)
+
+    def table(self, title=None):
+        # The 'PERFORMANCE SHOWCASE' block the scripts print, the same for every algorithm
+        title = title or self.algorithm or "SEARCH"
+        phases = ", ".join(f"{name} {1000 * seconds:.2f} ms" for name, seconds in self.phases.items())
+        rows = [("Success Rate", f"{100 * self.success_rate:.1f}%"),
+                ("Nodes Expanded", f"{self.expansions} nodes"),
+                ("Nodes Generated", f"{self.generations} nodes"),
+                ("Re-openings", self.reopenings),
+                ("Peak Frontier", f"{self.peak_frontier} nodes"),
+                ("Heap push/pop/dec", f"{self.heap_pushes}/{self.heap_pops}/{self.heap_decreases}"),
+                ("Exploration Ratio", f"{100 * self.exploration_ratio:.2f}%"),
+                ("Path Length", f"{self.path_length} nodes"),
+                ("Total Path Cost", self.cost),
+                ("Time", phases or "-")]
+        if self.iterations: rows.insert(6, ("Iterations", self.iterations))
+        if self.peak_memory: rows.insert(5, ("Peak Memory", f"{self.peak_memory} nodes"))
+        lines = ["=" * 50, f"{f'--- {title} PERFORMANCE SHOWCASE ---':^50}", "=" * 50]
+        lines += [f"{f'{i}. {name}:':<25} {value}" for i, (name, value) in enumerate(rows, 1)]
+        lines.append("=" * 50)
+        return "\n".join(lines)
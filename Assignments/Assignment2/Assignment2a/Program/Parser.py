@@ -0,0 +1,80 @@
+#--Streaming PathFinder parser shared by every program--#
+# Reads the file one line at a time and writes nodes/edges straight into the
+# CSR arrays, so memory stays bounded by the graph itself and not by the text.
+from array import array
+if __package__: from .Graph import CSRGraph, NO_COORD
+else: from Graph import CSRGraph, NO_COORD
+
+SECTIONS = {"nodes", "edges", "origin", "destinations"}
+
+def parse_label(token):
+    # Numeric labels become ints (1, 20, 300), anything else stays a string (S1, HCM)
+    token = token.strip()
+    try:
+        return int(token)
+    except ValueError:
+        return token
+
+#--1. Record generator--#
+def iter_records(lines):
+    # Yields ('nodes', label, x, y), ('edges', u, v, w), ('origin', label)
+    # and ('destinations', label). Malformed lines are skipped, like before.
+    section = None
+    for raw in lines:
+        line = raw.strip()
+        if not line: continue
+
+        head, _, rest = line.partition(":")
+        key = head.strip().lower()
+        if key in SECTIONS:
+            section, line = key, rest.strip()   # "Origin: 2" on one line also works
+            if not line: continue
+
+        try:
+            if section == "nodes":
+                label, _, coord = line.partition(":")
+                x, y = coord.strip().strip("()").split(",")
+                yield "nodes", parse_label(label), float(x), float(y)
+            elif section == "edges" and line[0] == "(":
+                close = line.index(")")
+                u, v = line[1:close].split(",")
+                _, _, weight = line[close + 1:].partition(":")
+                weight = weight.strip()
+                yield "edges", parse_label(u), parse_label(v), float(weight) if weight else 1.0
+            elif section == "origin":
+                yield "origin", parse_label(line)
+            elif section == "destinations":
+                for token in line.replace(";", " ").replace(",", " ").split():
+                    yield "destinations", parse_label(token)
+        except ValueError:
+            continue
+
+#--2. Graph loader--#
+def load_graph(filename, undirected=False):
+    # Returns (CSRGraph, origin, destinations). Raises FileNotFoundError.
+    labels, index = [], {}
+    xs, ys = array('d'), array('d')
+    src, dst, w = array('i'), array('i'), array('d')
+    origin, destinations = None, []
+
+    def node_id(label):
+        i = index.get(label)
+        if i is None:
+            i = index[label] = len(labels)
+            labels.append(label); xs.append(NO_COORD); ys.append(NO_COORD)
+        return i
+
+    with open(filename, 'r') as f:
+        for record in iter_records(f):
+            kind = record[0]
+            if kind == "edges":
+                src.append(node_id(record[1])); dst.append(node_id(record[2])); w.append(record[3])
+            elif kind == "nodes":
+                i = node_id(record[1])
+                xs[i], ys[i] = record[2], record[3]
+            elif kind == "origin":
+                origin = record[1]
+            else:
+                destinations.append(record[1])
+
+    return CSRGraph.from_arrays(labels, xs, ys, src, dst, w, undirected), origin, destinations
@@ -0,0 +1,104 @@
+#--Headless rendering of search results to PNG/SVG--#
+# The base layer (every edge and node) is built once per graph. For PNG it is
+# rasterised once and each image only blits the path overlays on top, so a
+# batch job can write hundreds of result images without a display.
+#   renderer = PathRenderer(graph, title="A* routes")
+#   renderer.render({"2 -> 5": path_a, "2 -> 4": path_b}, "routes.png")
+import os
+from itertools import cycle
+
+PATH_COLORS = ("red", "purple", "green", "blue", "orange", "brown", "magenta", "teal", "olive", "navy")
+LABEL_LIMIT = 200   # node labels are only drawn on small maps
+
+def _matplotlib():
+    # Loaded on first render. The figure gets its own Agg canvas instead of going through
+    # pyplot, so the caller's backend (an interactive UCS.main window, say) is left alone.
+    import numpy as np
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import LineCollection
+    from matplotlib.image import imsave
+    return np, Figure, FigureCanvasAgg, LineCollection, imsave
+
+class PathRenderer:
+    def __init__(self, graph, title=None, node_color="skyblue", path_colors=PATH_COLORS, figsize=(10, 8), dpi=100):
+        self.np, Figure, FigureCanvasAgg, LineCollection, self.imsave = _matplotlib()
+        self.graph, self.path_colors = graph, path_colors
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        ax, xs, ys = self.ax, graph.xs, graph.ys
+
+        #--Base layer: one LineCollection for all edges, one scatter for all nodes--#
+        offsets, targets = graph.offsets, graph.targets
+        segments = [((xs[u], ys[u]), (xs[targets[e]], ys[targets[e]]))
+                    for u in range(graph.num_nodes) for e in range(offsets[u], offsets[u + 1])]
+        small = graph.num_nodes <= LABEL_LIMIT
+        ax.add_collection(LineCollection(segments, colors="black", linewidths=1.5 if small else 0.3,
+                                         alpha=1.0 if small else 0.4, zorder=1))
+        nodes = ax.scatter(list(xs), list(ys), s=300 if small else 2, c=node_color,
+                           edgecolors="black" if small else "none", zorder=5)
+        self.foreground = []   # redrawn over the blitted paths so small maps keep readable nodes
+        if small:
+            self.foreground = [nodes] + [ax.text(xs[i], ys[i], str(label), fontsize=8, fontweight="bold",
+                                                 ha="center", va="center", zorder=6)
+                                         for i, label in enumerate(graph.labels)]
+        ax.autoscale_view()
+        ax.grid(True, linestyle="--", alpha=0.5)
+        ax.set_xlabel("X Coordinate"); ax.set_ylabel("Y Coordinate")
+        if title: ax.set_title(title)
+
+        self.fig.canvas.draw()
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)   # rasterised base for PNG blits
+
+    #--Overlays--#
+    def _overlay(self, paths, explored):
+        xs, ys, index, ax = self.graph.xs, self.graph.ys, self.graph.index, self.ax
+        artists = []
+        if explored:
+            ids = [index[n] for n in explored if n in index]
+            small = self.graph.num_nodes <= LABEL_LIMIT
+            artists.append(ax.scatter([xs[i] for i in ids], [ys[i] for i in ids], s=300 if small else 4,
+                                      c="gold", edgecolors="black" if small else "none", zorder=5.5, label="explored"))
+        for (name, path), color in zip(paths.items(), cycle(self.path_colors)):
+            if not path: continue
+            ids = [index[n] for n in path]
+            line, = ax.plot([xs[i] for i in ids], [ys[i] for i in ids], color=color,
+                            linewidth=4, alpha=0.8, zorder=4, label=str(name))
+            artists.append(line)
+        return artists
+
+    def render(self, paths, filename, explored=None, title=None):
+        # paths: {name: label path} or a list of paths; format comes from the extension
+        if not isinstance(paths, dict):
+            paths = {f"path {i + 1}": p for i, p in enumerate(paths)}
+        artists = self._overlay(paths, explored)
+        legend = [self.ax.legend(loc="best", fontsize=8)] if len(artists) > 1 else []
+        if os.path.splitext(filename)[1].lower() == ".png" and title is None:
+            # Fast path: restore the cached base raster and draw only the overlays
+            canvas = self.fig.canvas
+            canvas.restore_region(self.background)
+            for artist in sorted(artists + self.foreground, key=lambda a: a.get_zorder()) + legend:
+                self.ax.draw_artist(artist)
+            self.imsave(filename, self.np.asarray(canvas.buffer_rgba()), pil_kwargs={"compress_level": 1})
+        else:
+            # SVG (or a per-file title): full redraw with the overlays attached
+            old_title = self.ax.get_title()
+            if title: self.ax.set_title(title)
+            self.fig.savefig(filename)
+            self.ax.set_title(old_title)
+        for artist in artists + legend:
+            artist.remove()
+
+    def close(self):
+        # No pyplot figure manager holds the figure: dropping the artists is enough
+        self.fig.clear()
+        self.background = None
+
+def render_paths(graph, paths, filename, explored=None, title=None, **options):
+    # One-off helper: build the base layer, draw every path, write the file
+    renderer = PathRenderer(graph, title=title, **options)
+    try:
+        renderer.render(paths, filename, explored)
+    finally:
+        renderer.close()
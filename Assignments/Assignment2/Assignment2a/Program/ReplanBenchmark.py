@@ -0,0 +1,111 @@
+#--Benchmark: LPA* replanning vs A* from scratch on random edge-cost update streams--#
+# For each random (start, goal) pair, a planner is built once. Then it receives
+# --updates batches of --batch arc changes. About --on-path of each batch hits
+# arcs of the current route, like congestion on the road being driven; the
+# rest is spread over the map. After every batch the replanned cost is checked
+# against a fresh A* on the same weights, and times and expansions are compared.
+# New costs stay between the original cost and --max-factor times it; reverting
+# an arc restores its original cost, so the Euclidean heuristic stays admissible.
+#   python ReplanBenchmark.py --generate road:2e4 --pairs 5 --updates 20 --batch 10
+import os
+import glob
+import time
+import random
+import argparse
+if __package__:
+    from .GraphCache import load_graph_cached
+    from .GraphGenerator import ensure_generated, KINDS
+    from .AStar import a_star_algorithm
+    from .LPAStar import LPAStar
+else:
+    from GraphCache import load_graph_cached
+    from GraphGenerator import ensure_generated, KINDS
+    from AStar import a_star_algorithm
+    from LPAStar import LPAStar
+
+def random_batch(planner, original, path, size, on_path, max_factor, rng):
+    # [(u, v, cost)] labels; route arcs with probability on_path, otherwise any arc
+    graph, labels = planner.graph, planner.graph.labels
+    changes = []
+    for _ in range(size):
+        if path and len(path) > 1 and rng.random() < on_path:
+            i = rng.randrange(len(path) - 1)
+            u, v = graph.index[path[i]], graph.index[path[i + 1]]
+        else:
+            e = rng.randrange(graph.num_edges)
+            u, v = planner.sources[e], graph.targets[e]
+        base = original[(u, v)]
+        cost = base if rng.random() < 0.3 else round(base * rng.uniform(1.0, max_factor), 3)
+        changes.append((labels[u], labels[v], cost))
+    return changes
+
+def run_pair(graph, start, goal, args, rng, totals):
+    planner = LPAStar(graph, start, goal)
+    t0 = time.perf_counter()
+    path, cost, explored = planner.search()
+    totals["initial_time"] += time.perf_counter() - t0
+    totals["initial_explored"] += explored
+    original = {}
+    for e in range(graph.num_edges):
+        key = (planner.sources[e], graph.targets[e])
+        original[key] = min(original.get(key, graph.weights[e]), graph.weights[e])
+
+    for _ in range(args.updates):
+        changes = random_batch(planner, original, path, args.batch, args.on_path, args.max_factor, rng)
+        t0 = time.perf_counter()
+        planner.update_edges(changes, symmetric=not args.directed)
+        path, cost, explored = planner.search()
+        totals["lpa_time"] += time.perf_counter() - t0
+        totals["lpa_explored"] += explored
+
+        t0 = time.perf_counter()
+        a_path, a_cost, a_explored = a_star_algorithm(planner.graph, start, goal)
+        totals["astar_time"] += time.perf_counter() - t0
+        totals["astar_explored"] += a_explored
+        totals["replans"] += 1
+        if (path is None) != (a_path is None) or abs(cost - a_cost) > 1e-6 * max(1.0, a_cost):
+            totals["mismatches"] += 1
+
+def benchmark(filename, args):
+    graph = load_graph_cached(filename, not args.directed)[0]
+    rng = random.Random(args.seed)
+    labels = graph.labels
+    totals = dict.fromkeys(("initial_time", "initial_explored", "lpa_time", "lpa_explored",
+                            "astar_time", "astar_explored", "replans", "mismatches"), 0)
+    for _ in range(args.pairs):
+        start, goal = labels[rng.randrange(len(labels))], labels[rng.randrange(len(labels))]
+        run_pair(graph, start, goal, args, rng, totals)
+
+    replans = max(1, totals["replans"])
+    print(f"\n{os.path.basename(filename)}: {graph.num_nodes} nodes, {graph.num_edges} arcs, "
+          f"{args.pairs} pairs x {args.updates} batches of {args.batch} changes ({args.on_path:.0%} on the route)")
+    print(f"  {'Search':<22} {'ms / search':>12} {'Explored / search':>18}")
+    print(f"  {'LPA* initial':<22} {1000 * totals['initial_time'] / max(1, args.pairs):>12.2f} "
+          f"{totals['initial_explored'] / max(1, args.pairs):>18.0f}")
+    print(f"  {'A* from scratch':<22} {1000 * totals['astar_time'] / replans:>12.2f} {totals['astar_explored'] / replans:>18.0f}")
+    print(f"  {'LPA* replan':<22} {1000 * totals['lpa_time'] / replans:>12.2f} {totals['lpa_explored'] / replans:>18.0f}")
+    speedup = totals["astar_time"] / totals["lpa_time"] if totals["lpa_time"] > 0 else float("inf")
+    print(f"  replanning speedup {speedup:.1f}x, {totals['mismatches']} cost mismatches in {totals['replans']} replans")
+
+def main():
+    parser = argparse.ArgumentParser(description="LPA* incremental replanning vs A* from scratch")
+    parser.add_argument("maps", nargs="*", help="map files or glob patterns")
+    parser.add_argument("--generate", nargs="*", default=[], metavar="KIND:N",
+                        help=f"generate maps first, KIND in {KINDS}, e.g. road:2e4")
+    parser.add_argument("--workdir", default="bench_maps", help="where generated maps are written")
+    parser.add_argument("--pairs", type=int, default=5, help="random (start, goal) pairs per map")
+    parser.add_argument("--updates", type=int, default=20, help="update batches per pair")
+    parser.add_argument("--batch", type=int, default=10, help="arc changes per batch")
+    parser.add_argument("--on-path", type=float, default=0.2, help="share of changes that hit the current route")
+    parser.add_argument("--max-factor", type=float, default=3.0, help="largest cost increase factor")
+    parser.add_argument("--seed", type=int, default=30019)
+    parser.add_argument("--directed", action="store_true", help="treat edges as one-way")
+    args = parser.parse_args()
+
+    maps = [m for pattern in args.maps for m in sorted(glob.glob(pattern))]
+    maps += [ensure_generated(spec, args.workdir, args.seed) for spec in args.generate]
+    for filename in maps:
+        benchmark(filename, args)
+
+if __name__ == "__main__":
+    main()
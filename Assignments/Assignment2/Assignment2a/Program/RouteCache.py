@@ -0,0 +1,165 @@
+#--Route result cache: in-process LRU in front of a shared SQLite file--#
+# Results are keyed by a SHA-256 of the graph content (the GraphCache byte
+# layout of its arrays and labels) plus the search name and its arguments, so
+# an edited map can never return an old route (in-place edits must bump graph.version,
+# as LPAStar.update_edges does). Worker processes each open the
+# same SQLite file (WAL mode) and see each other's results. The disk tier is
+# bounded by max_entries; the least recently used rows are evicted first.
+#   cache = RouteCache("routes.sqlite")
+#   cache.register_map("map.txt", graph)      # drops rows of the map's previous version
+#   path, cost, explored = cache.call(a_star_algorithm, graph, 2, 5)
+#   cache.stats() -> {"memory_hits": ..., "disk_hits": ..., "misses": ..., ...}
+# Results must survive a JSON round trip (lists come back as tuples at the top level).
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import weakref
+from collections import OrderedDict
+if __package__: from .GraphCache import encode_graph
+else: from GraphCache import encode_graph
+
+MEMORY_ENTRIES = 4096
+MAX_ENTRIES = 100_000
+EVICT_EVERY = 256   # inserts between disk size checks
+MISSING = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS routes (graph TEXT, query TEXT, result TEXT, used INTEGER, PRIMARY KEY (graph, query));
+CREATE INDEX IF NOT EXISTS routes_used ON routes (used);
+CREATE TABLE IF NOT EXISTS maps (filename TEXT PRIMARY KEY, graph TEXT);
+"""
+
+_digests = weakref.WeakKeyDictionary()   # graph -> (graph.version, digest); never keeps a map alive
+
+def graph_digest(graph):
+    # graph: CSRGraph; hex SHA-256 of its arrays and labels. Recomputed whenever
+    # graph.version moves, so a map edited in place gets a new digest.
+    version, digest = _digests.get(graph, (None, None))
+    if version != graph.version:
+        sha = hashlib.sha256()
+        for chunk in encode_graph(graph, None, []):
+            sha.update(chunk)
+        version, digest = graph.version, sha.hexdigest()
+        _digests[graph] = (version, digest)
+    return digest
+
+def query_key(search, args, params):
+    # Module without the package prefix: script and package runs share one cache
+    name = f"{search.__module__.rpartition('.')[2]}.{search.__qualname__}"
+    return json.dumps([name, list(args), sorted(params.items())], separators=(",", ":"), default=str)
+
+class RouteCache:
+    def __init__(self, path, max_entries=MAX_ENTRIES, memory_entries=MEMORY_ENTRIES):
+        self.path, self.max_entries, self.memory_entries = path, max_entries, memory_entries
+        self.memory = OrderedDict()   # (graph digest, query) -> result, most recent last
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self._db, self._pid, self._inserts = None, None, 0
+
+    #--SQLite connection (one per process: connections must not cross a fork)--#
+    @property
+    def db(self):
+        if self.path is None: return None
+        if self._db is None or self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+            self._pid = os.getpid()
+        return self._db
+
+    def close(self):
+        if self._db is not None and self._pid == os.getpid():
+            self._db.close()
+        self._db = None
+
+    #--Lookups--#
+    def get(self, graph, query, default=None):
+        # Cached result or default; query is a query_key() string
+        key = (graph_digest(graph), query)
+        result = self.memory.get(key, MISSING)
+        if result is not MISSING:
+            self.memory.move_to_end(key)
+            self.counters["memory_hits"] += 1
+            return result
+        db = self.db
+        row = db.execute("SELECT result FROM routes WHERE graph = ? AND query = ?", key).fetchone() if db else None
+        if row is None:
+            self.counters["misses"] += 1
+            return default
+        db.execute("UPDATE routes SET used = ? WHERE graph = ? AND query = ?", (time.time_ns(), *key))
+        result = self._remember(key, json.loads(row[0]))
+        self.counters["disk_hits"] += 1
+        return result
+
+    def put(self, graph, query, result):
+        key = (graph_digest(graph), query)
+        blob = json.dumps(result, separators=(",", ":"))
+        result = self._remember(key, json.loads(blob))   # same shape a later hit would return
+        db = self.db
+        if db is not None:
+            db.execute("INSERT OR REPLACE INTO routes VALUES (?, ?, ?, ?)", (*key, blob, time.time_ns()))
+            self._inserts += 1
+            if self._inserts % EVICT_EVERY == 0: self.evict()
+        return result
+
+    def call(self, search, graph, *args, **params):
+        # search(graph, *args, **params), answered from the cache when possible
+        query = query_key(search, args, params)
+        result = self.get(graph, query, MISSING)
+        if result is MISSING:
+            result = self.put(graph, query, search(graph, *args, **params))
+        return result
+
+    def _remember(self, key, result):
+        if isinstance(result, list): result = tuple(result)
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+        return result
+
+    #--Eviction and invalidation--#
+    def evict(self):
+        # Trim the disk tier back to max_entries, least recently used first
+        db = self.db
+        if db is None: return 0
+        excess = db.execute("SELECT COUNT(*) FROM routes").fetchone()[0] - self.max_entries
+        if excess <= 0: return 0
+        db.execute("DELETE FROM routes WHERE rowid IN (SELECT rowid FROM routes ORDER BY used LIMIT ?)", (excess,))
+        self.counters["evictions"] += excess
+        return excess
+
+    def register_map(self, filename, graph):
+        # Remember which graph filename currently holds; if the file changed since
+        # the last run, drop the rows of the old version (unless another file still uses it)
+        digest, filename = graph_digest(graph), os.path.abspath(filename)
+        db = self.db
+        if db is None: return 0
+        row = db.execute("SELECT graph FROM maps WHERE filename = ?", (filename,)).fetchone()
+        db.execute("INSERT OR REPLACE INTO maps VALUES (?, ?)", (filename, digest))
+        if row is None or row[0] == digest: return 0
+        if db.execute("SELECT 1 FROM maps WHERE graph = ?", (row[0],)).fetchone(): return 0
+        return self.invalidate(row[0])
+
+    def invalidate(self, digest):
+        # Drop every cached result for one graph digest (see graph_digest)
+        for key in [key for key in self.memory if key[0] == digest]:
+            del self.memory[key]
+        db = self.db
+        removed = db.execute("DELETE FROM routes WHERE graph = ?", (digest,)).rowcount if db else 0
+        self.counters["invalidations"] += removed
+        return removed
+
+    def clear(self):
+        self.memory.clear()
+        if self.db is not None: self.db.execute("DELETE FROM routes")
+
+    def stats(self):
+        stats = dict(self.counters)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 4) if lookups else 0.0
+        stats["memory_entries"] = len(self.memory)
+        stats["disk_entries"] = self.db.execute("SELECT COUNT(*) FROM routes").fetchone()[0] if self.db else 0
+        return stats
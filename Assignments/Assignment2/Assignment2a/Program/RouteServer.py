@@ -0,0 +1,226 @@
+#--Route query server: resident graphs, a process pool and request coalescing--#
+# One JSON object per line in each direction, over a Unix socket or localhost TCP:
+#   {"id": 7, "map": "PathFinder-test1.txt", "origin": 2, "destination": 5, "algorithm": "astar", "timeout": 2}
+#   -> {"id": 7, "origin": 2, "destination": 5, "algorithm": "astar", "path": [2, 3, 5], "cost": 10.0, ...}
+#   {"op": "stats"} -> {"qps": ..., "p50_ms": ..., "p99_ms": ..., "queue_depth": ..., ...}
+# Replies on one connection come back as they finish, so clients match them by "id".
+# A map is parsed once (GraphCache) and placed in shared memory like BatchQuery;
+# workers attach to it the first time they see it. Identical queries that are
+# already running share one search. Backpressure: each connection has at most
+# PIPELINE requests in flight (the server stops reading until one finishes),
+# and once max_queue searches wait for a worker new ones get {"error": "overloaded"}.
+#   python RouteServer.py --unix /tmp/routes.sock --preload PathFinder-test1.txt
+#   python RouteServer.py --port 8765 --workers 4 --timeout 5
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+if __package__:
+    from .GraphCache import load_graph_cached
+    from .BatchQuery import ALGORITHMS, run_query, share_graph, attach_graph
+else:
+    from GraphCache import load_graph_cached
+    from BatchQuery import ALGORITHMS, run_query, share_graph, attach_graph
+
+PIPELINE = 64            # requests in flight per connection
+LATENCY_SAMPLES = 10_000  # recent latencies kept for p50 / p99
+WINDOW = 10.0            # seconds of completions behind the QPS figure
+
+#--1. Worker side--#
+_graphs = {}   # shared-memory name -> (block, graph), kept for the worker's lifetime
+
+def _worker_query(name, origin, destination, algorithm):
+    if name not in _graphs: _graphs[name] = attach_graph(name)
+    return run_query(_graphs[name][1], origin, destination, algorithm)
+
+def endpoint(value):
+    # JSON has no tuples: [x, y] is a coordinate to snap, anything else a label
+    return tuple(value) if isinstance(value, list) else value
+
+#--2. Server--#
+class RouteServer:
+    def __init__(self, workers=None, max_queue=1024, timeout=10.0, undirected=True):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue, self.timeout, self.undirected = max_queue, timeout, undirected
+        self.pool = ProcessPoolExecutor(self.workers)
+        self.slots = None          # asyncio.Semaphore: searches handed to the pool at once
+        self.maps = {}             # absolute filename -> asyncio.Future of (graph, shared block)
+        self.inflight = {}         # (map, origin, destination, algorithm) -> asyncio.Future of the result
+        self.waiting = 0           # searches waiting for a worker slot (the queue depth)
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.completed_at = deque()
+        self.counters = dict.fromkeys(("requests", "completed", "coalesced", "timeouts", "rejected", "errors"), 0)
+        self.started = time.perf_counter()
+
+    #--Maps--#
+    async def load_map(self, filename):
+        # Parse and share a map once; concurrent first requests for it wait on the same load
+        filename = os.path.abspath(filename)
+        if filename not in self.maps:
+            loop = asyncio.get_running_loop()
+            self.maps[filename] = loop.run_in_executor(None, self._load, filename)
+        try:
+            return await self.maps[filename]
+        except Exception:
+            self.maps.pop(filename, None)   # let a later request retry (e.g. the file appears)
+            raise
+
+    def _load(self, filename):
+        graph = load_graph_cached(filename, undirected=self.undirected)[0]
+        return graph, share_graph(graph, self.undirected)
+
+    #--Queries--#
+    async def query(self, request):
+        started = time.perf_counter()
+        self.counters["requests"] += 1
+        algorithm = str(request.get("algorithm", "astar")).lower()
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {sorted(ALGORITHMS)}")
+        key = (os.path.abspath(request["map"]), endpoint(request["origin"]), endpoint(request["destination"]), algorithm)
+        future = self.inflight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+        else:
+            if self.waiting >= self.max_queue:
+                self.counters["rejected"] += 1
+                return {"error": "overloaded"}
+            self.waiting += 1   # until _search gets a worker slot
+            future = asyncio.ensure_future(self._search(key))
+            self.inflight[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        try:
+            # shield: a timed-out caller gives up, the search still finishes for the others
+            result = await asyncio.wait_for(asyncio.shield(future), request.get("timeout", self.timeout))
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            return {"error": "timeout"}
+        now = time.perf_counter()
+        self.latencies.append(now - started)
+        self.completed_at.append(now)
+        self.counters["completed"] += 1
+        return dict(result)
+
+    async def _search(self, key):
+        filename, origin, destination, algorithm = key
+        try:
+            shm = (await self.load_map(filename))[1]
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, _worker_query, shm.name, origin, destination, algorithm)
+        finally:
+            self.slots.release()
+
+    def _finished(self, key, future):
+        self.inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is not None:
+            self.counters["errors"] += 1   # also marks the exception as retrieved if every caller timed out
+
+    def stats(self):
+        now = time.perf_counter()
+        while self.completed_at and self.completed_at[0] < now - WINDOW:
+            self.completed_at.popleft()
+        latencies = sorted(self.latencies)
+        percentile = lambda q: round(1000 * latencies[min(len(latencies) - 1, int(q * len(latencies)))], 3) \
+            if latencies else 0.0
+        return {"qps": round(len(self.completed_at) / max(1e-9, min(WINDOW, now - self.started)), 1),
+                "p50_ms": percentile(0.50), "p99_ms": percentile(0.99),
+                "queue_depth": self.waiting, "in_flight": len(self.inflight), "workers": self.workers,
+                "maps": len(self.maps), "uptime_s": round(now - self.started, 1), **self.counters}
+
+    #--Connections--#
+    async def handle(self, reader, writer):
+        lock = asyncio.Lock()
+        pending = set()
+
+        async def respond(line):
+            request = {}
+            try:
+                parsed = json.loads(line)
+                if not isinstance(parsed, dict): raise ValueError("a request must be a JSON object")
+                request = parsed
+                if request.get("op") == "stats": reply = self.stats()
+                else: reply = await self.query(request)
+            except Exception as e:
+                reply = {"error": f"{type(e).__name__}: {e}"}
+            if "id" in request: reply = {"id": request["id"], **reply}
+            async with lock:
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if len(pending) >= PIPELINE:
+                    await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                task = asyncio.create_task(respond(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending: await asyncio.wait(pending)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass   # the client already went away
+
+    async def serve(self, unix=None, host="127.0.0.1", port=8765, preload=()):
+        self.slots = asyncio.Semaphore(2 * self.workers)   # one queued task per worker keeps the pool busy
+        for filename in preload:
+            await self.load_map(filename)
+        if unix:
+            server = await asyncio.start_unix_server(self.handle, path=unix)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        try:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass   # Windows event loops: Ctrl+C arrives as KeyboardInterrupt instead, see main()
+        print(f"listening on {unix or f'{host}:{port}'} with {self.workers} workers", file=sys.stderr)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            # Also runs when asyncio.run cancels this task on KeyboardInterrupt
+            if unix and os.path.exists(unix): os.unlink(unix)
+            self.close()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        for future in self.maps.values():
+            if future.done() and not future.exception():
+                shm = future.result()[1]
+                shm.close(); shm.unlink()
+        self.maps.clear()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve route queries over a Unix socket or localhost TCP")
+    parser.add_argument("--unix", metavar="PATH", help="Unix socket path (default: TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="search processes (default: all cores)")
+    parser.add_argument("--max-queue", type=int, default=1024, help="searches allowed to wait for a worker")
+    parser.add_argument("--timeout", type=float, default=10.0, help="default per-request timeout in seconds")
+    parser.add_argument("--preload", nargs="*", default=[], help="maps to load before accepting connections")
+    parser.add_argument("--directed", action="store_true", help="treat edges as one-way")
+    args = parser.parse_args(argv)
+    if args.unix and os.path.exists(args.unix): os.unlink(args.unix)
+    server = RouteServer(args.workers, args.max_queue, args.timeout, not args.directed)
+    try:
+        asyncio.run(server.serve(args.unix, args.host, args.port, args.preload))
+    except KeyboardInterrupt:
+        pass   # no signal handlers on this platform: serve() has already cleaned up
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#--Simplified memory-bounded A* (SMA*): A* that never holds more than max_nodes search nodes--#
+# The search tree lives in fixed slots (max_nodes of them). When a new child
+# needs a slot and none is free, the worst leaf (highest f, shallowest) is
+# dropped and its f is kept in its parent's 'forgotten' value. That parent goes
+# back on the open list and regenerates the child if the forgotten f becomes
+# the best again. Expanded nodes back up the min f of their children, so f only
+# grows toward the true cost. The path is returned like A*'s:
+#   path, cost, explored = sma_star_algorithm(graph, 2, 5, max_nodes=10_000)
+#   path, cost, explored = a_star_algorithm(graph, 2, 5, max_nodes=10_000)   # same search
+# The result is optimal whenever the optimal path (as a tree branch: hops + 1 nodes)
+# fits in max_nodes. With a tighter budget it may be a longer path, or None.
+# Besides the slots, one best-g per graph node prunes strictly worse duplicate paths.
+import sys
+import heapq
+from array import array
+from itertools import count
+if __package__:
+    from .Frontier import INF
+    from .GraphCache import load_graph_cached
+    from .Heuristics import goal_table, min_table
+    from .Landmarks import landmark_table
+    from .SpatialIndex import snap, snap_goals
+    from .Metrics import SearchMetrics
+else:
+    from Frontier import INF
+    from GraphCache import load_graph_cached
+    from Heuristics import goal_table, min_table
+    from Landmarks import landmark_table
+    from SpatialIndex import snap, snap_goals
+    from Metrics import SearchMetrics
+
+MAX_NODES = 1 << 20
+COMPACT = 4   # rebuild a lazy heap when it holds this many times max_nodes entries
+
+def sma_star_algorithm(graph, start, goal, max_nodes=MAX_NODES, metric="euclidean", metrics=None, landmarks=None):
+    # max_nodes: search-tree nodes kept at once (>= 2); metrics: optional Metrics.SearchMetrics,
+    # peak_memory is the most slots in use and reopenings counts nodes expanded again after a drop
+    # landmarks: Landmarks.Landmarks for this graph; replaces the metric with ALT lower bounds, as in A*
+    if max_nodes < 2: raise ValueError(f"SMA* needs max_nodes >= 2, got {max_nodes}")
+    if metrics is not None: metrics.begin("SMA*", graph)
+    start, goals = snap(graph, start), snap_goals(graph, goal)
+    if start not in graph or not goals:
+        if metrics is not None: metrics.finish(None, 0, 0, 0)
+        return None, 0, 0
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    start = graph.index[start]
+    # goal may be a list/set, as in a_star_algorithm
+    if landmarks is not None: h = min_table([landmark_table(landmarks, g) for g in goals])
+    else: h = goal_table(graph, goals, metric)
+    is_goal = bytearray(graph.num_nodes)
+    for node in goals: is_goal[node] = 1
+    best_g = array('d', [INF]) * graph.num_nodes
+
+    #--Slots: one search-tree node each, allocated in doubling blocks up to max_nodes--#
+    M = max_nodes
+    state, parent, depth = array('i'), array('i'), array('i')
+    g, f = array('d'), array('d')
+    forgot = array('d')        # min f of dropped children
+    dropped = []               # slot -> {child state: (f, g)} of children dropped from memory
+    version = array('i')       # bumped when a slot is freed, invalidates heap entries
+    expanded = bytearray()
+    children = []              # slot -> {child state: child slot}
+    free = []
+
+    def grow():
+        old = len(state)
+        extra = min(max(old, 1024), M - old)
+        for column, value in ((state, 0), (parent, -1), (depth, 0), (g, 0.0), (f, 0.0), (forgot, INF), (version, 0)):
+            column.extend(array(column.typecode, [value]) * extra)
+        expanded.extend(bytes(extra))
+        children.extend([None] * extra)
+        dropped.extend([None] * extra)
+        free.extend(range(old + extra - 1, old - 1, -1))
+    tick = count()
+    # open: (key, -depth, tick, slot, version), best first; leaves: (-f, depth, ...), worst first.
+    # Both are lazy: an entry is only valid while it still describes its slot.
+    open_list, leaves = [], []
+    open_pushes = 0   # heap_pushes: the open list only, like the other searches' frontiers
+
+    def open_key(s):
+        # Unexpanded nodes compete with their own f, expanded ones with their forgotten children
+        return forgot[s] if expanded[s] else f[s]
+
+    def push(s):
+        nonlocal open_pushes
+        if open_key(s) < INF:
+            heapq.heappush(open_list, (open_key(s), -depth[s], next(tick), s, version[s]))
+            open_pushes += 1
+        if not children[s]: heapq.heappush(leaves, (-f[s], depth[s], next(tick), s, version[s]))
+
+    def worst_leaf(pinned):
+        # Highest-f, shallowest leaf other than the root and the node being expanded (-1 if none)
+        while leaves:
+            negf, _, _, s, v = leaves[0]
+            if v == version[s] and not children[s] and -negf == f[s] and s != root and s != pinned:
+                return s
+            heapq.heappop(leaves)
+        return -1
+
+    def on_branch(s, u):
+        # Is state u on the tree branch from the root down to slot s?
+        while s != -1:
+            if state[s] == u: return True
+            s = parent[s]
+        return False
+
+    def forget(p, s, child_f, child_g):
+        # Remember a child that does not fit; dead ends (f = INF) are simply never regenerated
+        if child_f == INF: return
+        if dropped[p] is None: dropped[p] = {}
+        dropped[p][s] = (child_f, child_g)
+        if forgot[p] > child_f: forgot[p] = child_f
+
+    def drop(s):
+        p = parent[s]
+        del children[p][state[s]]
+        forget(p, state[s], f[s], g[s])
+        version[s] += 1
+        expanded[s], children[s], dropped[s], forgot[s] = 0, None, None, INF
+        free.append(s)
+        push(p)
+
+    def compact():
+        for heap, valid in ((open_list, lambda e: e[4] == version[e[3]] and e[0] == open_key(e[3]) < INF),
+                            (leaves, lambda e: e[4] == version[e[3]] and not children[e[3]])):
+            heap[:] = [e for e in heap if valid(e)]
+            heapq.heapify(heap)
+
+    grow()
+    root = free.pop()
+    state[root], g[root], f[root] = start, 0.0, h[start]
+    best_g[start] = 0.0
+    push(root)
+    used = peak = 1
+    nodes_explored = generated = regenerated = 0
+    if metrics is not None: metrics.phase("setup")
+
+    while open_list:
+        key, _, _, b, v = heapq.heappop(open_list)
+        if v != version[b] or key != open_key(b): continue
+        nodes_explored += 1
+        if metrics is not None: metrics.expand(state[b], g[b], used)
+
+        if is_goal[state[b]]:
+            if metrics is not None: metrics.phase("search")
+            ids, s = [], b
+            while s != -1:
+                ids.append(state[s]); s = parent[s]
+            path = graph.path_labels(ids[::-1])
+            if metrics is not None:
+                metrics.finish(path, g[b], nodes_explored, generated, reopenings=regenerated,
+                               peak_memory=peak, heap_pushes=open_pushes)
+            return path, g[b], nodes_explored
+
+        #--Expand b: generate its children, or on a re-expansion regenerate the dropped ones--#
+        if expanded[b]:
+            regenerated += 1
+            successors = [(s, child_g, child_f) for s, (child_f, child_g) in dropped[b].items()
+                          if child_g <= best_g[s]]   # keep the backed-up f they were dropped with
+        else:
+            u = state[b]
+            last = depth[b] + 2 >= M   # a child here fills the budget, so only the goal is worth keeping
+            cheapest = {}              # parallel arcs: only the cheapest one to each state makes a child
+            for e in range(offsets[u], offsets[u + 1]):
+                if weights[e] < cheapest.get(targets[e], INF): cheapest[targets[e]] = weights[e]
+            successors = []
+            for s, w in cheapest.items():
+                new_g = g[b] + w
+                if new_g > best_g[s] or (last and not is_goal[s]): continue
+                if new_g == best_g[s] and on_branch(b, s): continue   # back up a zero-cost cycle
+                best_g[s] = new_g
+                successors.append((s, new_g, max(f[b], new_g + h[s])))   # pathmax: f never decreases down a branch
+        expanded[b], dropped[b], forgot[b] = 1, None, INF
+        if children[b] is None: children[b] = {}
+        kids = children[b]
+        for s, new_g, child_f in successors:
+            if s in kids: continue
+            if not free and len(state) < M: grow()
+            if not free:
+                w = worst_leaf(b)
+                if w == -1 or (child_f, -depth[b] - 1) > (f[w], -depth[w]):
+                    forget(b, s, child_f, new_g)   # the child itself is the worst leaf
+                    continue
+                drop(w); used -= 1
+            c = free.pop()
+            state[c], parent[c], depth[c], g[c], f[c] = s, b, depth[b] + 1, new_g, child_f
+            kids[s] = c
+            push(c)
+            generated += 1; used += 1
+            if used > peak: peak = used
+
+        #--Back up: a node's f is the best f below it--#
+        s = b
+        while s != -1:
+            best = forgot[s]
+            for c in children[s].values():
+                if f[c] < best: best = f[c]
+            if s != b and best == f[s]: break
+            f[s] = best
+            s = parent[s]
+        push(b)
+        if len(open_list) + len(leaves) > COMPACT * M: compact()
+
+    if metrics is not None:
+        metrics.finish(None, 0, nodes_explored, generated, reopenings=regenerated, peak_memory=peak,
+                       heap_pushes=open_pushes)
+    return None, 0, nodes_explored
+
+def main():
+    # python SMAStar.py [map] [max_nodes ...]
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'PathFinder-test1.txt'
+    budgets = [int(float(b)) for b in sys.argv[2:]] or [4, 8, MAX_NODES]
+    graph, origin, destinations = load_graph_cached(filename, undirected=True)
+    for dest in destinations:
+        for budget in budgets:
+            metrics = SearchMetrics()
+            path, cost, explored = sma_star_algorithm(graph, origin, dest, max_nodes=budget, metrics=metrics)
+            print("\n" + metrics.table(f"SMA* ({budget} nodes)"))
+            print(f"{origin} -> {dest}: {' -> '.join(map(str, path)) if path else 'no path within the budget'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#--Batch entry point: one algorithm over many PathFinder map files, JSON lines out--#
+# Each map runs its origin to every destination listed in the file. Files are
+# spread over a process pool and every (file, destination) result is written as
+# one JSON line (path, cost, nodes_explored and the SearchMetrics dict) as soon
+# as its file finishes, so large runs stream instead of waiting for the slowest map.
+# Edges are read the way the method's own script reads them (IDA* and beam
+# directed, the rest undirected) unless --directed / --undirected says otherwise.
+#   ./search PathFinder-test1.txt astar             # search / search.bat wrap this script
+#   python SearchCLI.py . bfs                       # every *.txt map in a directory
+#   python SearchCLI.py "maps/*.txt" ucs --workers 8 > results.jsonl
+# A map that fails to load or search gives one {"file", "error"} line; the exit status is then 1.
+import os
+import sys
+import json
+import glob
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+if __package__:
+    from .GraphCache import load_graph_cached
+    from .BatchQuery import ALGORITHMS, run_query
+else:
+    from GraphCache import load_graph_cached
+    from BatchQuery import ALGORITHMS, run_query
+
+DIRECTED = {"idastar", "beam"}   # IDAStar.py and CustomSearch.py load their maps one-way
+
+def expand_maps(patterns):
+    # Files, directories (their *.txt maps) and glob patterns -> sorted, deduplicated paths
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found += glob.glob(os.path.join(pattern, "*.txt"))
+        elif os.path.exists(pattern):
+            found.append(pattern)
+        else:
+            found += glob.glob(pattern)
+    return sorted(set(found))
+
+def search_file(filename, algorithm, undirected=None, metrics=True):
+    # Results for every destination of one map, as run_query dicts tagged with the file.
+    # undirected=None: as the method's own script reads the map
+    if undirected is None: undirected = algorithm not in DIRECTED
+    try:
+        graph, origin, destinations = load_graph_cached(filename, undirected=undirected)
+        if origin is None or not destinations:
+            raise ValueError("no Origin or Destinations section")
+        return [{"file": filename, **run_query(graph, origin, dest, algorithm, metrics=metrics)}
+                for dest in destinations]
+    except Exception as e:
+        return [{"file": filename, "algorithm": algorithm, "error": f"{type(e).__name__}: {e}"}]
+
+def run_files(files, algorithm, workers=None, undirected=None, metrics=True, ordered=False):
+    # Yields result dicts file by file: as each file completes, or in file order with ordered=True
+    workers = min(workers or os.cpu_count() or 1, len(files)) or 1
+    if workers == 1:
+        for filename in files:
+            yield from search_file(filename, algorithm, undirected, metrics)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Biggest maps are submitted first so one large file does not start last and finish alone
+        submit = files if ordered else sorted(files, key=os.path.getsize, reverse=True)
+        futures = [pool.submit(search_file, filename, algorithm, undirected, metrics) for filename in submit]
+        for future in (futures if ordered else as_completed(futures)):
+            yield from future.result()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run one search method over many PathFinder maps (JSON lines)")
+    parser.add_argument("maps", nargs="+", help="map files, directories or glob patterns")
+    parser.add_argument("method", type=str.lower, choices=sorted(ALGORITHMS), help="search method")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    direction = parser.add_mutually_exclusive_group()
+    direction.add_argument("--directed", dest="undirected", action="store_false", default=None,
+                           help="treat edges as one-way (default: as the method's own script does)")
+    direction.add_argument("--undirected", dest="undirected", action="store_true", help="treat edges as two-way")
+    parser.add_argument("--ordered", action="store_true", help="write files in name order instead of as they finish")
+    parser.add_argument("--no-metrics", action="store_true", help="leave the metrics object out")
+    args = parser.parse_args(argv)
+
+    files = expand_maps(args.maps)
+    if not files: parser.error(f"no map files match {args.maps}")
+    failed = False
+    for result in run_files(files, args.method, args.workers, args.undirected, not args.no_metrics, args.ordered):
+        failed |= "error" in result
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
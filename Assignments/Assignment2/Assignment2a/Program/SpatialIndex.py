@@ -0,0 +1,157 @@
+#--KD-tree over node coordinates: snap (x, y) points to graph nodes--#
+# Built once per graph from its xs/ys arrays (nodes without coordinates are
+# left out). The tree is implicit: node ids are permuted so that every
+# subrange [lo, hi) is split at its median on the wider axis, and ranges of
+# at most LEAF nodes are scanned directly. Queries are O(log n) on average.
+# Every search entry point passes its start/goal through snap(), so an (x, y)
+# tuple can be given wherever a node label is expected:
+#   path, cost, explored = ucs_algorithm(graph, (3.2, 4.9), [(7.5, 1.0)])
+#   tree = spatial_index(graph); tree.k_nearest(3.2, 4.9, 5) -> [(id, distance), ...]
+# Distances are Euclidean in the map's coordinate units (degrees on lat/lon maps).
+import sys
+import math
+import heapq
+import argparse
+from array import array
+from functools import partial
+if __package__:
+    from .Frontier import INF
+    from .Heuristics import TableCache
+else:
+    from Frontier import INF
+    from Heuristics import TableCache
+
+LEAF = 8        # ranges this small are scanned instead of split
+NO_NODE = -1
+
+class KDTree:
+    __slots__ = ("ids", "px", "py", "axis")
+
+    def __init__(self, xs, ys):
+        ids = [i for i in range(len(xs)) if xs[i] == xs[i] and ys[i] == ys[i]]
+        axis = bytearray(len(ids))
+        stack = [(0, len(ids))]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= LEAF: continue
+            part = ids[lo:hi]
+            span_x = max(xs[i] for i in part) - min(xs[i] for i in part)
+            span_y = max(ys[i] for i in part) - min(ys[i] for i in part)
+            a = 0 if span_x >= span_y else 1
+            part.sort(key=(xs if a == 0 else ys).__getitem__)
+            ids[lo:hi] = part
+            mid = (lo + hi) // 2
+            axis[mid] = a
+            stack.append((lo, mid)); stack.append((mid + 1, hi))
+        self.ids = array('i', ids)
+        self.px = array('d', (xs[i] for i in ids))   # coordinates in tree order
+        self.py = array('d', (ys[i] for i in ids))
+        self.axis = axis
+
+    def __len__(self):
+        return len(self.ids)
+
+    def nbytes(self):
+        return sum(len(a) * a.itemsize for a in (self.ids, self.px, self.py)) + len(self.axis)
+
+    def _query(self, x, y, k, r2):
+        # The k closest points with squared distance <= r2, as (d2, position) ascending
+        px, py, axis = self.px, self.py, self.axis
+        best = []          # max-heap of (-d2, -position): the worst kept point on top
+        limit = r2
+        stack = [(0, len(px), 0.0)]   # (lo, hi, squared distance from (x, y) to the range's cell)
+        while stack:
+            lo, hi, bound = stack.pop()
+            if bound > limit: continue
+            if hi - lo > LEAF:
+                mid = (lo + hi) // 2
+                diff = x - px[mid] if axis[mid] == 0 else y - py[mid]
+                near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+                stack.append((far[0], far[1], max(bound, diff * diff)))
+                stack.append((near[0], near[1], bound))
+                lo, hi = mid, mid + 1   # the split point itself
+            for i in range(lo, hi):
+                dx, dy = px[i] - x, py[i] - y
+                d2 = dx * dx + dy * dy
+                if d2 > limit: continue
+                if len(best) < k:
+                    heapq.heappush(best, (-d2, -i))
+                elif (d2, i) < (-best[0][0], -best[0][1]):
+                    heapq.heapreplace(best, (-d2, -i))
+                else:
+                    continue
+                if len(best) == k: limit = min(r2, -best[0][0])
+        return sorted((-d2, -i) for d2, i in best)
+
+    def _result(self, found):
+        ids = self.ids
+        return [(ids[i], math.sqrt(d2)) for d2, i in found]
+
+    #--Single point--#
+    def nearest(self, x, y):
+        # (node id, distance), or (NO_NODE, INF) if no node has coordinates
+        found = self._query(x, y, 1, INF)
+        return self._result(found)[0] if found else (NO_NODE, INF)
+
+    def k_nearest(self, x, y, k):
+        return self._result(self._query(x, y, k, INF)) if k > 0 else []
+
+    def within(self, x, y, radius):
+        # Every node at distance <= radius, nearest first
+        return self._result(self._query(x, y, len(self.px), radius * radius))
+
+    #--Batches: one result per (x, y) point--#
+    def nearest_many(self, points):
+        return [self.nearest(x, y) for x, y in points]
+
+    def k_nearest_many(self, points, k):
+        return [self.k_nearest(x, y, k) for x, y in points]
+
+    def within_many(self, points, radius):
+        return [self.within(x, y, radius) for x, y in points]
+
+#--Graph helpers--#
+@partial(TableCache, size=KDTree.nbytes)
+def spatial_index(graph):
+    # graph: CSRGraph (cached by identity and held weakly, like heuristic_table)
+    return KDTree(graph.xs, graph.ys)
+
+def snap(graph, node):
+    # An (x, y) tuple becomes the label of the nearest node; labels pass through unchanged
+    if type(node) is not tuple: return node
+    u = spatial_index(graph).nearest(float(node[0]), float(node[1]))[0]
+    return graph.labels[u] if u != NO_NODE else None
+
+def snap_all(graph, nodes):
+    return [snap(graph, node) for node in nodes]
+
+def snap_goals(graph, goal):
+    # One goal (label or (x, y)) or a list/set of them -> sorted CSR ids of those in the graph
+    goals = goal if isinstance(goal, (list, set, frozenset)) else [goal]
+    return tuple(sorted({graph.index[g] for g in snap_all(graph, goals) if g in graph}))
+
+def clear_spatial_cache():
+    spatial_index.cache_clear()
+
+#--CLI: nearest nodes to a point--#
+def main():
+    if __package__: from .GraphCache import load_graph_cached
+    else: from GraphCache import load_graph_cached
+    parser = argparse.ArgumentParser(description="Nearest PathFinder nodes to a coordinate")
+    parser.add_argument("map")
+    parser.add_argument("x", type=float)
+    parser.add_argument("y", type=float)
+    parser.add_argument("--k", type=int, default=1, help="number of nearest nodes")
+    parser.add_argument("--radius", type=float, help="list every node within this distance instead")
+    args = parser.parse_args()
+
+    graph = load_graph_cached(args.map)[0]
+    tree = spatial_index(graph)
+    found = tree.within(args.x, args.y, args.radius) if args.radius is not None else tree.k_nearest(args.x, args.y, args.k)
+    for u, distance in found:
+        print(f"{graph.labels[u]}\t{graph.xs[u]:g},{graph.ys[u]:g}\t{distance:.6g}")
+    if not found:
+        print("no node found", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,105 +1,194 @@
 #--Import critical libraries--#
-import os
 import heapq
-import networkx as nx
-import matplotlib.pyplot as plt
-
-#--Data Parsing (File Reading)--#
-def load_data():
-    nodes_pos = {} 
-    edges = [] 
-    start_node = None
-    goal_nodes = []
-    
-    # Hãy đảm bảo file 'PathFinder-test1.txt' tồn tại
-    with open('PathFinder-test1.txt', 'r') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-
-    mode = ""
-    for i, line in enumerate(lines):
-        if "Nodes" in line: mode = "nodes"
-        elif "Edges" in line: mode = "edges"
-        elif "Origin:" in line: start_node = int(lines[i+1])
-        elif "Destinations:" in line:
-            goal_nodes = [int(x.strip()) for x in lines[i+1].split(';') if x.strip()]
-        else:
-            if mode == "nodes" and ":" in line:
-                node_id = int(line.split(':')[0])
-                coords = tuple(map(int, line.split('(')[1].split(')')[0].split(',')))
-                nodes_pos[node_id] = coords
-            elif mode == "edges" and ":" in line:
-                edge_part = line.split(':')[0][1:-1] 
-                u, v = map(int, edge_part.split(','))
-                weight = int(line.split(':')[1].strip()) 
-                edges.append((u, v, weight))
-                
-    return nodes_pos, edges, start_node, goal_nodes
+from array import array
+if __package__:
+    from .Graph import new_parents, trace_path
+    from .Frontier import IndexedHeap, INF
+    from .GraphCache import load_graph_cached
+    from .SpatialIndex import snap, snap_all
+    from .Metrics import SearchMetrics
+else:
+    from Graph import new_parents, trace_path
+    from Frontier import IndexedHeap, INF
+    from GraphCache import load_graph_cached
+    from SpatialIndex import snap, snap_all
+    from Metrics import SearchMetrics
 
 #--Uniform Cost Search (UCS) Implementation with Metrics--#
-def ucs_algorithm(graph, start, goals):
-    frontier = [(0, start, [start])]
-    visited = {} 
-    nodes_explored_count = 0 
+def ucs_algorithm(graph, start, goals, frontier_type=IndexedHeap, metrics=None):
+    # frontier_type: IndexedHeap (one entry per node, decrease-key) or LazyHeap
+    # metrics: optional Metrics.SearchMetrics to fill in
+    if metrics is not None: metrics.begin("UCS", graph)
+    start, goals = snap(graph, start), snap_all(graph, goals)
+    if start not in graph:
+        if metrics is not None: metrics.finish(None, 0, 0, 0)
+        return None, 0, 0
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    goal_ids = {graph.index[g] for g in goals if g in graph}
+    start = graph.index[start]
+    frontier = frontier_type(graph.num_nodes)
+    best = array('d', [INF]) * graph.num_nodes   # cheapest known cost per node
+    parent = new_parents(graph.num_nodes)
+    best[start], parent[start] = 0, start
+    frontier.push(start, 0)
+    nodes_explored_count = generated = 0
+    if metrics is not None: metrics.phase("setup")
 
     while frontier:
-        cost, current, path = heapq.heappop(frontier)
+        cost, current = frontier.pop()
+        if metrics is not None: metrics.expand(current, cost, len(frontier) + 1)
 
-        if current in goals:
+        if current in goal_ids:
+            if metrics is not None: metrics.phase("search")
+            path = graph.path_labels(trace_path(parent, current))
+            if metrics is not None: metrics.finish(path, cost, nodes_explored_count + 1, generated, frontier)
             return path, cost, nodes_explored_count + 1
 
-        if current not in visited or cost < visited[current]:
-            visited[current] = cost
-            nodes_explored_count += 1 
-            
-            for neighbor in graph.neighbors(current):
-                weight = graph[current][neighbor].get('weight', 1)
-                new_cost = cost + weight
-                if neighbor not in visited or new_cost < visited[neighbor]:
-                    heapq.heappush(frontier, (new_cost, neighbor, path + [neighbor]))
+        nodes_explored_count += 1 
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            new_cost = cost + weights[e]
+            if new_cost < best[neighbor]:
+                best[neighbor], parent[neighbor] = new_cost, current
+                frontier.push(neighbor, new_cost)
+                generated += 1
                     
+    if metrics is not None: metrics.finish(None, 0, nodes_explored_count, generated, frontier)
     return None, 0, nodes_explored_count
 
+#--One-to-many UCS (Dijkstra): settle every destination in one expansion--#
+def ucs_one_to_many(graph, start, goals, metrics=None):
+    # Returns {goal: (path, cost, nodes_explored_when_settled)}; unreachable goals keep (None, 0, n).
+    # Goals that resolve to the same node (a label and a coordinate snapped onto it) all get its result.
+    # metrics: optional SearchMetrics, one search per goal sharing the tree, as in BFS.bfs_one_to_many
+    if metrics is not None: metrics.begin("UCS", graph)
+    results = {g: (None, 0, 0) for g in goals}
+    start = snap(graph, start)
+    if start not in graph:
+        if metrics is not None:
+            for _ in results: metrics.finish(None, 0, 0, 0)
+        return results
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    pending = {}   # node id -> every goal that resolves to it
+    for g, s in zip(goals, snap_all(graph, goals)):
+        if s in graph: pending.setdefault(graph.index[s], []).append(g)
+    start = graph.index[start]
+    frontier = [(0, start, start)]
+    parent = new_parents(graph.num_nodes)
+    visited = {}
+    nodes_explored_count = generated = 0
+    charged = (0, 0)   # (expansions, generations) already credited to earlier goals
+    if metrics is not None: metrics.phase("setup")
+
+    while frontier and pending:
+        cost, current, came_from = heapq.heappop(frontier)
+        if current in visited: continue
+        visited[current] = cost
+        parent[current] = came_from
+        nodes_explored_count += 1
+        if metrics is not None: metrics.expand(current, cost, len(frontier) + 1)
+
+        if current in pending:
+            path = graph.path_labels(trace_path(parent, current))
+            for goal in pending.pop(current):
+                results[goal] = (path, cost, nodes_explored_count)
+                if metrics is not None:
+                    metrics.phase("search")
+                    metrics.finish(path, cost, nodes_explored_count - charged[0], generated - charged[1])
+                    charged = (nodes_explored_count, generated)
+            if not pending: break
+
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            if neighbor not in visited:
+                heapq.heappush(frontier, (cost + weights[e], neighbor, current))
+                generated += 1
+
+    for goal, (path, _, _) in results.items():
+        if path is None:
+            results[goal] = (None, 0, nodes_explored_count)
+            if metrics is not None:
+                metrics.finish(None, 0, nodes_explored_count - charged[0], generated - charged[1])
+                charged = (nodes_explored_count, generated)
+    return results
+
+#--Bidirectional UCS (Dijkstra): forward from start, backward from goal on the reverse graph--#
+def bidirectional_ucs(graph, start, goal, frontier_type=IndexedHeap):
+    # Same (path, cost, nodes_explored) contract as ucs_algorithm with a single goal.
+    # mu is the best start->goal cost seen through a node reached by both sides;
+    # once top_f + top_b >= mu no shorter connection can still appear.
+    start, goal = snap(graph, start), snap(graph, goal)
+    if start not in graph or goal not in graph: return None, 0, 0
+    start, goal = graph.index[start], graph.index[goal]
+    n = graph.num_nodes
+    sides = []
+    for root, g in ((start, graph), (goal, graph.reverse())):
+        dist, parent, frontier = array('d', [INF]) * n, new_parents(n), frontier_type(n)
+        dist[root], parent[root] = 0, root
+        frontier.push(root, 0)
+        sides.append((g.offsets, g.targets, g.weights, dist, parent, frontier))
+    dist_f, dist_b = sides[0][3], sides[1][3]
+    mu, meet = (0, start) if start == goal else (INF, -1)
+    nodes_explored = 0
+
+    while sides[0][5] and sides[1][5]:
+        top_f, top_b = sides[0][5].min_key(), sides[1][5].min_key()
+        if top_f + top_b >= mu: break
+        offsets, targets, weights, dist, parent, frontier = sides[0] if top_f <= top_b else sides[1]
+        cost, current = frontier.pop()
+        nodes_explored += 1
+
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            new_cost = cost + weights[e]
+            if new_cost < dist[neighbor]:
+                dist[neighbor], parent[neighbor] = new_cost, current
+                frontier.push(neighbor, new_cost)
+                if dist_f[neighbor] + dist_b[neighbor] < mu:
+                    mu, meet = dist_f[neighbor] + dist_b[neighbor], neighbor
+
+    if meet == -1: return None, 0, nodes_explored
+    path = trace_path(sides[0][4], meet) + trace_path(sides[1][4], meet)[-2::-1]
+    return graph.path_labels(path), mu, nodes_explored
+
 #--Main Execution and Visualization--#
-nodes_pos, edges, start, goals = load_data()
-G = nx.Graph()
-for u, v, w in edges:
-    G.add_edge(u, v, weight=w)
-
-# 1. Run UCS and collect data
-result_path, total_cost, explored_count = ucs_algorithm(G, start, goals)
-
-# 2. Display the Performance Showcase Table (The part you requested)
-total_nodes = len(G.nodes)
-success_rate = 100.0 if result_path else 0.0
-exploration_ratio = (explored_count / total_nodes) * 100 if total_nodes > 0 else 0
-
-print("\n" + "="*50)
-print(f"{'--- UCS PERFORMANCE SHOWCASE ---':^50}")
-print("="*50)
-print(f"{'1. Success Rate:':<25} {success_rate}%")
-print(f"{'2. Nodes Explored:':<25} {explored_count} nodes")
-print(f"{'3. Path Found Length:':<25} {len(result_path) if result_path else 0} nodes")
-print(f"{'4. Exploration Ratio:':<25} {exploration_ratio:.2f}%")
-print(f"{'5. Total Path Cost:':<25} {total_cost}")
-print("="*50)
-print(f"Optimal Path found: {result_path}")
-print("="*50 + "\n")
-
-# 3. Visualization
-fig, ax = plt.subplots(figsize=(8, 6))
-nx.draw(G, pos=nodes_pos, with_labels=True, node_color='skyblue', 
-        edge_color='black', width=1.5, node_size=800, font_weight='bold', ax=ax)
-
-if result_path:
-    path_edges = list(zip(result_path, result_path[1:]))
-    nx.draw_networkx_edges(G, pos=nodes_pos, edgelist=path_edges, 
-                           edge_color='blue', width=4, ax=ax)
-
-ax.set_axis_on()
-ax.tick_params(left=True, bottom=True, labelleft=True, labelbottom=True)
-plt.grid(True, linestyle='--', alpha=0.5)
-plt.title(f"UCS Optimal Path (Total Cost: {total_cost})")
-plt.xlabel("X Coordinate")
-plt.ylabel("Y Coordinate")
-
-plt.show()
\ No newline at end of file
+def main():
+    # Plotting libraries are only imported when something is drawn
+    import networkx as nx
+    import matplotlib.pyplot as plt
+    graph, start, goals = load_graph_cached('PathFinder-test1.txt', undirected=True)
+    nodes_pos = graph.positions()
+    G = nx.Graph()
+    for u, v, w in graph.edges():
+        G.add_edge(u, v, weight=w)
+
+    # 1. Run UCS and collect data
+    metrics = SearchMetrics()
+    result_path, total_cost, explored_count = ucs_algorithm(graph, start, goals, metrics=metrics)
+
+    # 2. Display the Performance Showcase Table (The part you requested)
+    print("\n" + metrics.table("UCS"))
+    print(f"Optimal Path found: {result_path}")
+    print("="*50 + "\n")
+
+    # 3. Visualization
+    fig, ax = plt.subplots(figsize=(8, 6))
+    nx.draw(G, pos=nodes_pos, with_labels=True, node_color='skyblue', 
+            edge_color='black', width=1.5, node_size=800, font_weight='bold', ax=ax)
+
+    if result_path:
+        path_edges = list(zip(result_path, result_path[1:]))
+        nx.draw_networkx_edges(G, pos=nodes_pos, edgelist=path_edges, 
+                               edge_color='blue', width=4, ax=ax)
+
+    ax.set_axis_on()
+    ax.tick_params(left=True, bottom=True, labelleft=True, labelbottom=True)
+    plt.grid(True, linestyle='--', alpha=0.5)
+    plt.title(f"UCS Optimal Path (Total Cost: {total_cost})")
+    plt.xlabel("X Coordinate")
+    plt.ylabel("Y Coordinate")
+
+    plt.show()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
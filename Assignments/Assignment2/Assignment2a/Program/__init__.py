@@ -0,0 +1,51 @@
+#--PathFinder search library (Assignment 2a)--#
+# Importing this package does no work: no file is parsed and neither networkx
+# nor matplotlib is loaded (Render switches matplotlib to Agg on first use). Each name below is imported from its module the
+# first time it is used, e.g.
+#   import Program as pf
+#   graph, origin, goals = pf.load_graph_cached("PathFinder-test1.txt", undirected=True)
+#   path, cost, explored = pf.a_star_algorithm(graph, origin, goals[0])
+# Inside the package the modules import each other relatively (from .Graph import ...);
+# run as scripts from this folder (python BFS.py) they fall back to plain sibling imports.
+# Nothing is added to sys.path, so no module here can shadow or be shadowed by the host's.
+import importlib
+
+_EXPORTS = {
+    "CSRGraph": "Graph", "trace_path": "Graph",
+    "iter_records": "Parser", "load_graph": "Parser",
+    "load_graph_cached": "GraphCache",
+    "IndexedHeap": "Frontier", "LazyHeap": "Frontier",
+    "heuristic_table": "Heuristics", "goal_table": "Heuristics",
+    "build_landmarks": "Landmarks", "load_landmarks_cached": "Landmarks", "landmark_table": "Landmarks",
+    "contract_graph": "Hierarchy", "load_hierarchy_cached": "Hierarchy", "ch_algorithm": "Hierarchy",
+    "KDTree": "SpatialIndex", "spatial_index": "SpatialIndex", "snap": "SpatialIndex",
+    "bfs_algorithm": "BFS", "bfs_one_to_many": "BFS", "bidirectional_bfs": "BFS",
+    "dfs_algorithm": "DFS", "dfs_with_metrics": "DFS",
+    "ucs_algorithm": "UCS", "ucs_one_to_many": "UCS", "bidirectional_ucs": "UCS",
+    "a_star_algorithm": "AStar",
+    "gbfs_algorithm": "GBFS",
+    "ida_star_algorithm": "IDAStar",
+    "LPAStar": "LPAStar",
+    "sma_star_algorithm": "SMAStar",
+    "ara_star_algorithm": "ARAStar",
+    "beam_search": "CustomSearch",
+    "run_query": "BatchQuery", "run_batch": "BatchQuery",
+    "run_files": "SearchCLI",
+    "RouteServer": "RouteServer",
+    "RouteCache": "RouteCache",
+    "SearchMetrics": "Metrics",
+    "PathRenderer": "Render", "render_paths": "Render",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return __all__
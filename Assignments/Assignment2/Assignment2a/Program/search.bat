@@ -0,0 +1,3 @@
+@echo off
+rem search <file|dir|glob>... <method> [options]: the batch command line in SearchCLI.py
+python "%~dp0SearchCLI.py" %*
@@ -0,0 +1,34 @@
+#--Small random maps for checking searches against UCS--#
+# Arc costs are never below the straight-line distance, so the Euclidean
+# heuristic stays admissible and every optimal search must match UCS.
+import math
+import random
+from Program.Graph import CSRGraph
+from Program.UCS import ucs_algorithm
+
+def random_graph(seed, n=8, m=16, zero=0.0, parallel=0.0, undirected=False):
+    # zero: share of nodes placed on an earlier node's point, joined to it by a cost-0 arc;
+    # parallel: share of arcs that get a second, different-cost copy
+    rng = random.Random(seed)
+    positions, edges = {}, []
+    for i in range(n):
+        if i and rng.random() < zero:
+            twin = rng.randrange(i)
+            positions[i] = positions[twin]
+            edges.append((twin, i, 0.0) if rng.random() < 0.5 else (i, twin, 0.0))
+        else:
+            positions[i] = (round(rng.uniform(0, 10), 2), round(rng.uniform(0, 10), 2))
+    for _ in range(m):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u == v: continue
+        cost = math.dist(positions[u], positions[v]) * rng.uniform(1.0, 2.0)
+        if positions[u] != positions[v]: cost += rng.random()   # co-located nodes may also be joined at cost 0
+        edges.append((u, v, cost))
+        if rng.random() < parallel:
+            edges.append((u, v, max(math.dist(positions[u], positions[v]), cost * rng.uniform(0.5, 1.5))))
+    return CSRGraph.from_edges(positions, edges, undirected)
+
+def ucs_cost(graph, start, goal):
+    # Optimal cost, or None when goal cannot be reached
+    path, cost, _ = ucs_algorithm(graph, start, [goal])
+    return None if path is None else cost
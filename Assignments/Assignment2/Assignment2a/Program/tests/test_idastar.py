@@ -0,0 +1,57 @@
+#--IDA*: threshold updates checked against UCS--#
+import pytest
+from Program.Graph import CSRGraph
+from Program.IDAStar import ida_star_algorithm
+from Program.Metrics import SearchMetrics
+from .graphs import random_graph, ucs_cost
+
+SETTINGS = [(table_size, growth) for table_size in (0, 1, 1 << 20) for growth in (1.0, 2.0)]
+
+def check(graph, start, goal, table_size, growth):
+    path, _, cost = ida_star_algorithm(graph, start, goal, table_size=table_size, growth=growth)
+    expected = ucs_cost(graph, start, goal)
+    if expected is None:
+        assert path is None and cost == 0
+    else:
+        assert path[0] == start and path[-1] == goal
+        assert cost == pytest.approx(expected)
+        assert graph.path_cost(path) == pytest.approx(cost)
+
+@pytest.mark.parametrize("table_size, growth", SETTINGS)
+def test_start_is_goal(table_size, growth):
+    graph = random_graph(1)
+    assert ida_star_algorithm(graph, 3, 3, table_size=table_size, growth=growth) == ([3], 1, 0.0)
+
+@pytest.mark.parametrize("table_size, growth", SETTINGS)
+def test_unreachable_goal(table_size, growth):
+    # 'c' has no incoming arc: every threshold runs out and the search must stop at INF
+    graph = CSRGraph.from_edges({"a": (0, 0), "b": (1, 0), "c": (2, 0)}, [("a", "b", 1.5), ("b", "a", 1.5), ("c", "a", 2.5)])
+    assert ida_star_algorithm(graph, "a", "c", table_size=table_size, growth=growth)[0] is None
+    assert ida_star_algorithm(graph, "a", "missing", table_size=table_size, growth=growth) == (None, 0, 0)
+
+@pytest.mark.parametrize("table_size, growth", SETTINGS)
+def test_zero_cost_arcs(table_size, growth):
+    # Zero-cost arcs (and zero-cost cycles) leave f unchanged, so a threshold must not stall on them
+    for seed in range(40):
+        graph = random_graph(seed, zero=0.3)
+        for goal in range(graph.num_nodes):
+            check(graph, 0, goal, table_size, growth)
+
+@pytest.mark.parametrize("table_size, growth", SETTINGS)
+def test_non_integer_costs(table_size, growth):
+    # Real-valued costs give a new f-value at almost every node: many thresholds, or skipped ones with growth > 1
+    for seed in range(40):
+        graph = random_graph(seed, undirected=seed % 2 == 0)
+        for goal in range(graph.num_nodes):
+            check(graph, 0, goal, table_size, growth)
+
+def test_growth_skips_thresholds():
+    # IDA*_CR must reach the same cost in fewer iterations than classic IDA* on a real-valued map
+    graph = random_graph(6, n=14, m=40, undirected=True)
+    iterations = {}
+    for growth in (1.0, 4.0):
+        metrics = SearchMetrics()
+        path, _, cost = ida_star_algorithm(graph, 0, 13, table_size=0, growth=growth, metrics=metrics)
+        assert cost == pytest.approx(ucs_cost(graph, 0, 13))
+        iterations[growth] = metrics.iterations
+    assert iterations[4.0] < iterations[1.0]
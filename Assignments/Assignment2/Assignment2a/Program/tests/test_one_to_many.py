@@ -0,0 +1,26 @@
+#--One-to-many BFS/UCS: goals that resolve to the same node--#
+import gc
+from Program.BFS import bfs_one_to_many
+from Program.Graph import CSRGraph
+from Program.SpatialIndex import spatial_index
+from Program.UCS import ucs_one_to_many
+
+def line_graph():
+    return CSRGraph.from_edges({1: (0, 0), 2: (1, 0), 3: (2, 0)}, [(1, 2, 1), (2, 3, 1)])
+
+def test_coordinate_goal_snapping_onto_a_label_goal():
+    # (2.1, 0) snaps onto node 3: both goals must be filled, not just the later one
+    graph = line_graph()
+    for search in (bfs_one_to_many, ucs_one_to_many):
+        results = search(graph, 1, [3, (2.1, 0), 2])
+        assert results[3][:2] == results[(2.1, 0)][:2] == ([1, 2, 3], 2)
+        assert results[2][:2] == ([1, 2], 1)
+
+def test_spatial_index_does_not_keep_its_graph_alive():
+    graph = line_graph()
+    spatial_index(graph)
+    key = (id(graph), ())
+    assert key in spatial_index.tables
+    del graph
+    gc.collect()
+    assert key not in spatial_index.tables
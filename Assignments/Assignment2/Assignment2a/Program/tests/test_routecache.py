@@ -0,0 +1,15 @@
+#--RouteCache: results follow the graph's content--#
+from Program.Graph import CSRGraph
+from Program.LPAStar import LPAStar
+from Program.RouteCache import RouteCache
+from Program.UCS import ucs_algorithm
+
+def test_in_place_edit_is_not_served_stale():
+    # LPAStar.update_edges rewrites planner.graph's weights in place: the old route must not come back
+    graph = CSRGraph.from_edges({1: (0, 0), 2: (1, 0), 3: (2, 0), 4: (1, 1)},
+                                [(1, 2, 1), (2, 3, 1), (1, 4, 5), (4, 3, 5)], undirected=True)
+    planner = LPAStar(graph, 1, 3)
+    cache = RouteCache(None)
+    assert cache.call(ucs_algorithm, planner.graph, 1, [3])[:2] == ([1, 2, 3], 2.0)
+    planner.update_edges([(2, 3, 100)], symmetric=True)
+    assert cache.call(ucs_algorithm, planner.graph, 1, [3])[:2] == ([1, 4, 3], 10.0)
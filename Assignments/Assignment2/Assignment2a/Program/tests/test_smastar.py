@@ -0,0 +1,48 @@
+#--SMA*: optimal costs against UCS, with parallel arcs and zero-cost arcs--#
+import pytest
+from Program.AStar import a_star_algorithm
+from Program.Frontier import LazyHeap
+from Program.Graph import CSRGraph
+from Program.Landmarks import build_landmarks
+from Program.SMAStar import sma_star_algorithm
+from Program.UCS import ucs_algorithm
+from Program.Metrics import SearchMetrics
+from .graphs import random_graph
+
+def test_parallel_arcs_use_the_cheapest():
+    # The cheaper arc comes second: it must still decide the child's g
+    graph = CSRGraph.from_edges({"a": (0, 0), "b": (1, 0)}, [("a", "b", 5), ("a", "b", 2)])
+    path, cost, _ = sma_star_algorithm(graph, "a", "b")
+    assert path == ["a", "b"] and cost == 2.0
+
+@pytest.mark.parametrize("zero, parallel", [(0.0, 0.4), (0.2, 0.0), (0.2, 0.3)])
+def test_matches_ucs(zero, parallel):
+    # Optimal whenever the optimal path fits in the budget, from exactly that up to far more than the map
+    for seed in range(60):
+        graph = random_graph(seed, n=8, m=20, zero=zero, parallel=parallel, undirected=seed % 2 == 0)
+        for goal in range(graph.num_nodes):
+            best, expected, _ = ucs_algorithm(graph, 0, [goal])
+            for extra in (0, 1, 5, 1000):
+                budget = max(2, extra + (len(best) if best else 0))
+                path, cost, _ = sma_star_algorithm(graph, 0, goal, max_nodes=budget)
+                if best is None:
+                    assert path is None
+                else:
+                    assert cost == pytest.approx(expected)
+                    assert graph.path_cost(path) == pytest.approx(cost)
+
+def test_heap_pushes_count_the_open_list():
+    # Nothing is dropped with a large budget: the root plus one open-list push per child
+    graph = random_graph(3, n=10, m=25, undirected=True)
+    metrics = SearchMetrics()
+    sma_star_algorithm(graph, 0, 9, max_nodes=1000, metrics=metrics)
+    assert metrics.heap_pushes == metrics.generations + 1
+
+def test_a_star_budget_options():
+    # max_nodes hands landmarks on to SMA* and refuses a frontier it would ignore
+    graph = random_graph(4, n=10, m=25, undirected=True)
+    landmarks = build_landmarks(graph, count=3, undirected=True)
+    expected = ucs_algorithm(graph, 0, [9])[1]
+    assert a_star_algorithm(graph, 0, 9, landmarks=landmarks, max_nodes=1000)[1] == pytest.approx(expected)
+    with pytest.raises(ValueError):
+        a_star_algorithm(graph, 0, 9, frontier_type=LazyHeap, max_nodes=1000)